@@ -0,0 +1 @@
+# Shared helpers used by the unit_tests* suites (runners, HTTP client, reports).
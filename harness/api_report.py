@@ -0,0 +1,71 @@
+import csv
+
+import duckdb
+
+from harness import config, history, reports, runs, timing
+
+# CSV reports of the API suites in unit_tests/. Each suite fills a
+# test_timings dict in tearDown (test name -> start_time, duration_seconds
+# and the per-phase seconds of harness/timing.py). The report holds the
+# current run only; every row carries the run's ID, and the run is recorded
+# in test_runs like the runs the sink writes (harness/runs.py), so rows
+# loaded from these reports can be told apart and joined by run. The report
+# is loaded into the table of the same name (harness/reports.py) for the
+# pages, and the rows go to the Parquet history (harness/history.py), which
+# keeps every run.
+REPORT_COLUMNS = ["Test Name", "Start Time", "Duration (seconds)"] + timing.PHASE_COLUMNS + ["Run ID"]
+HISTORY_TYPES = ["VARCHAR", "TIMESTAMP", "DOUBLE"] + ["DOUBLE"] * len(timing.PHASE_COLUMNS) + ["VARCHAR"]
+
+
+def report_rows(test_timings, run_id):
+    # Sorted so concurrent runs write rows in the same order as sequential ones
+    for test_name, timings in sorted(test_timings.items()):
+        row = [test_name, timings["start_time"], timings["duration_seconds"]]
+        row += [timings[key] for key in timing.PHASE_KEYS]
+        yield row + [run_id]
+
+
+def generate_csv_report(csv_file, test_timings, run):
+    print(f"Generating CSV report: {csv_file}")
+    with open(csv_file, "w", newline="") as file:  # overwritten: this run only
+        writer = csv.writer(file)
+        writer.writerow(REPORT_COLUMNS)
+        for row in report_rows(test_timings, run.run_id):
+            writer.writerow(row)
+            print(f"Written row: {row}")
+
+
+def export_history(suite, test_timings, run, db_file=None, history_dir=None):
+    # The run as Parquet, with "Test Case Name" like the sink's suites
+    columns = ["Test Case Name"] + REPORT_COLUMNS[1:]
+    con = duckdb.connect()
+    try:
+        con.execute(
+            "CREATE TABLE run ("
+            + ", ".join(f'"{name}" {column_type}' for name, column_type in zip(columns, HISTORY_TYPES))
+            + ")"
+        )
+        con.executemany(
+            f"INSERT INTO run VALUES ({', '.join('?' * len(columns))})", list(report_rows(test_timings, run.run_id))
+        )
+        history.export_run(con, suite, "run", history_dir)
+    finally:
+        con.close()
+    history.create_view(db_file, history_dir)
+
+
+def write_report(suite, csv_file, test_timings, run, db_file=None, history_dir=None):
+    # The CSV report, its table, the run's row in test_runs and its history;
+    # `suite` names the table and the run, e.g. test_report_interact
+    generate_csv_report(csv_file, test_timings, run)
+    if not test_timings:
+        return
+    db_file = db_file or config.RESULTS_DATABASE
+    reports.load_csv_report(csv_file, suite, db_file)
+    con = duckdb.connect(database=db_file, read_only=False)
+    try:
+        runs.record_run(con, run, suite, len(test_timings))
+    finally:
+        con.close()
+    if config.HISTORY:
+        export_history(suite, test_timings, run, db_file, history_dir)
@@ -0,0 +1,215 @@
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from harness.scheduler import longest_first, name_of_test
+
+# The test bodies use blocking HTTP calls, so every case runs on a worker
+# thread and the event loop only does the scheduling: a global limit on
+# in-flight cases plus a separate limit per remote host. A test that fans out
+# requests itself (the corpus tests, harness/corpus.py) finds the slot it runs
+# in through held_slot() and takes one more slot of the same limits for every
+# further request it has in flight, so the limits bound requests, not tests.
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST = 8
+
+_held = threading.local()
+
+
+def iter_tests(suite):
+    # Flatten nested TestSuites into individual TestCase instances
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
+
+
+def host_of(test):
+    url = getattr(test, "BASE_URL", None) or getattr(test, "base_url", None)
+    if not isinstance(url, str):
+        return None
+    return urlsplit(url).netloc or None
+
+
+class Slots:
+    # The global and per-host limits, shared by the event loop (waiting for
+    # a slot to start a test) and worker threads (taking a slot for one more
+    # request without waiting)
+    def __init__(self, concurrency, per_host):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._hosts = {}
+        self._loop = None
+        self._released = None
+
+    def try_acquire(self, host):
+        with self._lock:
+            if self._in_flight >= self.concurrency or self._hosts.get(host, 0) >= self.per_host:
+                return False
+            self._in_flight += 1
+            self._hosts[host] = self._hosts.get(host, 0) + 1
+            return True
+
+    def release(self, host):
+        with self._lock:
+            self._in_flight -= 1
+            self._hosts[host] -= 1
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._released.set)
+
+    async def acquire(self, host):
+        # The event is set on the loop after every release, and nothing
+        # yields between a failed try and the wait, so no release is missed
+        if self._loop is None:
+            self._loop, self._released = asyncio.get_running_loop(), asyncio.Event()
+        while not self.try_acquire(host):
+            self._released.clear()
+            await self._released.wait()
+
+
+def held_slot():
+    # (Slots, host) of the test running on this thread under the runner, or
+    # None outside it
+    return getattr(_held, "slot", None)
+
+
+def _run_in_slot(test, outcome, slots, host):
+    _held.slot = (slots, host)
+    try:
+        test.run(outcome)
+    finally:
+        _held.slot = None
+
+
+class _RecordedOutcome(unittest.TestResult):
+    # Captures the outcome of a single test on its worker thread so it can be
+    # replayed into the (non thread-safe) main result on the event loop thread.
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def addSuccess(self, test):
+        self.events.append(("addSuccess", (test,)))
+
+    def addFailure(self, test, err):
+        self.events.append(("addFailure", (test, err)))
+
+    def addError(self, test, err):
+        self.events.append(("addError", (test, err)))
+
+    def addSkip(self, test, reason):
+        self.events.append(("addSkip", (test, reason)))
+
+    def addExpectedFailure(self, test, err):
+        self.events.append(("addExpectedFailure", (test, err)))
+
+    def addUnexpectedSuccess(self, test):
+        self.events.append(("addUnexpectedSuccess", (test,)))
+
+    def addSubTest(self, test, subtest, err):
+        self.events.append(("addSubTest", (test, subtest, err)))
+
+    def replay(self, result, test):
+        result.startTest(test)
+        for name, args in self.events:
+            getattr(result, name)(*args)
+        result.stopTest(test)
+
+
+class AsyncSuiteRunner:
+    def __init__(
+        self,
+        concurrency=DEFAULT_CONCURRENCY,
+        per_host=DEFAULT_PER_HOST,
+        stream=None,
+        verbosity=1,
+        resultclass=unittest.TextTestResult,
+        estimates=None,
+        learn=True,
+    ):
+        # estimates: a scheduler.DurationEstimates; when given, cases start
+        # longest-first and every measured duration is fed back into it
+        # (learn=False for suites that feed their own test_timings back)
+        self.estimates = estimates
+        self.learn = learn
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.stream = unittest.runner._WritelnDecorator(stream or sys.stderr)
+        self.verbosity = verbosity
+        self.resultclass = resultclass
+
+    def _make_result(self):
+        return self.resultclass(self.stream, True, self.verbosity)
+
+    def run(self, suite):
+        return asyncio.run(self.run_async(suite))
+
+    async def run_async(self, suite):
+        tests = list(iter_tests(suite))
+        if self.estimates is not None:
+            tests = longest_first(tests, self.estimates)
+        result = self._make_result()
+        loop = asyncio.get_running_loop()
+        slots = Slots(self.concurrency, self.per_host)
+
+        # Class-level fixtures normally run by TestSuite
+        classes = []
+        for test in tests:
+            if type(test) not in classes:
+                classes.append(type(test))
+        for cls in classes:
+            cls.setUpClass()
+
+        async def run_one(test):
+            host = host_of(test)
+            await slots.acquire(host)
+            try:
+                outcome = _RecordedOutcome()
+                started = time.perf_counter()
+                await loop.run_in_executor(executor, _run_in_slot, test, outcome, slots, host)
+                duration = time.perf_counter() - started
+            finally:
+                slots.release(host)
+            if self.estimates is not None and self.learn:
+                self.estimates.update(name_of_test(test), duration)
+            outcome.replay(result, test)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            start = loop.time()
+            try:
+                await asyncio.gather(*(run_one(test) for test in tests))
+            finally:
+                for cls in classes:
+                    cls.tearDownClass()
+            elapsed = loop.time() - start
+
+        result.printErrors()
+        self.stream.writeln(result.separator2)
+        self.stream.writeln(
+            f"Ran {result.testsRun} tests in {elapsed:.3f}s "
+            f"(concurrency={self.concurrency}, per_host={self.per_host})"
+        )
+        self.stream.writeln("")
+        self.stream.writeln("OK" if result.wasSuccessful() else "FAILED")
+        return result
+
+
+def add_runner_arguments(parser):
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="Run the test cases concurrently with the asyncio runner",
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST)
+    parser.add_argument(
+        "--longest-first", action="store_true",
+        help="Start the tests and corpus cases with the longest recorded durations first",
+    )
+    return parser
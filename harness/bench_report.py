@@ -0,0 +1,70 @@
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from harness.collector import REPORT_COLUMNS, generate_csv_report, make_collector
+from harness.runs import new_run_id
+
+# Cost of appending one run to a CSV report that already holds a long history:
+# the indexed append (generate_csv_report) against the old approach of reading
+# every existing row to find the tests that were already recorded.
+
+
+def write_history(filename, rows, tests):
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(REPORT_COLUMNS)
+        run_id = None
+        for index in range(rows):
+            if index % tests == 0:
+                run_id = new_run_id()
+            writer.writerow([f"test_{index % tests}", "2026-01-01", "12:00:00", 0.001, "pass", run_id])
+
+
+def full_read_append(filename, collector):
+    # The pre-index append: read the whole report, then append the new rows
+    with open(filename, mode="r", newline="") as file:
+        existing_tests = {(row["Run ID"], row["Test Case Name"]) for row in csv.DictReader(file)}
+    with open(filename, mode="a", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=REPORT_COLUMNS, extrasaction="ignore")
+        for row in collector.report_rows():
+            if (row["Run ID"], row["Test Case Name"]) not in existing_tests:
+                writer.writerow(row)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time appending a run to a large CSV report")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="historical rows in the report")
+    parser.add_argument("--tests", type=int, default=100, help="tests per run")
+    parser.add_argument("--runs", type=int, default=5, help="appended runs to time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        indexed = os.path.join(tmp, "indexed.csv")
+        full_read = os.path.join(tmp, "full_read.csv")
+        write_history(indexed, args.rows, args.tests)
+        write_history(full_read, args.rows, args.tests)
+        print(f"History: {args.rows} rows ({os.path.getsize(indexed) / 1e6:.1f} MB), {args.tests} tests per run")
+
+        results = {f"test_{index}": "pass" for index in range(args.tests)}
+        first = timed(generate_csv_report, indexed, make_collector(results))
+        print(f"First indexed append (builds the key index): {first * 1000:.1f} ms")
+
+        indexed_times = [timed(generate_csv_report, indexed, make_collector(results)) for _ in range(args.runs)]
+        full_read_times = [timed(full_read_append, full_read, make_collector(results)) for _ in range(args.runs)]
+        indexed_ms = sorted(indexed_times)[len(indexed_times) // 2] * 1000
+        full_read_ms = sorted(full_read_times)[len(full_read_times) // 2] * 1000
+        print(f"Indexed append:   {indexed_ms:.1f} ms (median of {args.runs})")
+        print(f"Full-read append: {full_read_ms:.1f} ms (median of {args.runs})")
+
+
+if __name__ == "__main__":
+    main()
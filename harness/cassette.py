@@ -0,0 +1,185 @@
+import atexit
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from harness.timing import TimedHTTPAdapter
+
+# Cassette file layout:
+#   MAGIC | index offset (u64) | index length (u64) | bodies ... | index (JSON)
+# The index maps a request key (method, URL and a hash of the body) to the
+# list of responses recorded for it, each pointing at its body by offset and
+# length. Replay mmaps the file and slices bodies out of it on demand, so
+# only the index is ever parsed.
+MAGIC = b"GTCASS01"
+HEADER = struct.Struct("<8sQQ")
+
+
+class CassetteMiss(requests.exceptions.RequestException):
+    pass
+
+
+def request_key(method, url, body):
+    if body is None:
+        body = b""
+    elif isinstance(body, str):
+        body = body.encode("utf-8")
+    body_hash = hashlib.sha256(body).hexdigest()
+    return hashlib.sha256(f"{method.upper()}\n{url}\n{body_hash}".encode("utf-8")).hexdigest()[:32]
+
+
+class CassetteWriter:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.bodies = []
+        self.size = 0
+
+    def add(self, key, response, body, elapsed):
+        with self.lock:
+            self.entries.setdefault(key, []).append({
+                "offset": self.size,
+                "length": len(body),
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": dict(response.headers),
+                "elapsed": elapsed,
+            })
+            self.bodies.append(body)
+            self.size += len(body)
+
+    def save(self):
+        with self.lock:
+            index = json.dumps(self.entries, separators=(",", ":")).encode("utf-8")
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(HEADER.pack(MAGIC, HEADER.size + self.size, len(index)))
+                for body in self.bodies:
+                    file.write(body)
+                file.write(index)
+            os.replace(tmp_path, self.path)
+            return len(self.entries)
+
+
+class CassetteReader:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a cassette file")
+        self.entries = json.loads(self.mm[index_offset:index_offset + index_length])
+        self.positions = {}
+        self.lock = threading.Lock()
+
+    def next_entry(self, key):
+        # Repeated identical requests get the recorded responses in order;
+        # once they run out the last one is served again.
+        entries = self.entries.get(key)
+        if not entries:
+            return None
+        with self.lock:
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+        entry = entries[min(position, len(entries) - 1)]
+        start = HEADER.size + entry["offset"]
+        return entry, self.mm[start:start + entry["length"]]
+
+    def close(self):
+        self.mm.close()
+
+
+class RecordingAdapter(TimedHTTPAdapter):
+    def __init__(self, writer, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = writer
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        body = response.content  # read now so the body can be stored
+        elapsed = time.perf_counter() - start
+        self.writer.add(request_key(request.method, request.url, request.body), response, body, elapsed)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    def __init__(self, reader, replay_latency=False, **kwargs):
+        super().__init__(**kwargs)
+        self.reader = reader
+        self.replay_latency = replay_latency
+
+    def send(self, request, **kwargs):
+        found = self.reader.next_entry(request_key(request.method, request.url, request.body))
+        if found is None:
+            raise CassetteMiss(
+                f"No recorded response for {request.method} {request.url} in {self.reader.path}",
+                request=request,
+            )
+        entry, body = found
+        if self.replay_latency:
+            time.sleep(entry["elapsed"])
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=entry["elapsed"])
+        response.connection = self
+        return response
+
+
+_state = {"mode": None, "writer": None, "reader": None, "replay_latency": False}
+_state_lock = threading.Lock()
+
+
+def configure(path, mode, replay_latency=False):
+    # mode is "record", "replay" or None (talk to the servers directly)
+    with _state_lock:
+        if _state["writer"] is not None:
+            _state["writer"].save()
+        if _state["reader"] is not None:
+            _state["reader"].close()
+        _state.update(mode=mode, writer=None, reader=None, replay_latency=replay_latency)
+        if mode == "record":
+            _state["writer"] = CassetteWriter(path)
+        elif mode == "replay":
+            _state["reader"] = CassetteReader(path)
+        elif mode is not None:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+
+def make_adapter(**kwargs):
+    with _state_lock:
+        if _state["mode"] == "record":
+            return RecordingAdapter(_state["writer"], **kwargs)
+        if _state["mode"] == "replay":
+            return ReplayAdapter(_state["reader"], _state["replay_latency"], **kwargs)
+    return None
+
+
+def save():
+    with _state_lock:
+        writer = _state["writer"]
+    if writer is not None:
+        return writer.save()
+    return 0
+
+
+atexit.register(save)
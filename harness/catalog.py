@@ -0,0 +1,302 @@
+import argparse
+import glob
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import duckdb
+
+from harness import config
+
+# Folds the Evidence DuckDB sources under my-project/sources into a single
+# catalog file, one schema per former source:
+#
+#   sources/catalog/catalog.duckdb   database.table1, new_booking.bookings, ...
+#   sources/catalog/<query>.sql      the sources' queries, schema-qualified
+#
+# The catalog is built with ATTACH ... (READ_ONLY) on every source file.
+# Tables with the same columns and the same rows (in any order) are stored
+# once; the other copies become views of it. Pages that used
+# <source>.<query> are pointed at catalog.<query>. The test_database source
+# is not folded in: the harness writes to it on every run.
+SOURCES_DIR = os.path.join(config.REPO_ROOT, "my-project", "sources")
+PAGES_DIR = os.path.join(config.REPO_ROOT, "my-project", "pages")
+CATALOG = "catalog"
+CATALOG_FILE = "catalog.duckdb"
+LIVE_SOURCES = ("test_database",)
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class Source:
+    def __init__(self, name, directory, db_file, queries):
+        self.name = name
+        self.directory = directory
+        self.db_file = db_file
+        self.queries = queries  # {query name: sql}
+
+    def files(self):
+        # The database and its write-ahead log
+        return [path for path in (self.db_file, self.db_file + ".wal") if os.path.exists(path)]
+
+
+def read_connection(directory):
+    # The few keys of an Evidence connection.yaml that matter here
+    with open(os.path.join(directory, "connection.yaml")) as file:
+        text = file.read()
+    values = {}
+    for key in ("name", "type", "filename"):
+        match = re.search(rf"^\s*{key}:\s*(\S+)\s*$", text, re.M)
+        values[key] = match.group(1).strip("'\"") if match else None
+    return values
+
+
+def read_queries(directory):
+    queries = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.sql"))):
+        with open(path) as file:
+            queries[os.path.splitext(os.path.basename(path))[0]] = file.read()
+    return queries
+
+
+def discover(sources_dir=SOURCES_DIR, exclude=LIVE_SOURCES):
+    sources = []
+    for connection in sorted(glob.glob(os.path.join(sources_dir, "*", "connection.yaml"))):
+        directory = os.path.dirname(connection)
+        values = read_connection(directory)
+        name = values["name"] or os.path.basename(directory)
+        if values["type"] != "duckdb" or name == CATALOG or name in exclude:
+            continue
+        db_file = os.path.join(directory, values["filename"] or "")
+        if not os.path.isfile(db_file):
+            print(f"Skipping source {name}: {db_file} does not exist")
+            continue
+        sources.append(Source(name, directory, db_file, read_queries(directory)))
+    return sources
+
+
+def _tables(con, alias):
+    return [
+        row[0]
+        for row in con.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE database_name = ? AND schema_name = 'main' ORDER BY table_name",
+            [alias],
+        ).fetchall()
+    ]
+
+
+def _fingerprint(con, relation, alias, table):
+    # Column names and types, row count and an order-independent sum of row
+    # hashes; equal fingerprints are confirmed with EXCEPT ALL
+    columns = tuple(
+        con.execute(
+            "SELECT column_name, data_type FROM duckdb_columns() "
+            "WHERE database_name = ? AND schema_name = 'main' AND table_name = ? ORDER BY column_index",
+            [alias, table],
+        ).fetchall()
+    )
+    rows, hashes = con.execute(f"SELECT count(*), sum(hash(t)::HUGEINT) FROM {relation} t").fetchone()
+    return columns, rows, hashes
+
+
+def _same_rows(con, left, right):
+    return con.execute(
+        f"SELECT (SELECT count(*) FROM (FROM {left} EXCEPT ALL FROM {right})) "
+        f"+ (SELECT count(*) FROM (FROM {right} EXCEPT ALL FROM {left}))"
+    ).fetchone()[0] == 0
+
+
+def build(sources, catalog_file):
+    # Writes the catalog to a temporary file next to `catalog_file` and
+    # renames it into place; returns {(schema, table): canonical (schema,
+    # table) or None for stored tables}
+    directory = os.path.dirname(os.path.abspath(catalog_file))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(prefix=".catalog.", suffix=".duckdb", dir=directory)
+    os.close(fd)
+    os.remove(tmp_file)  # DuckDB creates the file itself
+
+    layout = {}
+    con = duckdb.connect(database=tmp_file)
+    try:
+        stored = {}  # fingerprint -> [(schema, table)] stored under it
+        for index, source in enumerate(sources):
+            alias = f"source_{index}"
+            con.execute(f"ATTACH {_literal(os.path.abspath(source.db_file))} AS {alias} (READ_ONLY)")
+            con.execute(f"CREATE SCHEMA {_quote(source.name)}")
+            for table in _tables(con, alias):
+                relation = f"{alias}.main.{_quote(table)}"
+                target = f"{_quote(source.name)}.{_quote(table)}"
+                fingerprint = _fingerprint(con, relation, alias, table)
+                canonical = next(
+                    (
+                        (schema, name)
+                        for schema, name in stored.get(fingerprint, [])
+                        if _same_rows(con, f"{_quote(schema)}.{_quote(name)}", relation)
+                    ),
+                    None,
+                )
+                if canonical is None:
+                    con.execute(f"CREATE TABLE {target} AS FROM {relation}")
+                    stored.setdefault(fingerprint, []).append((source.name, table))
+                else:
+                    con.execute(f"CREATE VIEW {target} AS FROM {_quote(canonical[0])}.{_quote(canonical[1])}")
+                layout[(source.name, table)] = canonical
+            con.execute(f"DETACH {alias}")
+        con.execute("CHECKPOINT")
+    except BaseException:
+        con.close()
+        for path in (tmp_file, tmp_file + ".wal"):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    con.close()
+    os.replace(tmp_file, catalog_file)
+    return layout
+
+
+def qualify(sql, schema, tables):
+    # Points the bare table names after FROM/JOIN at the source's schema
+    names = {table.lower() for table in tables}
+
+    def replace(match):
+        keyword, space, quote, name = match.groups()
+        if name.lower() not in names:
+            return match.group(0)
+        return f"{keyword}{space}{_quote(schema)}.{quote}{name}{quote}"
+
+    return re.sub(r'(?i)\b(from|join)(\s+)("?)([A-Za-z_]\w*)\3(?![\w."])', replace, sql)
+
+
+def _query_names(sources):
+    # <source>.<query> -> catalog query name; a query keeps its name unless
+    # another source has one of the same name
+    counts = {}
+    for source in sources:
+        for query in source.queries:
+            counts[query] = counts.get(query, 0) + 1
+    return {
+        (source.name, query): query if counts[query] == 1 else f"{source.name}_{query}"
+        for source in sources
+        for query in source.queries
+    }
+
+
+def write_catalog_source(sources, layout, catalog_dir):
+    tables = {}
+    for schema, table in layout:
+        tables.setdefault(schema, []).append(table)
+    names = _query_names(sources)
+    for source in sources:
+        for query, sql in source.queries.items():
+            with open(os.path.join(catalog_dir, f"{names[(source.name, query)]}.sql"), "w") as file:
+                file.write(f"-- {source.name}/{query}.sql\n")
+                file.write(qualify(sql, source.name, tables.get(source.name, [])))
+    with open(os.path.join(catalog_dir, "connection.yaml"), "w") as file:
+        file.write(f"# This file was automatically generated\nname: {CATALOG}\ntype: duckdb\noptions:\n  filename: {CATALOG_FILE}\n")
+    return names
+
+
+def rewrite_pages(names, pages_dir=PAGES_DIR):
+    # Returns the pages that changed
+    changed = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "**", "*.md"), recursive=True)):
+        with open(path) as file:
+            text = original = file.read()
+        for (source, query), name in names.items():
+            text = re.sub(rf"\b{re.escape(source)}\.{re.escape(query)}\b", f"{CATALOG}.{name}", text)
+        if text != original:
+            with open(path, "w") as file:
+                file.write(text)
+            changed.append(path)
+    return changed
+
+
+def time_extraction(sources):
+    # What `npm run sources` does per source: open the database and write
+    # every query's result to Parquet; returns seconds
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        for source in sources:
+            con = duckdb.connect(database=source.db_file, read_only=True)
+            try:
+                for query, sql in source.queries.items():
+                    output = os.path.join(tmp, f"{source.name}.{query}.parquet")
+                    con.execute(f"COPY ({sql.strip().rstrip(';')}) TO {_literal(output)} (FORMAT PARQUET)")
+            finally:
+                con.close()
+    return time.perf_counter() - started
+
+
+def disk_use(sources):
+    return sum(os.path.getsize(path) for source in sources for path in source.files())
+
+
+def migrate(sources_dir=SOURCES_DIR, pages_dir=PAGES_DIR, remove=False, exclude=LIVE_SOURCES):
+    sources = discover(sources_dir, exclude)
+    if not sources:
+        raise ValueError(f"No DuckDB sources to migrate in {sources_dir}")
+    catalog_dir = os.path.join(sources_dir, CATALOG)
+    os.makedirs(catalog_dir, exist_ok=True)
+    before = time_extraction(sources)
+    size_before = disk_use(sources)
+
+    layout = build(sources, os.path.join(catalog_dir, CATALOG_FILE))
+    names = write_catalog_source(sources, layout, catalog_dir)
+    catalog = Source(CATALOG, catalog_dir, os.path.join(catalog_dir, CATALOG_FILE), read_queries(catalog_dir))
+    after = time_extraction([catalog])
+    pages = rewrite_pages(names, pages_dir)
+    if remove:
+        for source in sources:
+            shutil.rmtree(source.directory)
+    return {
+        "sources": [source.name for source in sources],
+        "tables": sum(canonical is None for canonical in layout.values()),
+        "duplicates": {key: value for key, value in layout.items() if value is not None},
+        "pages": pages,
+        "seconds_before": before,
+        "seconds_after": after,
+        "bytes_before": size_before,
+        "bytes_after": disk_use([catalog]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolidate the Evidence DuckDB sources into one catalog")
+    parser.add_argument("--sources-dir", default=SOURCES_DIR)
+    parser.add_argument("--pages-dir", default=PAGES_DIR)
+    parser.add_argument("--remove", action="store_true", help="delete the migrated source folders")
+    parser.add_argument("--plan", action="store_true", help="only list the sources and their extraction time")
+    args = parser.parse_args()
+
+    if args.plan:
+        sources = discover(args.sources_dir)
+        for source in sources:
+            print(f"{source.name}: {source.db_file} ({', '.join(source.queries)})")
+        print(f"Extraction: {time_extraction(sources):.3f}s, {disk_use(sources) / 1e6:.1f} MB")
+        return
+
+    result = migrate(args.sources_dir, args.pages_dir, args.remove)
+    print(f"Migrated {', '.join(result['sources'])} into {CATALOG}: {result['tables']} tables")
+    for (schema, table), (canonical_schema, canonical_table) in result["duplicates"].items():
+        print(f"  {schema}.{table} is a view of {canonical_schema}.{canonical_table} (same rows)")
+    for page in result["pages"]:
+        print(f"  updated {os.path.relpath(page, args.pages_dir)}")
+    print(
+        f"Extraction: {result['seconds_before']:.3f}s -> {result['seconds_after']:.3f}s, "
+        f"disk: {result['bytes_before'] / 1e6:.1f} MB -> {result['bytes_after'] / 1e6:.1f} MB"
+    )
+    if not args.remove:
+        print("The old source folders were kept; rerun with --remove (or delete them) once the pages check out")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import csv
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+
+from harness import cassette, config, timing
+from harness.histogram import LatencyHistogram
+from harness.timing import TimedHTTPAdapter
+
+# One keep-alive session per base URL (scheme://host:port), shared by every
+# suite in the process, so repeated calls to the same server reuse their TCP
+# connections instead of opening a new one per request.
+POOL_MAXSIZE = 32
+
+# Request budgets. Every request gets a (connect, read) timeout, clamped to
+# what is left of the suite deadline; once the deadline has passed requests
+# fail with DeadlineExceeded instead of being sent. Retries (connection
+# errors, timeouts, 502/503/504) and hedging are opt-in. A hedged request
+# sends a second copy once the first has been outstanding for longer than the
+# endpoint's p95 latency and returns whichever answers first. Retries, hedges
+# and hedges that won are counted per server next to the request counts, so a
+# slow server still shows up in the report when hedging hides it from a test.
+RETRY_STATUSES = (502, 503, 504)
+RETRY_BACKOFF = 0.5  # seconds before the first retry, doubled each time
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20  # no hedging until the endpoint has this much history
+HEDGE_WORKERS = 64
+COUNTERS = ("retries", "hedges", "hedge_wins", "timeouts", "deadline_exceeded")
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_counters = {}
+_latencies = {}
+_stats_lock = threading.Lock()
+_deadline = None
+_hedge_pool = None
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    pass
+
+
+def base_url_of(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def session_for(url):
+    key = base_url_of(url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = cassette.make_adapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+            if adapter is None:
+                adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+            session.mount(key + "/", adapter)
+            _sessions[key] = session
+        return session
+
+
+def set_deadline(seconds):
+    # Time budget for every request made from now on; None removes it
+    global _deadline
+    _deadline = None if seconds is None else time.monotonic() + seconds
+
+
+def remaining():
+    return None if _deadline is None else _deadline - time.monotonic()
+
+
+def _timeout_for(timeout):
+    if timeout is None:
+        timeout = (config.CONNECT_TIMEOUT, config.REQUEST_TIMEOUT)
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("suite deadline exceeded")
+    if isinstance(timeout, tuple):
+        return tuple(left if part is None else min(part, left) for part in timeout)
+    return min(timeout, left)
+
+
+def _count(base_url, counter):
+    with _stats_lock:
+        counts = _counters.setdefault(base_url, dict.fromkeys(COUNTERS, 0))
+        counts[counter] += 1
+
+
+def _endpoint(method, url):
+    parts = urlsplit(url)
+    return method.upper(), f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def _record_latency(method, url, seconds):
+    key = _endpoint(method, url)
+    with _stats_lock:
+        histogram = _latencies.get(key)
+        if histogram is None:
+            histogram = _latencies[key] = LatencyHistogram()
+        histogram.record_value(seconds * 1_000_000)
+
+
+def hedge_delay(method, url):
+    # p95 of the endpoint's latency so far, or None while there is too little
+    # history to tell a slow request from a normal one
+    with _stats_lock:
+        histogram = _latencies.get(_endpoint(method, url))
+        if histogram is None or histogram.total_count < HEDGE_MIN_SAMPLES:
+            return None
+        return histogram.value_at_percentile(HEDGE_PERCENTILE) / 1_000_000
+
+
+def _attempt(session, method, url, timeout, kwargs):
+    timeout = _timeout_for(timeout)
+    start = time.perf_counter()
+    response = session.request(method, url, timeout=timeout, **kwargs)
+    _record_latency(method, url, time.perf_counter() - start)
+    return response
+
+
+def _captured_attempt(session, method, url, timeout, kwargs):
+    # Runs on a hedge thread; the phase timings travel back with the response
+    timing.start_capture()
+    try:
+        response = _attempt(session, method, url, timeout, kwargs)
+    finally:
+        phases = timing.stop_capture()
+    return response, phases
+
+
+def _close_response(future):
+    if future.exception() is None:
+        future.result()[0].close()
+
+
+def _hedged(session, method, url, timeout, delay, kwargs):
+    global _hedge_pool
+    with _stats_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+    primary = _hedge_pool.submit(_captured_attempt, session, method, url, timeout, kwargs)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        response, phases = primary.result()
+        timing.merge(phases)
+        return response
+
+    _count(base_url_of(url), "hedges")
+    backup = _hedge_pool.submit(_captured_attempt, session, method, url, timeout, kwargs)
+    pending = {primary, backup}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in sorted(done, key=lambda future: future is backup):
+            if future.exception() is not None:
+                continue
+            if future is backup:
+                _count(base_url_of(url), "hedge_wins")
+            for other in pending:
+                other.add_done_callback(_close_response)
+            response, phases = future.result()
+            timing.merge(phases)
+            return response
+    # Both copies failed; report the original request's error
+    raise primary.exception()
+
+
+def _can_retry(attempt, retries):
+    left = remaining()
+    return attempt < retries and (left is None or left > RETRY_BACKOFF * 2 ** attempt)
+
+
+def request(method, url, timeout=None, retries=None, hedge=None, **kwargs):
+    # timeout: seconds or (connect, read), default from config; retries and
+    # hedge default to HARNESS_RETRIES / HARNESS_HEDGE
+    retries = config.RETRIES if retries is None else retries
+    hedge = config.HEDGE if hedge is None else hedge
+    base_url = base_url_of(url)
+    session = session_for(url)
+    attempt = 0
+    while True:
+        delay = hedge_delay(method, url) if hedge else None
+        try:
+            if delay is None:
+                response = _attempt(session, method, url, timeout, kwargs)
+            else:
+                response = _hedged(session, method, url, timeout, delay, kwargs)
+        except DeadlineExceeded:
+            _count(base_url, "deadline_exceeded")
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if isinstance(e, requests.exceptions.Timeout):
+                _count(base_url, "timeouts")
+            if not _can_retry(attempt, retries):
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or not _can_retry(attempt, retries):
+                return response
+            response.close()
+        time.sleep(RETRY_BACKOFF * 2 ** attempt)
+        attempt += 1
+        _count(base_url, "retries")
+
+
+def get(url, params=None, **kwargs):
+    return request("GET", url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request("POST", url, data=data, json=json, **kwargs)
+
+
+def connection_stats():
+    # urllib3 counts every request sent through a pool (num_requests) and
+    # every new connection it had to open (num_connections); the difference
+    # is the number of requests that went over an already open connection.
+    stats = {}
+    with _sessions_lock:
+        sessions = dict(_sessions)
+    with _stats_lock:
+        counters = {base_url: dict(counts) for base_url, counts in _counters.items()}
+    for base_url, session in sessions.items():
+        adapter = session.get_adapter(base_url + "/")
+        pools = adapter.poolmanager.pools
+        requests_sent = handshakes = 0
+        for key in pools.keys():
+            pool = pools[key]
+            requests_sent += pool.num_requests
+            handshakes += pool.num_connections
+        stats[base_url] = {
+            "requests": requests_sent,
+            "handshakes": handshakes,
+            "reused": requests_sent - handshakes,
+            **counters.get(base_url, dict.fromkeys(COUNTERS, 0)),
+        }
+    return stats
+
+
+def generate_connection_report(csv_file="connection_report.csv"):
+    stats = connection_stats()
+    print(f"Generating connection report: {csv_file}")
+    with open(csv_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(
+            ["Base URL", "Requests", "Handshakes", "Reused"]
+            + ["Retries", "Hedged", "Hedge Wins", "Timeouts", "Deadline Exceeded"]
+        )
+        for base_url, counts in stats.items():
+            row = [base_url, counts["requests"], counts["handshakes"], counts["reused"]]
+            row += [counts[counter] for counter in COUNTERS]
+            writer.writerow(row)
+            print(f"Written row: {row}")
+    return stats
+
+
+def use_cassette(path, mode, replay_latency=False):
+    # Sessions created from now on record to / replay from the cassette
+    close_all()
+    cassette.configure(path, mode, replay_latency)
+
+
+def close_all():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+    with _stats_lock:
+        _counters.clear()
+        _latencies.clear()
+
+
+if config.SUITE_DEADLINE is not None:
+    set_deadline(config.SUITE_DEADLINE)
+
+if config.CASSETTE_PATH:
+    use_cassette(config.CASSETTE_PATH, config.CASSETTE_MODE, config.CASSETTE_REPLAY_LATENCY)
@@ -0,0 +1,223 @@
+import csv
+import os
+import time
+import unittest
+from array import array
+from datetime import datetime
+
+from harness.report_index import ReportIndex
+from harness.runs import Run
+
+# One result collector for every suite, used by the unittest runner below and
+# by the pytest hooks in harness/pytest_plugin.py. Durations come from
+# perf_counter_ns (monotonic, nanosecond resolution) taken around each test;
+# the wall-clock start is only used for the report's date/time columns.
+# Results are kept column by column (names, start, duration, status) and only
+# turned into rows when the report is written. Each collector is one run
+# (harness/runs.py) and every row carries its run ID.
+REPORT_COLUMNS = ["Test Case Name", "Start Date", "Start Time", "Duration (seconds)", "Status", "Run ID"]
+
+
+def name_of(test):
+    return test.id().split(".")[-1]
+
+
+class ResultCollector:
+    def __init__(self, run=None):
+        self.run = run or Run()
+        self.names = []
+        self.start_ns = array("q")  # time.time_ns() when the test started
+        self.duration_ns = array("q")
+        self.statuses = []
+        self._index = {}
+        self._running = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def _row(self, name):
+        index = self._index.get(name)
+        if index is None:
+            index = self._index[name] = len(self.names)
+            self.names.append(name)
+            self.start_ns.append(0)
+            self.duration_ns.append(0)
+            self.statuses.append("unknown")
+        return index
+
+    def start(self, name):
+        index = self._row(name)
+        self.start_ns[index] = time.time_ns()
+        self._running[name] = time.perf_counter_ns()
+
+    def stop(self, name):
+        started = self._running.pop(name, None)
+        if started is not None:
+            self.duration_ns[self._row(name)] = time.perf_counter_ns() - started
+
+    def set_status(self, name, status):
+        self.statuses[self._row(name)] = status
+
+    def status(self, name):
+        return self.statuses[self._index[name]]
+
+    def duration_seconds(self, name):
+        return self.duration_ns[self._index[name]] / 1e9
+
+    def test_timings(self):
+        # Same shape as the suites' test_timings dicts
+        return {
+            name: {
+                "start_time": datetime.fromtimestamp(start / 1e9).strftime("%Y-%m-%d %H:%M:%S"),
+                "duration_seconds": duration / 1e9,
+            }
+            for name, start, duration in zip(self.names, self.start_ns, self.duration_ns)
+        }
+
+    def test_results(self):
+        return dict(zip(self.names, self.statuses))
+
+    def report_rows(self, extra=None):
+        # extra: {test name: {column: value}} for suite-specific columns
+        extra = extra or {}
+        for name, start, duration, status in zip(self.names, self.start_ns, self.duration_ns, self.statuses):
+            started = datetime.fromtimestamp(start / 1e9)
+            yield {
+                "Test Case Name": name,
+                "Start Date": started.strftime("%Y-%m-%d"),
+                "Start Time": started.strftime("%H:%M:%S"),
+                "Start Timestamp": started.strftime("%Y-%m-%d %H:%M:%S"),
+                "Duration (seconds)": duration / 1e9,
+                "Status": status,
+                "Run ID": self.run.run_id,
+                **extra.get(name, {}),
+            }
+
+
+def make_collector(results, day=None):
+    # A collector filled without running anything, for the harness tests and
+    # benchmarks: results is {test name: status} or {test name: (status,
+    # duration in seconds)}; with `day` every test started at noon that day
+    collector = ResultCollector()
+    for name, result in results.items():
+        status, seconds = result if isinstance(result, tuple) else (result, None)
+        collector.start(name)
+        collector.stop(name)
+        collector.set_status(name, status)
+        index = collector._index[name]
+        if seconds is not None:
+            collector.duration_ns[index] = int(seconds * 1e9)
+        if day is not None:
+            collector.start_ns[index] = int(datetime(day.year, day.month, day.day, 12).timestamp() * 1e9)
+    return collector
+
+
+class CollectingTestResult(unittest.TextTestResult):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.collector = ResultCollector()
+
+    @property
+    def test_timings(self):
+        return self.collector.test_timings()
+
+    @property
+    def test_results(self):
+        return self.collector.test_results()
+
+    def stopTestRun(self):
+        self.collector.run.finish()
+        super().stopTestRun()
+
+    def startTest(self, test):
+        super().startTest(test)
+        self.collector.start(name_of(test))
+
+    def stopTest(self, test):
+        self.collector.stop(name_of(test))
+        super().stopTest(test)
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self.collector.set_status(name_of(test), "pass")
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.collector.set_status(name_of(test), "fail")
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.collector.set_status(name_of(test), "error")
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self.collector.set_status(name_of(test), "skip")
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self.collector.set_status(name_of(test), "pass")
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self.collector.set_status(name_of(test), "fail")
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            failed = issubclass(err[0], test.failureException)
+            self.collector.set_status(name_of(test), "fail" if failed else "error")
+
+
+class CollectingTestRunner(unittest.TextTestRunner):
+    resultclass = CollectingTestResult
+
+
+def generate_csv_report(filename, collector, fieldnames=REPORT_COLUMNS, extra=None):
+    # Appends the run's rows. Rows are keyed by (run ID, test) and the keys
+    # already in the report live in its key index (harness/report_index.py),
+    # so nothing in the file has to be read except the header and a run that
+    # is written twice is only appended once. A report written with different
+    # columns is rewritten once with the new header, leaving the cells it has
+    # no value for (e.g. the run ID of older rows) empty. With a "Start Time"
+    # column but no "Start Date" column the start time is the full timestamp.
+    existing_fieldnames = None
+    if os.path.isfile(filename) and os.stat(filename).st_size:
+        with open(filename, mode="r", newline="") as file:
+            existing_fieldnames = next(csv.reader(file), None)
+
+    if existing_fieldnames is not None and existing_fieldnames != fieldnames:
+        with open(filename, mode="r", newline="") as file:
+            existing_rows = list(csv.DictReader(file))
+        with open(filename, mode="w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames, restval="", extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(existing_rows)
+
+    rows = list(collector.report_rows(extra))
+
+    def key(row):
+        # Reports without a "Run ID" column are keyed by test name alone
+        return row["Run ID"] if "Run ID" in fieldnames else "", row["Test Case Name"]
+
+    print(f"Generating CSV report: {filename}")
+    with ReportIndex(filename) as index:
+        if not index.in_sync():
+            index.rebuild(fieldnames)
+        index.begin()
+        try:
+            new_keys = index.add(key(row) for row in rows)
+            with open(filename, mode="a", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=fieldnames, restval="", extrasaction="ignore")
+                if os.stat(filename).st_size == 0:
+                    writer.writeheader()
+
+                for row in rows:
+                    if key(row) not in new_keys:
+                        continue
+                    if "Start Date" not in fieldnames:
+                        row["Start Time"] = row["Start Timestamp"]
+                    writer.writerow(row)
+        except BaseException:
+            index.rollback()
+            raise
+        index.commit()
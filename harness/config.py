@@ -0,0 +1,63 @@
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DuckDB file behind the Evidence "test_database" source
+TEST_DATABASE = os.path.join(REPO_ROOT, "my-project", "sources", "test_database", "my_duckdb_data.db")
+
+# Remote servers the suites talk to. Setting HARNESS_BASE_URL points every
+# suite at a single server instead, e.g. the local stand-in:
+#   python -m harness.standin --port 8000
+#   HARNESS_BASE_URL=http://127.0.0.1:8000 pytest unit_tests unit_tests_booking
+DEFAULT_AGENT_BASE_URL = "http://3.82.58.102:8000"
+DEFAULT_TOOLS_BASE_URL = "http://100.25.26.186:8002"
+
+BASE_URL_OVERRIDE = (os.environ.get("HARNESS_BASE_URL") or "").rstrip("/") or None
+
+AGENT_BASE_URL = BASE_URL_OVERRIDE or DEFAULT_AGENT_BASE_URL
+TOOLS_BASE_URL = BASE_URL_OVERRIDE or DEFAULT_TOOLS_BASE_URL
+
+# Record/replay: HARNESS_CASSETTE=suites.cassette HARNESS_CASSETTE_MODE=record
+# stores every response; HARNESS_CASSETTE_MODE=replay serves them back without
+# touching the network (add HARNESS_CASSETTE_LATENCY=1 to keep recorded timings).
+CASSETTE_PATH = os.environ.get("HARNESS_CASSETTE") or None
+CASSETTE_MODE = os.environ.get("HARNESS_CASSETTE_MODE", "replay") if CASSETTE_PATH else None
+CASSETTE_REPLAY_LATENCY = os.environ.get("HARNESS_CASSETTE_LATENCY", "") not in ("", "0")
+
+# JSONL case corpora for the /interact and classification suites (see
+# harness/corpus.py); point these at a bigger file to run a larger corpus.
+CORPUS_DIR = os.path.join(REPO_ROOT, "unit_tests", "corpus")
+INTERACT_CORPUS = os.environ.get("HARNESS_INTERACT_CORPUS") or os.path.join(CORPUS_DIR, "interact.jsonl")
+CLASSIFICATION_CORPUS = (
+    os.environ.get("HARNESS_CLASSIFICATION_CORPUS") or os.path.join(CORPUS_DIR, "classification.jsonl")
+)
+CORPUS_BATCH_SIZE = int(os.environ.get("HARNESS_CORPUS_BATCH_SIZE", "8"))
+
+# Request budgets for the shared client (harness/client.py). Every call gets
+# a timeout; HARNESS_DEADLINE caps the whole process (one suite) in seconds.
+# Retries and hedged requests are off unless asked for.
+CONNECT_TIMEOUT = float(os.environ.get("HARNESS_CONNECT_TIMEOUT", "10"))
+REQUEST_TIMEOUT = float(os.environ.get("HARNESS_TIMEOUT", "60"))
+SUITE_DEADLINE = float(os.environ["HARNESS_DEADLINE"]) if os.environ.get("HARNESS_DEADLINE") else None
+RETRIES = int(os.environ.get("HARNESS_RETRIES", "0"))
+HEDGE = os.environ.get("HARNESS_HEDGE", "") not in ("", "0")
+
+# Where the suites write their results (harness/sink.py). Running a suite
+# module as a script always writes them; pytest runs only with
+# HARNESS_PYTEST_REPORTS=1 (harness/pytest_plugin.py). The CSV reports are
+# written as well with HARNESS_CSV_EXPORT=1.
+RESULTS_DATABASE = os.environ.get("HARNESS_RESULTS_DB") or TEST_DATABASE
+PYTEST_REPORTS = os.environ.get("HARNESS_PYTEST_REPORTS", "") not in ("", "0")
+CSV_EXPORT = os.environ.get("HARNESS_CSV_EXPORT", "") not in ("", "0")
+
+# Every run is also kept as Parquet, partitioned by suite and date, next to
+# the results database (harness/history.py); HARNESS_HISTORY=0 turns it off.
+HISTORY_DIR = os.environ.get("HARNESS_HISTORY_DIR") or os.path.join(
+    os.path.dirname(RESULTS_DATABASE), "test_history"
+)
+HISTORY = os.environ.get("HARNESS_HISTORY", "1") not in ("", "0")
+
+# The timed scale tests of the ASU tools engines (a million patients, ten
+# million scores, ...) only run with HARNESS_BENCHMARKS=1: a wall-clock limit
+# is not reliable on a loaded machine.
+BENCHMARKS = os.environ.get("HARNESS_BENCHMARKS", "") not in ("", "0")
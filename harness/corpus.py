@@ -0,0 +1,197 @@
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+from harness import async_runner, timing
+from harness.scheduler import longest_first
+
+# Data-driven API cases. A corpus is a JSONL file with one case per line:
+#
+#   {"id": "test_greeting_request", "message": "hi, how are you?",
+#    "expect": {"status": 200, "json_keys": ["agent_answer"]}}
+#
+# A line of the form {"defaults": {...}} sets fields that every following case
+# starts from (until the next defaults line), so a block of similar cases only
+# has to spell out what differs. Blank lines and lines starting with # are
+# skipped. {"$repeat": [value, n]} anywhere in a case expands to value * n, for
+# payloads too big to write out.
+#
+# Cases are read lazily and at most `batch_size` of them are in flight at a
+# time, so memory does not grow with the size of the corpus. With duration
+# estimates (harness/scheduler.py, keyed by case id) the cases start
+# longest-first instead; that ordering needs the whole corpus read up front.
+
+
+def expand(value):
+    if isinstance(value, dict):
+        if set(value) == {"$repeat"}:
+            repeated, count = value["$repeat"]
+            return expand(repeated) * count
+        return {key: expand(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    return value
+
+
+def read_cases(path):
+    defaults = {}
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+            if "defaults" in entry:
+                defaults = entry["defaults"]
+                continue
+            yield expand({**defaults, **entry})
+
+
+def lookup(document, path):
+    # "agent_answer.text_sections.0.text" -> document["agent_answer"]["text_sections"][0]["text"]
+    for part in path.split("."):
+        if isinstance(document, list):
+            document = document[int(part)]
+        else:
+            document = document[part]
+    return document
+
+
+def _resolve(expected, case):
+    if isinstance(expected, dict) and set(expected) == {"$case"}:
+        return case[expected["$case"]]
+    return expected
+
+
+@lru_cache(maxsize=None)
+def _compile(spec):
+    # Turn an expectation spec into a list of checks once; cases with the same
+    # spec (the usual situation inside a defaults block) share them.
+    expect = json.loads(spec)
+    checks = []
+
+    if "status" in expect:
+        status = expect["status"]
+
+        def check_status(response, body, case):
+            if response.status_code != status:
+                return f"status {response.status_code} != {status}"
+        checks.append(check_status)
+
+    for key in expect.get("json_keys", []):
+        def check_key(response, body, case, key=key):
+            if not isinstance(body, dict) or key not in body:
+                return f"{key!r} not in response"
+        checks.append(check_key)
+
+    for path, expected in expect.get("equals", {}).items():
+        def check_equals(response, body, case, path=path, expected=expected):
+            value = _resolve(expected, case)
+            try:
+                actual = lookup(body, path)
+            except (KeyError, IndexError, TypeError, ValueError):
+                return f"{path} missing from response"
+            if actual != value:
+                return f"{path}: {actual!r} != {value!r}"
+        checks.append(check_equals)
+
+    for path, expected in expect.get("contains", {}).items():
+        def check_contains(response, body, case, path=path, expected=expected):
+            value = _resolve(expected, case)
+            try:
+                actual = lookup(body, path)
+            except (KeyError, IndexError, TypeError, ValueError):
+                return f"{path} missing from response"
+            if value not in actual:
+                return f"{value!r} not in {path}"
+        checks.append(check_contains)
+
+    needs_body = any(key in expect for key in ("json_keys", "equals", "contains"))
+    return tuple(checks), needs_body
+
+
+def validate(case, response):
+    checks, needs_body = _compile(json.dumps(case.get("expect", {}), sort_keys=True))
+    body = None
+    if needs_body:
+        try:
+            body = response.json()
+        except ValueError:
+            return ["response is not JSON"]
+    failures = []
+    for check in checks:
+        failure = check(response, body, case)
+        if failure:
+            failures.append(failure)
+    return failures
+
+
+class CaseResult:
+    def __init__(self, case, start_time, duration, phases, failures, error):
+        self.case = case
+        self.case_id = case["id"]
+        self.start_time = start_time
+        self.duration = duration
+        self.phases = phases
+        self.failures = failures
+        self.error = error
+
+    def timings(self):
+        # Same shape as the test_timings entries written by tearDown
+        return {
+            "start_time": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_seconds": self.duration,
+            **self.phases,
+        }
+
+
+def run_case(case, send):
+    start_time = datetime.now()
+    start = time.perf_counter()
+    timing.start_capture()
+    failures, error = [], None
+    try:
+        failures = validate(case, send(case))
+    except Exception as e:
+        error = e
+    phases = timing.stop_capture()
+    return CaseResult(case, start_time, time.perf_counter() - start, phases, failures, error)
+
+
+def _run_in_slot(case, send, slots, host):
+    try:
+        return run_case(case, send)
+    finally:
+        slots.release(host)
+
+
+def run_cases(cases, send, batch_size=8, estimates=None):
+    # Results come back in corpus order (longest-first order with
+    # `estimates`). The next case is only read once a slot in the window is
+    # free. Under the asyncio runner the test's own slot carries one case and
+    # every further case in flight needs a free slot of the runner's limits
+    # (harness/async_runner.py); without one the window waits for its oldest
+    # case, so --concurrency and --per-host bound the requests.
+    if estimates is not None:
+        cases = longest_first(cases, estimates, key=lambda case: case["id"])
+    slots, host = async_runner.held_slot() or (None, None)
+    window = deque()  # (future, whether the case took a slot of the runner)
+    with ThreadPoolExecutor(max_workers=batch_size) as executor:
+        for case in cases:
+            while True:
+                if len(window) < batch_size:
+                    if slots is None or all(extra for _, extra in window):
+                        window.append((executor.submit(run_case, case, send), False))
+                        break
+                    if slots.try_acquire(host):
+                        window.append((executor.submit(_run_in_slot, case, send, slots, host), True))
+                        break
+                yield window.popleft()[0].result()
+        while window:
+            yield window.popleft()[0].result()
@@ -0,0 +1,104 @@
+import math
+
+# HDR-style histogram: values are integers (microseconds by default) stored in
+# log-linear buckets, so every recorded value keeps `significant_figures`
+# decimal digits of precision over the whole range at a fixed memory cost.
+# Bucket arithmetic follows HdrHistogram; counts live in a sparse dict.
+
+
+class LatencyHistogram:
+    def __init__(self, lowest_trackable=1, significant_figures=3):
+        self.significant_figures = significant_figures
+        self.unit_magnitude = int(math.floor(math.log2(lowest_trackable)))
+        largest_single_unit = 2 * 10 ** significant_figures
+        self.sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self.sub_bucket_half_count_magnitude = self.sub_bucket_count_magnitude - 1
+        self.sub_bucket_count = 1 << self.sub_bucket_count_magnitude
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+        self.sub_bucket_mask = (self.sub_bucket_count - 1) << self.unit_magnitude
+        self.counts = {}
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+
+    def _counts_index(self, value):
+        bucket_index = (
+            (value | self.sub_bucket_mask).bit_length()
+            - self.unit_magnitude
+            - self.sub_bucket_half_count_magnitude
+            - 1
+        )
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        return ((bucket_index + 1) << self.sub_bucket_half_count_magnitude) + (
+            sub_bucket_index - self.sub_bucket_half_count
+        )
+
+    def _value_range(self, counts_index):
+        # Lowest value stored at this index and the width of its bucket
+        bucket_index = (counts_index >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (counts_index & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self.sub_bucket_half_count
+            bucket_index = 0
+        shift = bucket_index + self.unit_magnitude
+        return sub_bucket_index << shift, 1 << shift
+
+    def highest_equivalent_value(self, value):
+        low, size = self._value_range(self._counts_index(value))
+        return low + size - 1
+
+    def record_value(self, value, count=1):
+        value = max(0, int(value))
+        index = self._counts_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = max(self.max_value, value)
+
+    def record_corrected_value(self, value, expected_interval):
+        # For closed-loop measurements: back-fill the samples that a stalled
+        # sender would have taken (HdrHistogram recordValueWithExpectedInterval)
+        self.record_value(value)
+        if expected_interval <= 0:
+            return
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            self.record_value(missing)
+            missing -= expected_interval
+
+    def add(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+
+    def value_at_percentile(self, percentile):
+        if self.total_count == 0:
+            return 0
+        target = max(1, int(math.ceil(percentile / 100.0 * self.total_count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                low, size = self._value_range(index)
+                return min(low + size - 1, self.max_value)
+        return self.max_value
+
+    def percentiles(self, points=(50, 90, 99, 99.9)):
+        return {point: self.value_at_percentile(point) for point in points}
+
+    def percentile_distribution(self, ticks_per_half=5):
+        # (percentile, value) pairs that get denser towards the tail, like
+        # HdrHistogram's outputPercentileDistribution
+        distribution = []
+        percentile = 0.0
+        half_distance = 50.0
+        while percentile < 99.9999 and self.total_count:
+            for _ in range(ticks_per_half):
+                distribution.append((percentile, self.value_at_percentile(percentile)))
+                percentile += half_distance / ticks_per_half
+            half_distance /= 2
+        distribution.append((100.0, self.max_value))
+        return distribution
@@ -0,0 +1,123 @@
+import argparse
+import os
+
+import duckdb
+
+from harness import config
+
+# Long-term per-test history. Every run a suite writes (harness/sink.py) is
+# also exported as its own Parquet file under
+#
+#   <history dir>/suite=<suite>/run_date=<YYYY-MM-DD>/run_<uuid>.parquet
+#
+# so nothing is ever rewritten and a run costs one small file. The
+# test_history view in the results database reads the files with hive
+# partitioning: a query that filters on suite and/or run_date only opens the
+# files of the matching partitions.
+#
+# The view holds the history directory relative to the database's directory,
+# not this checkout's absolute path, so the committed database works in any
+# checkout; readers resolve it there (connect() sets DuckDB's
+# file_search_path, Evidence reads its sources from that directory). DuckDB
+# cannot bind a view over a glob that matches nothing, so the directory
+# always holds an empty, typed base file in a partition of its own (the only
+# part of it that is committed).
+VIEW = "test_history"
+HISTORY_COLUMNS = ["Test Case Name", "Start Time", "Duration (seconds)", "Status", "Run ID"]
+BASE_COLUMNS = ["VARCHAR", "TIMESTAMP", "DOUBLE", "VARCHAR", "VARCHAR"]
+BASE_FILE = os.path.join("suite=_", "run_date=1970-01-01", "base.parquet")
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def history_glob(history_dir=None):
+    return os.path.join(history_dir or config.HISTORY_DIR, "*", "*", "*.parquet")
+
+
+def export_run(con, suite, table, history_dir=None):
+    # `table` holds the run's rows with a timestamp "Start Time" column; the
+    # run date comes from it, so a run over midnight spans two partitions
+    history_dir = history_dir or config.HISTORY_DIR
+    os.makedirs(history_dir, exist_ok=True)
+    con.execute(
+        f"COPY (SELECT {_literal(suite)} AS suite, CAST(\"Start Time\" AS DATE) AS run_date, * FROM {table}) "
+        f"TO {_literal(history_dir)} "
+        "(FORMAT PARQUET, PARTITION_BY (suite, run_date), OVERWRITE_OR_IGNORE, FILENAME_PATTERN 'run_{uuid}')"
+    )
+
+
+def write_base(history_dir=None):
+    base_file = os.path.join(history_dir or config.HISTORY_DIR, BASE_FILE)
+    if os.path.isfile(base_file):
+        return
+    os.makedirs(os.path.dirname(base_file), exist_ok=True)
+    columns = ", ".join(
+        f"CAST(NULL AS {column_type}) AS {_quote(name)}" for name, column_type in zip(HISTORY_COLUMNS, BASE_COLUMNS)
+    )
+    con = duckdb.connect()
+    try:
+        con.execute(f"COPY (SELECT {columns} WHERE false) TO {_literal(base_file)} (FORMAT PARQUET)")
+    finally:
+        con.close()
+
+
+def view_glob(db_file=None, history_dir=None):
+    # The history glob relative to the database's directory, with forward
+    # slashes; absolute if there is no relative path (another drive)
+    pattern = history_glob(history_dir)
+    try:
+        pattern = os.path.relpath(pattern, os.path.dirname(os.path.abspath(db_file or config.RESULTS_DATABASE)))
+    except ValueError:
+        pattern = os.path.abspath(pattern)
+    return pattern.replace(os.sep, "/")
+
+
+def connect(db_file=None, read_only=False):
+    # A connection that resolves the view's relative glob
+    db_file = db_file or config.RESULTS_DATABASE
+    con = duckdb.connect(database=db_file, read_only=read_only)
+    con.execute(f"SET file_search_path = {_literal(os.path.dirname(os.path.abspath(db_file)))}")
+    return con
+
+
+def create_view(db_file=None, history_dir=None):
+    write_base(history_dir)
+    con = connect(db_file)
+    try:
+        con.execute(
+            f"CREATE OR REPLACE VIEW {VIEW} AS SELECT * FROM "
+            f"read_parquet({_literal(view_glob(db_file, history_dir))}, hive_partitioning = true, union_by_name = true)"
+        )
+    finally:
+        con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recreate the test_history view and summarise the history")
+    parser.add_argument("--db", default=config.RESULTS_DATABASE)
+    parser.add_argument("--history-dir", default=config.HISTORY_DIR)
+    args = parser.parse_args()
+
+    create_view(args.db, args.history_dir)
+    con = connect(args.db, read_only=True)
+    try:
+        rows = con.execute(
+            f"SELECT suite, count(DISTINCT run_date), min(run_date), max(run_date), count(*) "
+            f"FROM {VIEW} GROUP BY suite ORDER BY suite"
+        ).fetchall()
+    finally:
+        con.close()
+    if not rows:
+        print(f"No history in {args.history_dir}")
+    for suite, days, first, last, results in rows:
+        print(f"{suite}: {results} results over {days} days ({first} .. {last})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import csv
+import glob
+import os
+import re
+import sys
+import time
+
+import duckdb
+
+from harness import config, summary, timing
+
+# Bulk import of CSV reports into persistent DuckDB tables. Files are read by
+# DuckDB's own CSV reader (streamed, parallel, never through pandas), one
+# table per report file, or one table for all of them with --table, and
+# every table is created in a single transaction: an import that fails
+# half-way leaves the database as it was. Columns the harness knows are
+# given their type explicitly (e.g. a run ID of only digits stays VARCHAR),
+# the rest are detected. Tables of test results (with Status, Duration and a
+# start date or time) get their test_summary rows (harness/summary.py) in the
+# same transaction.
+COLUMN_TYPES = {
+    "Test Case Name": "VARCHAR",
+    "Test Name": "VARCHAR",
+    "Start Date": "DATE",
+    "Duration (seconds)": "DOUBLE",
+    "Status": "VARCHAR",
+    "Run ID": "VARCHAR",
+    # pytest-csv reports stamped by harness/stamp.py
+    "duration": "DOUBLE",
+    "date": "DATE",
+    "time": "TIME",
+    **{column: "DOUBLE" for column in timing.PHASE_COLUMNS},
+}
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def table_name(csv_file):
+    # test_report_interact.csv -> test_report_interact
+    return re.sub(r"\W", "_", os.path.splitext(os.path.basename(csv_file))[0])
+
+
+def _header(csv_file):
+    with open(csv_file, mode="r", newline="") as file:
+        return next(csv.reader(file), [])
+
+
+def expand(patterns):
+    files = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            if path not in files:
+                files.append(path)
+    return files
+
+
+def csv_source(files):
+    columns = []
+    for csv_file in files:
+        columns += [column for column in _header(csv_file) if column not in columns]
+    options = ["header = true", "union_by_name = true"]
+    types = [f"{_literal(column)}: {_literal(COLUMN_TYPES[column])}" for column in columns if column in COLUMN_TYPES]
+    if types:
+        options.append("types = {" + ", ".join(types) + "}")
+    file_list = "[" + ", ".join(_literal(os.path.abspath(csv_file)) for csv_file in files) + "]"
+    return f"read_csv({file_list}, {', '.join(options)})"
+
+
+def import_reports(patterns, db_file=None, table=None, append=False):
+    # Returns {table: rows imported}. Without `append` each table is replaced.
+    tables = {}
+    for csv_file in expand(patterns):
+        if not os.path.isfile(csv_file):
+            raise FileNotFoundError(csv_file)
+        tables.setdefault(table or table_name(csv_file), []).append(csv_file)
+
+    imported = {}
+    con = duckdb.connect(database=db_file or config.RESULTS_DATABASE, read_only=False)
+    try:
+        con.execute("BEGIN TRANSACTION")
+        try:
+            for name, files in tables.items():
+                source = csv_source(files)
+                if append:
+                    con.execute(f"CREATE TABLE IF NOT EXISTS {_quote(name)} AS SELECT * FROM {source} LIMIT 0")
+                    rows = con.execute(f"INSERT INTO {_quote(name)} BY NAME SELECT * FROM {source}").fetchone()[0]
+                    summary.add(con, name, source)
+                else:
+                    rows = con.execute(f"CREATE OR REPLACE TABLE {_quote(name)} AS SELECT * FROM {source}").fetchone()[0]
+                imported[name] = rows
+            if not append:
+                # Replaced tables are summarised again from what they now hold
+                result_tables = summary.result_tables(con)
+                replaced = [name for name in imported if name in result_tables]
+                if replaced:
+                    summary.replace(con, replaced)
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.close()
+    return imported
+
+
+def peak_memory_mb():
+    # None where there is no resource module (Windows); ru_maxrss is in
+    # kilobytes on Linux and bytes on macOS
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import CSV test reports into persistent DuckDB tables")
+    parser.add_argument("reports", nargs="+", help="report files or glob patterns, e.g. 'unit_tests*/test_report*.csv'")
+    parser.add_argument("--db", default=config.RESULTS_DATABASE)
+    parser.add_argument("--table", help="import every report into this one table (default: one table per file)")
+    parser.add_argument("--append", action="store_true", help="append to the tables instead of replacing them")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    imported = import_reports(args.reports, args.db, args.table, args.append)
+    elapsed = time.perf_counter() - started
+
+    for name, rows in imported.items():
+        print(f"{name}: {rows} rows")
+    total = sum(imported.values())
+    peak = peak_memory_mb()
+    print(
+        f"Imported {total} rows into {len(imported)} table(s) ({args.db}) in {elapsed:.2f}s: "
+        f"{total / elapsed if elapsed else 0:,.0f} rows/s" + (f", peak memory {peak:.0f} MB" if peak is not None else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import duckdb
+
+from harness import client, config, corpus
+from harness.histogram import LatencyHistogram
+
+# Open-loop load for /interact: request i is due at start + i / rps whether or
+# not earlier requests have finished. Latency is measured from that intended
+# start time, so time spent queued behind a slow server is counted instead of
+# silently skipped (coordinated omission). The latency from the moment the
+# request actually left is kept alongside for comparison.
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def load_messages(path=None):
+    # Messages of the /interact corpus cases that carry a "category", grouped
+    # by category in the order they first appear
+    messages = {}
+    for case in corpus.read_cases(path or config.INTERACT_CORPUS):
+        if "category" in case:
+            messages.setdefault(case["category"], []).append(case["message"])
+    if not messages:
+        raise ValueError(f"No categorised cases in {path or config.INTERACT_CORPUS}")
+    return messages
+
+
+def make_payload(message):
+    return {
+        "user_id": "string",
+        "channel": "string",
+        "request_id": "string",
+        "topics": ["string"],
+        "message": message,
+        "metadata": {
+            "additionalProp1": "string",
+            "additionalProp2": "string",
+            "additionalProp3": "string",
+        },
+    }
+
+
+def request_plan(count, messages=None):
+    # Categories take turns; each category cycles through its own messages
+    if messages is None:
+        messages = load_messages()
+    categories = list(messages)
+    for i in range(count):
+        category = categories[i % len(categories)]
+        options = messages[category]
+        yield category, make_payload(options[(i // len(categories)) % len(options)])
+
+
+class CategoryStats:
+    def __init__(self):
+        self.corrected = LatencyHistogram()
+        self.uncorrected = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+
+    def add(self, other):
+        self.corrected.add(other.corrected)
+        self.uncorrected.add(other.uncorrected)
+        self.requests += other.requests
+        self.errors += other.errors
+
+
+class LoadRun:
+    def __init__(self, url, rps, duration):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now()
+        self.url = url
+        self.rps = rps
+        self.duration = duration
+        self.categories = {}
+
+    def stats(self, category):
+        return self.categories.setdefault(category, CategoryStats())
+
+    def record(self, category, intended, sent, finished, ok):
+        stats = self.stats(category)
+        stats.requests += 1
+        if not ok:
+            stats.errors += 1
+        stats.corrected.record_value((finished - intended) * 1e6)
+        stats.uncorrected.record_value((finished - sent) * 1e6)
+
+    def overall(self):
+        total = CategoryStats()
+        for stats in self.categories.values():
+            total.add(stats)
+        return total
+
+    def rows(self):
+        rows = []
+        items = list(self.categories.items()) + [("all", self.overall())]
+        for category, stats in items:
+            corrected = stats.corrected.percentiles(PERCENTILES)
+            rows.append({
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "url": self.url,
+                "category": category,
+                "target_rps": self.rps,
+                "duration_seconds": self.duration,
+                "requests": stats.requests,
+                "errors": stats.errors,
+                "p50_ms": corrected[50] / 1000,
+                "p90_ms": corrected[90] / 1000,
+                "p99_ms": corrected[99] / 1000,
+                "p999_ms": corrected[99.9] / 1000,
+                "max_ms": stats.corrected.max_value / 1000,
+                "uncorrected_p99_ms": stats.uncorrected.value_at_percentile(99) / 1000,
+            })
+        return rows
+
+    def percentile_rows(self):
+        rows = []
+        items = list(self.categories.items()) + [("all", self.overall())]
+        for category, stats in items:
+            for percentile, value in stats.corrected.percentile_distribution():
+                rows.append((self.run_id, category, percentile, value / 1000))
+        return rows
+
+
+def send_one(url, category, payload, intended, timeout):
+    sent = time.monotonic()
+    try:
+        # No retries or hedging: the load test measures every request as sent
+        response = client.post(url, json=payload, timeout=timeout, retries=0, hedge=False)
+        ok = response.status_code == 200
+    except Exception:
+        ok = False
+    return category, intended, sent, time.monotonic(), ok
+
+
+async def drive(run, max_in_flight=64, timeout=60, messages=None):
+    loop = asyncio.get_running_loop()
+    count = int(run.rps * run.duration)
+    pending = []
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        start = time.monotonic()
+        for i, (category, payload) in enumerate(request_plan(count, messages)):
+            intended = start + i / run.rps
+            delay = intended - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            pending.append(loop.run_in_executor(
+                executor, send_one, run.url, category, payload, intended, timeout
+            ))
+        for outcome in await asyncio.gather(*pending):
+            run.record(*outcome)
+    return run
+
+
+def run_load(url, rps, duration, max_in_flight=64, timeout=60, corpus_file=None):
+    run = LoadRun(url, rps, duration)
+    return asyncio.run(drive(run, max_in_flight, timeout, load_messages(corpus_file)))
+
+
+def create_tables(con):
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS interact_load (
+            run_id VARCHAR,
+            started_at TIMESTAMP,
+            url VARCHAR,
+            category VARCHAR,
+            target_rps DOUBLE,
+            duration_seconds DOUBLE,
+            requests INTEGER,
+            errors INTEGER,
+            p50_ms DOUBLE,
+            p90_ms DOUBLE,
+            p99_ms DOUBLE,
+            p999_ms DOUBLE,
+            max_ms DOUBLE,
+            uncorrected_p99_ms DOUBLE
+        )
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS interact_load_percentiles (
+            run_id VARCHAR,
+            category VARCHAR,
+            percentile DOUBLE,
+            latency_ms DOUBLE
+        )
+        """
+    )
+
+
+def write_duckdb(run, db_file=config.TEST_DATABASE):
+    con = duckdb.connect(database=db_file, read_only=False)
+    try:
+        create_tables(con)
+        rows = run.rows()
+        columns = list(rows[0])
+        con.executemany(
+            f"INSERT INTO interact_load ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [[row[column] for column in columns] for row in rows],
+        )
+        con.executemany(
+            "INSERT INTO interact_load_percentiles VALUES (?, ?, ?, ?)", run.percentile_rows()
+        )
+    finally:
+        con.close()
+
+
+def print_summary(run):
+    print(f"Run {run.run_id}: {run.rps} req/s for {run.duration}s against {run.url}")
+    print(f"{'category':<12}{'requests':>9}{'errors':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'p99.9':>10}{'max':>10}  (ms)")
+    for row in run.rows():
+        print(
+            f"{row['category']:<12}{row['requests']:>9}{row['errors']:>7}"
+            f"{row['p50_ms']:>10.1f}{row['p90_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+            f"{row['p999_ms']:>10.1f}{row['max_ms']:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator for /interact")
+    parser.add_argument("--url", default=f"{config.AGENT_BASE_URL}/interact")
+    parser.add_argument("--rps", type=float, required=True, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--corpus", default=config.INTERACT_CORPUS, help="JSONL corpus to draw messages from")
+    parser.add_argument("--db", default=config.TEST_DATABASE, help="DuckDB file for the results")
+    parser.add_argument("--no-db", action="store_true", help="Only print the summary")
+    args = parser.parse_args()
+
+    run = run_load(args.url, args.rps, args.duration, args.max_in_flight, args.timeout, args.corpus)
+    print_summary(run)
+    if not args.no_db:
+        write_duckdb(run, args.db)
+        print(f"Results written to {args.db} (interact_load, interact_load_percentiles)")
+
+
+if __name__ == "__main__":
+    main()
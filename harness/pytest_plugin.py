@@ -0,0 +1,54 @@
+import pytest
+
+from harness import config
+from harness.collector import ResultCollector
+
+# pytest hooks feeding harness.collector, so a pytest run measures the tests
+# the same way as running a suite module as a script. A suite's conftest.py
+# pulls them in with
+#
+#   from harness.pytest_plugin import *  # noqa: F401,F403
+#
+# With HARNESS_PYTEST_REPORTS=1 every test module that defines
+# write_report(collector) has it called at the end of the session with the
+# results of that module's tests.
+__all__ = ["pytest_runtest_protocol", "pytest_runtest_logreport", "pytest_sessionfinish"]
+
+_collectors = {}  # test module -> ResultCollector
+_running = {}  # node id -> (collector, test name)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    collector = _collectors.setdefault(item.module, ResultCollector())
+    _running[item.nodeid] = (collector, item.name)
+    collector.start(item.name)
+    yield
+    collector.stop(item.name)
+    _running.pop(item.nodeid, None)
+
+
+def pytest_runtest_logreport(report):
+    if report.nodeid not in _running:
+        return
+    collector, name = _running[report.nodeid]
+    if report.skipped:
+        collector.set_status(name, "skip")
+    elif report.failed:
+        collector.set_status(name, "fail" if report.when == "call" else "error")
+    elif report.when == "call":
+        collector.set_status(name, "pass")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # Every conftest that imports the hooks gets this call; the first one
+    # writes the reports and empties the buffers
+    collectors = dict(_collectors)
+    _collectors.clear()
+    if not config.PYTEST_REPORTS:
+        return
+    for module, collector in collectors.items():
+        write_report = getattr(module, "write_report", None)
+        collector.run.finish()
+        if write_report is not None and len(collector):
+            write_report(collector)
@@ -0,0 +1,111 @@
+import os
+
+import duckdb
+
+# Key index for the append-only CSV reports (harness/collector.py). Next to
+# each report sits <report>.keys.db, a small DuckDB file with one row per
+# (run ID, test) already in the report, so appending a run only looks up and
+# inserts the run's own keys instead of reading the report. Writing the same
+# run twice therefore appends nothing the second time.
+#
+# The index remembers the report's size and mtime after its last append; if
+# the report was changed by anything else (rewritten header, edited by hand,
+# deleted) the keys are rebuilt once from the file with DuckDB's CSV reader.
+INDEX_SUFFIX = ".keys.db"
+KEYS_TABLE = "report_keys"
+STATE_TABLE = "report_state"
+
+
+def index_file(report_file):
+    return report_file + INDEX_SUFFIX
+
+
+def _stat(report_file):
+    try:
+        stat = os.stat(report_file)
+    except FileNotFoundError:
+        return 0, 0
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _quoted(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+class ReportIndex:
+    def __init__(self, report_file):
+        self.report_file = report_file
+        self.con = duckdb.connect(database=index_file(report_file), read_only=False)
+        self._create_keys_table("CREATE TABLE IF NOT EXISTS")
+        self.con.execute(f"CREATE TABLE IF NOT EXISTS {STATE_TABLE} (size BIGINT, mtime_ns BIGINT)")
+
+    def _create_keys_table(self, create):
+        self.con.execute(f"{create} {KEYS_TABLE} (run_id VARCHAR, test VARCHAR, PRIMARY KEY (run_id, test))")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.con.close()
+
+    def in_sync(self):
+        state = self.con.execute(f"SELECT size, mtime_ns FROM {STATE_TABLE}").fetchone()
+        return state is not None and tuple(state) == _stat(self.report_file)
+
+    def rebuild(self, fieldnames):
+        # One pass over the report; only needed when the index is missing or
+        # out of date. Reports without a "Run ID" column are keyed by test.
+        # The table is replaced rather than emptied: DuckDB still sees keys
+        # deleted earlier in the same transaction as conflicts.
+        self.con.execute("BEGIN TRANSACTION")
+        try:
+            self._create_keys_table("CREATE OR REPLACE TABLE")
+            if _stat(self.report_file)[0] and "Test Case Name" in fieldnames:
+                run_id = "coalesce(\"Run ID\", '')" if "Run ID" in fieldnames else "''"
+                self.con.execute(
+                    f"INSERT OR IGNORE INTO {KEYS_TABLE} "
+                    f"SELECT DISTINCT {run_id}, {_quoted('Test Case Name')} "
+                    "FROM read_csv(?, header = true, all_varchar = true)",
+                    [self.report_file],
+                )
+            self._save_state()
+            self.con.execute("COMMIT")
+        except BaseException:
+            self.con.execute("ROLLBACK")
+            raise
+
+    def begin(self):
+        self.con.execute("BEGIN TRANSACTION")
+
+    def add(self, keys):
+        # Records (run ID, test) keys and returns the ones that were new
+        keys = list(keys)
+        if not keys:
+            return set()
+        run_ids, tests = zip(*keys)
+        return set(
+            self.con.execute(
+                f"INSERT OR IGNORE INTO {KEYS_TABLE} "
+                "SELECT unnest(?::VARCHAR[]) AS run_id, unnest(?::VARCHAR[]) AS test RETURNING run_id, test",
+                [list(run_ids), list(tests)],
+            ).fetchall()
+        )
+
+    def commit(self):
+        # Called once the report has been written so the stored size and
+        # mtime match the file
+        self._save_state()
+        self.con.execute("COMMIT")
+
+    def rollback(self):
+        self.con.execute("ROLLBACK")
+
+    def _save_state(self):
+        self.con.execute(f"DELETE FROM {STATE_TABLE}")
+        self.con.execute(f"INSERT INTO {STATE_TABLE} VALUES (?, ?)", list(_stat(self.report_file)))
+
+    def __len__(self):
+        return self.con.execute(f"SELECT count(*) FROM {KEYS_TABLE}").fetchone()[0]
@@ -0,0 +1,52 @@
+import argparse
+
+import duckdb
+
+from harness import config, timing
+
+# Load a suite's CSV report into DuckDB so the Evidence pages can query it.
+# Column names are normalised ("TTFB (seconds)" -> ttfb_seconds) so the
+# per-phase timings can be used in SQL without quoting. The API suites load
+# their report after every run (harness/api_report.py); create_table gives a
+# database that has not seen a run yet the same columns, empty.
+API_REPORT_COLUMNS = (
+    [("test_name", "VARCHAR"), ("start_time", "TIMESTAMP"), ("duration_seconds", "DOUBLE")]
+    + [(key, "DOUBLE") for key in timing.PHASE_KEYS]
+    + [("run_id", "VARCHAR")]
+)
+
+
+def create_table(con, table):
+    con.execute(
+        f"CREATE TABLE IF NOT EXISTS {table} ("
+        + ", ".join(f"{name} {column_type}" for name, column_type in API_REPORT_COLUMNS)
+        + ")"
+    )
+
+
+def load_csv_report(csv_file, table, db_file=config.TEST_DATABASE):
+    con = duckdb.connect(database=db_file, read_only=False)
+    try:
+        con.execute(
+            f"CREATE OR REPLACE TABLE {table} AS "
+            "SELECT * FROM read_csv_auto(?, header = true, normalize_names = true)",
+            [csv_file],
+        )
+        return con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a test report CSV into DuckDB")
+    parser.add_argument("csv_file")
+    parser.add_argument("table", help="e.g. test_report_interact")
+    parser.add_argument("--db", default=config.TEST_DATABASE)
+    args = parser.parse_args()
+
+    rows = load_csv_report(args.csv_file, args.table, args.db)
+    print(f"Loaded {rows} rows from {args.csv_file} into {args.table} ({args.db})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import socket
+import subprocess
+import uuid
+from datetime import datetime
+from functools import lru_cache
+
+from harness import config
+
+# One row per suite run in the test_runs table; every result row carries its
+# run's ID, so the history is keyed by (run ID, test) and a test that ran
+# before is never mistaken for one that was already recorded. Recording a
+# run only appends: one row here plus the run's own results.
+RUNS_TABLE = "test_runs"
+
+
+def new_run_id():
+    return uuid.uuid4().hex[:12]
+
+
+@lru_cache(maxsize=None)
+def git_sha():
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=config.REPO_ROOT, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+class Run:
+    def __init__(self, run_id=None):
+        self.run_id = run_id or new_run_id()
+        self.git_sha = git_sha()
+        self.host = socket.gethostname()
+        self.started_at = datetime.now()
+        self.ended_at = None
+
+    def finish(self):
+        if self.ended_at is None:
+            self.ended_at = datetime.now()
+
+
+def create_table(con):
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {RUNS_TABLE} (
+            run_id VARCHAR PRIMARY KEY,
+            suite VARCHAR,
+            git_sha VARCHAR,
+            host VARCHAR,
+            started_at TIMESTAMP,
+            ended_at TIMESTAMP,
+            tests INTEGER
+        )
+        """
+    )
+
+
+def record_run(con, run, suite, tests):
+    run.finish()
+    create_table(con)
+    con.execute(
+        f"INSERT INTO {RUNS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [run.run_id, suite, run.git_sha, run.host, run.started_at, run.ended_at, tests],
+    )
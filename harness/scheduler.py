@@ -0,0 +1,187 @@
+import argparse
+import glob
+import heapq
+import os
+import statistics
+from datetime import datetime
+
+import duckdb
+
+from harness import config
+
+# Duration-aware ordering of test cases. Every suite's CSV report records
+# "Duration (seconds)" per test; those rows seed one running estimate per
+# (suite, test), kept in DuckDB and updated with an exponentially weighted
+# moving average after each run. Scheduling longest-first (LPT) means the
+# slowest tests start early and the workers run out of work at about the same
+# time instead of one straggler finishing long after the rest.
+ALPHA = 0.3  # weight of the newest duration in the moving average
+DEFAULT_ESTIMATE = 1.0  # seconds, when a suite has no history at all
+ESTIMATES_TABLE = "test_duration_estimates"
+REPORT_PATTERNS = ("test_report_{suite}.csv", "testing_report_{suite}.csv")
+
+
+def report_files(suite, reports_dir=config.REPO_ROOT):
+    files = []
+    for pattern in REPORT_PATTERNS:
+        files += glob.glob(os.path.join(reports_dir, pattern.format(suite=suite)))
+    return sorted(files)
+
+
+def read_report_history(csv_files):
+    # (test name, duration) rows in the order they were written; the reports
+    # name the test column either "Test Name" or "Test Case Name"
+    if not csv_files:
+        return []
+    files = "[" + ", ".join("'" + path.replace("'", "''") + "'" for path in csv_files) + "]"
+    source = f"read_csv_auto({files}, header = true, union_by_name = true, normalize_names = true)"
+    con = duckdb.connect()
+    try:
+        columns = [column[0] for column in con.execute(f"SELECT * FROM {source} LIMIT 0").description]
+        names = [column for column in ("test_name", "test_case_name") if column in columns]
+        return con.execute(
+            f"SELECT coalesce({', '.join(names)}), CAST(duration_seconds AS DOUBLE) FROM {source} "
+            "WHERE duration_seconds IS NOT NULL"
+        ).fetchall()
+    finally:
+        con.close()
+
+
+class DurationEstimates:
+    def __init__(self, suite, estimates=None, samples=None, alpha=ALPHA, default=DEFAULT_ESTIMATE):
+        self.suite = suite
+        self.estimates = dict(estimates or {})
+        self.samples = dict(samples or {})
+        self.alpha = alpha
+        self._default = default
+
+    @property
+    def default(self):
+        # New tests are assumed to be typical for their suite
+        if self.estimates:
+            return statistics.median(self.estimates.values())
+        return self._default
+
+    def estimate(self, test_name):
+        return self.estimates.get(test_name, self.default)
+
+    def update(self, test_name, duration):
+        if test_name in self.estimates:
+            self.estimates[test_name] += self.alpha * (duration - self.estimates[test_name])
+        else:
+            self.estimates[test_name] = duration
+        self.samples[test_name] = self.samples.get(test_name, 0) + 1
+
+    def update_from_timings(self, test_timings):
+        # test_timings as collected by the suites' tearDown
+        for test_name, timings in test_timings.items():
+            self.update(test_name, timings["duration_seconds"])
+
+    @classmethod
+    def from_reports(cls, suite, csv_files, **kwargs):
+        estimates = cls(suite, **kwargs)
+        for test_name, duration in read_report_history(csv_files):
+            estimates.update(test_name, duration)
+        return estimates
+
+    @classmethod
+    def load(cls, suite, db_file=config.TEST_DATABASE, reports_dir=config.REPO_ROOT, **kwargs):
+        # Stored estimates if there are any, otherwise seeded from the reports
+        con = duckdb.connect(database=db_file, read_only=False)
+        try:
+            _create_table(con)
+            rows = con.execute(
+                f"SELECT test_name, estimate_seconds, samples FROM {ESTIMATES_TABLE} WHERE suite = ?",
+                [suite],
+            ).fetchall()
+        finally:
+            con.close()
+        if not rows:
+            return cls.from_reports(suite, report_files(suite, reports_dir), **kwargs)
+        return cls(
+            suite,
+            {name: estimate for name, estimate, _ in rows},
+            {name: samples for name, _, samples in rows},
+            **kwargs,
+        )
+
+    def save(self, db_file=config.TEST_DATABASE):
+        now = datetime.now()
+        con = duckdb.connect(database=db_file, read_only=False)
+        try:
+            _create_table(con)
+            con.execute("BEGIN TRANSACTION")
+            con.execute(f"DELETE FROM {ESTIMATES_TABLE} WHERE suite = ?", [self.suite])
+            con.executemany(
+                f"INSERT INTO {ESTIMATES_TABLE} VALUES (?, ?, ?, ?, ?)",
+                [
+                    (self.suite, name, estimate, self.samples.get(name, 1), now)
+                    for name, estimate in sorted(self.estimates.items())
+                ],
+            )
+            con.execute("COMMIT")
+        finally:
+            con.close()
+
+
+def _create_table(con):
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {ESTIMATES_TABLE} (
+            suite VARCHAR,
+            test_name VARCHAR,
+            estimate_seconds DOUBLE,
+            samples INTEGER,
+            updated_at TIMESTAMP
+        )
+        """
+    )
+
+
+def name_of_test(test):
+    return test.id().split(".")[-1]
+
+
+def longest_first(tests, estimates, key=name_of_test):
+    # Stable, so tests with equal estimates keep their original order
+    return sorted(tests, key=lambda test: -estimates.estimate(key(test)))
+
+
+def bin_longest_first(tests, estimates, workers, key=name_of_test):
+    # Greedy LPT: hand the next-longest test to the least loaded worker.
+    # Returns the bins and their predicted total durations.
+    bins = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    heap = [(0.0, worker) for worker in range(workers)]
+    for test in longest_first(tests, estimates, key):
+        load, worker = heapq.heappop(heap)
+        bins[worker].append(test)
+        loads[worker] = load + estimates.estimate(key(test))
+        heapq.heappush(heap, (loads[worker], worker))
+    return bins, loads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duration estimates and longest-first bins per suite")
+    parser.add_argument("suite", help="e.g. interact, classification, triage_category")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--db", default=config.TEST_DATABASE)
+    parser.add_argument("--reports-dir", default=config.REPO_ROOT)
+    parser.add_argument("--reseed", action="store_true", help="Rebuild the estimates from the CSV reports")
+    args = parser.parse_args()
+
+    if args.reseed:
+        estimates = DurationEstimates.from_reports(args.suite, report_files(args.suite, args.reports_dir))
+        estimates.save(args.db)
+    else:
+        estimates = DurationEstimates.load(args.suite, args.db, args.reports_dir)
+    names = list(estimates.estimates)
+    bins, loads = bin_longest_first(names, estimates, args.workers, key=lambda name: name)
+    print(f"{args.suite}: {len(names)} tests, default estimate {estimates.default:.3f}s")
+    for worker, (names_in_bin, load) in enumerate(zip(bins, loads)):
+        print(f"worker {worker}: {len(names_in_bin)} tests, {load:.3f}s predicted")
+    print(f"predicted makespan {max(loads, default=0):.3f}s (serial {sum(loads):.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+
+import duckdb
+
+from harness import config, loadgen, reports, summary
+
+# Tables the Evidence pages of the test_database source query but that only
+# a harness run fills. They are created empty, with their column types, so
+# `npm run sources` works on a fresh checkout before any of those runs; the
+# committed my_duckdb_data.db already has them. Existing tables are left as
+# they are.
+API_REPORT_TABLES = ["test_report_interact"]
+
+
+def create_missing(con):
+    for table in API_REPORT_TABLES:
+        reports.create_table(con, table)
+    loadgen.create_tables(con)  # interact_load, interact_load_percentiles
+    summary.create_table(con)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the empty tables the Evidence sources need")
+    parser.add_argument("--db", default=config.TEST_DATABASE)
+    args = parser.parse_args()
+
+    con = duckdb.connect(database=args.db, read_only=False)
+    try:
+        create_missing(con)
+    finally:
+        con.close()
+    print(f"Schema ready in {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from harness import config, runs, timing
+from harness.async_runner import iter_tests
+from harness.scheduler import DurationEstimates, bin_longest_first, read_report_history
+
+# Sharded runs of the three suite folders. A coordinator discovers every test,
+# splits the test IDs into shards and hands them out over a small JSON/HTTP
+# API; workers (local processes or other machines with the same checkout)
+# pull a shard, run it and post the outcomes back. Shards are a pure function
+# of the test IDs and the stored duration estimates (longest-first bins with
+# ties broken by ID), so the same history always gives the same shards. When
+# every shard is in, the coordinator writes one merged report for the run and
+# feeds the measured durations back into the estimates.
+#
+#   python -m harness.shard run --workers 4
+#   python -m harness.shard coordinator --host 0.0.0.0 --port 8700 --shards 8
+#   python -m harness.shard worker --coordinator http://coordinator:8700
+FOLDERS = ("unit_tests", "unit_tests_ASU_tools", "unit_tests_booking")
+ESTIMATES_SUITE = "sharded"
+REPORT_FILE = "test_report_sharded.csv"
+LEASE_SECONDS = 600  # a shard not reported back within this is handed out again
+
+REPORT_COLUMNS = [
+    ("Run ID", "run_id"),
+    ("Test Name", "test_id"),
+    ("Suite", "suite"),
+    ("Shard", "shard"),
+    ("Worker", "worker"),
+    ("Start Time", "start_time"),
+    ("Duration (seconds)", "duration_seconds"),
+    ("Status", "status"),
+    ("Message", "message"),
+] + list(zip(timing.PHASE_COLUMNS, timing.PHASE_KEYS))
+
+
+def _folder_path(folder):
+    return os.path.join(config.REPO_ROOT, folder)
+
+
+def discover(folders=FOLDERS):
+    # Test IDs look like "unit_tests/test_interact.TestInteractAPI.test_corpus"
+    loader = unittest.TestLoader()
+    test_ids = []
+    for folder in folders:
+        path = _folder_path(folder)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+        suite = loader.discover(path, pattern="test_*.py", top_level_dir=path)
+        test_ids += [f"{folder}/{test.id()}" for test in iter_tests(suite)]
+    return sorted(test_ids)
+
+
+def make_shards(test_ids, count, estimates):
+    bins, loads = bin_longest_first(sorted(test_ids), estimates, count, key=lambda test_id: test_id)
+    return [shard for shard in bins if shard], [load for shard, load in zip(bins, loads) if shard]
+
+
+class Coordinator:
+    def __init__(self, shards, loads=None, run_id=None, lease=LEASE_SECONDS):
+        self.run_id = run_id or runs.new_run_id()
+        self.started_at = datetime.now()
+        self.shards = shards
+        loads = loads or [len(shard) for shard in shards]
+        # Biggest shards go out first
+        self.pending = deque(sorted(range(len(shards)), key=lambda index: -loads[index]))
+        self.leases = {}
+        self.results = {}
+        self.lease = lease
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        if not shards:
+            self.done.set()
+
+    def next_shard(self, worker):
+        with self.lock:
+            if not self.pending:
+                # Re-issue shards whose worker went quiet
+                now = time.monotonic()
+                for index, (_, leased_at) in sorted(self.leases.items()):
+                    if index not in self.results and now - leased_at > self.lease:
+                        self.pending.append(index)
+            if not self.pending:
+                return {"run_id": self.run_id, "shard": None, "finished": self.done.is_set()}
+            index = self.pending.popleft()
+            self.leases[index] = (worker, time.monotonic())
+            return {"run_id": self.run_id, "shard": index, "tests": self.shards[index]}
+
+    def submit(self, worker, index, results):
+        with self.lock:
+            if index in self.results:
+                return {"accepted": False}
+            for row in results:
+                row.update(run_id=self.run_id, shard=index, worker=worker)
+            self.results[index] = results
+            if len(self.results) == len(self.shards):
+                self.done.set()
+            return {"accepted": True}
+
+    def status(self):
+        with self.lock:
+            return {
+                "run_id": self.run_id,
+                "shards": len(self.shards),
+                "pending": len(self.pending),
+                "finished": len(self.results),
+            }
+
+    def rows(self):
+        with self.lock:
+            return [row for index in sorted(self.results) for row in self.results[index]]
+
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    coordinator = None  # set by make_coordinator_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def do_GET(self):
+        if self.path == "/status":
+            self.send_json(200, self.coordinator.status())
+        else:
+            self.send_json(404, {"detail": "Not Found"})
+
+    def do_POST(self):
+        try:
+            body = self.read_json()
+        except ValueError:
+            self.send_json(400, {"detail": "Invalid JSON"})
+            return
+        if self.path == "/shard":
+            self.send_json(200, self.coordinator.next_shard(body.get("worker", "unknown")))
+        elif self.path == "/results":
+            self.send_json(200, self.coordinator.submit(body["worker"], body["shard"], body["results"]))
+        else:
+            self.send_json(404, {"detail": "Not Found"})
+
+
+def make_coordinator_server(coordinator, host="127.0.0.1", port=0):
+    handler = type("BoundCoordinatorHandler", (CoordinatorHandler,), {"coordinator": coordinator})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class _ShardResult(unittest.TestResult):
+    # One outcome row per test; a failing sub-test fails the whole test
+    def __init__(self):
+        super().__init__()
+        self.rows = {}
+        self.started = {}
+
+    def _set(self, test, status, err=None):
+        row = self.rows[test.id()]
+        if row["status"] in ("fail", "error") and status == "pass":
+            return
+        row["status"] = status
+        if err is not None and not row["message"]:
+            text = str(err[1]).splitlines()
+            row["message"] = f"{err[0].__name__}: {text[0] if text else ''}"[:200]
+
+    def startTest(self, test):
+        super().startTest(test)
+        self.started[test.id()] = time.perf_counter()
+        self.rows[test.id()] = {
+            "start_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "status": "pass",
+            "message": "",
+        }
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.rows[test.id()]["duration_seconds"] = time.perf_counter() - self.started.pop(test.id())
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._set(test, "fail", err)
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._set(test, "error", err)
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._set(test, "skip")
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            failed = issubclass(err[0], test.failureException)
+            self._set(test, "fail" if failed else "error", err)
+
+
+def run_shard(test_ids):
+    loader = unittest.TestLoader()
+    rows = []
+    loaded = []
+    for test_id in test_ids:
+        folder, name = test_id.split("/", 1)
+        path = _folder_path(folder)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+        try:
+            tests = list(iter_tests(loader.loadTestsFromName(name)))
+        except Exception as e:
+            rows.append({
+                "test_id": test_id, "suite": folder, "status": "error", "message": str(e)[:200],
+                "start_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "duration_seconds": 0.0,
+            })
+            continue
+        loaded += [(test_id, folder, test) for test in tests]
+
+    # One suite, so class fixtures run once per class as in a normal run
+    result = _ShardResult()
+    unittest.TestSuite([test for _, _, test in loaded]).run(result)
+    for test_id, folder, test in loaded:
+        row = {"test_id": test_id, "suite": folder, **result.rows[test.id()]}
+        # Phase timings recorded by the suite's tearDown, when it has them
+        timings = getattr(type(test), "test_timings", {}).get(test.id().split(".")[-1])
+        if isinstance(timings, dict):
+            row.update({key: timings[key] for key in timing.PHASE_KEYS if key in timings})
+        rows.append(row)
+    return rows
+
+
+def work(coordinator_url, worker=None, poll=1.0):
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    session = requests.Session()
+    shards = 0
+    while True:
+        reply = session.post(f"{coordinator_url}/shard", json={"worker": worker}, timeout=30).json()
+        if reply["shard"] is None:
+            if reply.get("finished"):
+                return shards
+            time.sleep(poll)  # other workers still busy; their shards may come back
+            continue
+        rows = run_shard(reply["tests"])
+        failed = sum(row["status"] in ("fail", "error") for row in rows)
+        print(f"[{worker}] shard {reply['shard']}: {len(rows)} tests, {failed} failed", flush=True)
+        session.post(
+            f"{coordinator_url}/results",
+            json={"worker": worker, "shard": reply["shard"], "results": rows},
+            timeout=30,
+        )
+        shards += 1
+
+
+def write_report(rows, csv_file=REPORT_FILE):
+    print(f"Generating CSV report: {csv_file}")
+    with open(csv_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([header for header, _ in REPORT_COLUMNS])
+        for row in sorted(rows, key=lambda row: row["test_id"]):
+            writer.writerow([row.get(key, "") for _, key in REPORT_COLUMNS])
+
+
+def finish(coordinator, estimates, csv_file=REPORT_FILE, db_file=config.TEST_DATABASE):
+    rows = coordinator.rows()
+    write_report(rows, csv_file)
+    for row in rows:
+        estimates.update(row["test_id"], row["duration_seconds"])
+    estimates.save(db_file)
+    counts = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"Run {coordinator.run_id}: {len(rows)} tests in {len(coordinator.shards)} shards ({summary})")
+    return rows
+
+
+def seed_from_module_reports(estimates, test_ids, reports_dir=config.REPO_ROOT):
+    # Tests that have never run sharded start from the per-module reports,
+    # which only know the method name
+    missing = [test_id for test_id in test_ids if test_id not in estimates.estimates]
+    if not missing:
+        return
+    csv_files = sorted(
+        glob.glob(os.path.join(reports_dir, "test_report_*.csv"))
+        + glob.glob(os.path.join(reports_dir, "testing_report_*.csv"))
+    )
+    csv_files = [path for path in csv_files if os.path.basename(path) != REPORT_FILE]
+    by_method = DurationEstimates("modules")
+    for test_name, duration in read_report_history(csv_files):
+        by_method.update(test_name, duration)
+    for test_id in missing:
+        method = test_id.rsplit(".", 1)[-1]
+        if method in by_method.estimates:
+            estimates.estimates[test_id] = by_method.estimates[method]
+
+
+def plan(folders, shards, db_file=config.TEST_DATABASE):
+    estimates = DurationEstimates.load(ESTIMATES_SUITE, db_file)
+    test_ids = discover(folders)
+    seed_from_module_reports(estimates, test_ids)
+    return (*make_shards(test_ids, shards, estimates), estimates)
+
+
+def serve(coordinator, host, port):
+    server = make_coordinator_server(coordinator, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded runs of the unit test folders")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_plan_arguments(command):
+        command.add_argument("--folders", nargs="+", default=list(FOLDERS))
+        command.add_argument("--db", default=config.TEST_DATABASE, help="DuckDB file with the duration estimates")
+
+    show = commands.add_parser("plan", help="Print the shards without running them")
+    show.add_argument("--shards", type=int, default=4)
+    add_plan_arguments(show)
+
+    coordinate = commands.add_parser("coordinator", help="Hand out shards to remote workers")
+    coordinate.add_argument("--shards", type=int, default=4)
+    coordinate.add_argument("--host", default="127.0.0.1")
+    coordinate.add_argument("--port", type=int, default=8700)
+    coordinate.add_argument("--report", default=REPORT_FILE)
+    add_plan_arguments(coordinate)
+
+    local = commands.add_parser("run", help="Coordinator plus local worker processes")
+    local.add_argument("--workers", type=int, default=4)
+    local.add_argument("--shards", type=int, help="Defaults to one per worker")
+    local.add_argument("--report", default=REPORT_FILE)
+    add_plan_arguments(local)
+
+    worker = commands.add_parser("worker", help="Run shards for a coordinator")
+    worker.add_argument("--coordinator", required=True, help="e.g. http://10.0.0.5:8700")
+    worker.add_argument("--name")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        work(args.coordinator.rstrip("/"), args.name)
+        return
+
+    shards, loads, estimates = plan(args.folders, args.shards or args.workers, args.db)
+    if args.command == "plan":
+        for index, (shard, load) in enumerate(zip(shards, loads)):
+            print(f"shard {index}: {len(shard)} tests, {load:.3f}s predicted")
+            for test_id in shard:
+                print(f"    {test_id}")
+        return
+
+    coordinator = Coordinator(shards, loads)
+    server = serve(coordinator, args.host if args.command == "coordinator" else "127.0.0.1",
+                   args.port if args.command == "coordinator" else 0)
+    url = "http://%s:%d" % server.server_address[:2]
+    print(f"Run {coordinator.run_id}: {len(shards)} shards, coordinator at {url}")
+    workers = []
+    if args.command == "run":
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-m", "harness.shard", "worker", "--coordinator", url, "--name", f"local-{i}"],
+                cwd=config.REPO_ROOT,
+            )
+            for i in range(args.workers)
+        ]
+    try:
+        while not coordinator.done.wait(1):
+            if workers and all(process.poll() is not None for process in workers):
+                raise SystemExit("All workers exited before the run finished")
+        finish(coordinator, estimates, args.report, args.db)
+    finally:
+        for process in workers:
+            process.wait()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
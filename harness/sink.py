@@ -0,0 +1,133 @@
+from datetime import datetime
+
+import duckdb
+
+from harness import config, history, runs, summary
+from harness.collector import REPORT_COLUMNS, generate_csv_report
+
+# Writes a run's results from the collector straight into DuckDB, in one
+# transaction, without a CSV file in between. The collector's columns go in
+# as a single batch: one INSERT ... SELECT unnest(?) with each column passed
+# as a list parameter, so there is no per-row statement. The tables keep the
+# report columns ("Test Case Name", "Start Date", ...) so the Evidence pages
+# can read them like the tables imported from the CSV reports.
+
+# Expressions over the batch columns (name, started, duration_ns, status,
+# run_id)
+_EXPRESSIONS = {
+    "Test Case Name": ("name", "VARCHAR"),
+    "Start Date": ("CAST(started AS DATE)", "DATE"),
+    "Start Time": ("CAST(started AS TIME)", "TIME"),
+    "Duration (seconds)": ("duration_ns / 1e9", "DOUBLE"),
+    "Status": ("status", "VARCHAR"),
+    "Run ID": ("run_id", "VARCHAR"),
+}
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_type(values):
+    if all(value is None or isinstance(value, (int, float)) for value in values):
+        return "DOUBLE"
+    return "VARCHAR"
+
+
+def _batch(collector, fieldnames, extra):
+    # Source columns as (name, type, values) plus the SQL expression that
+    # produces each report column from them
+    columns = [
+        ("name", "VARCHAR", list(collector.names)),
+        ("started", "TIMESTAMP", [datetime.fromtimestamp(ns / 1e9) for ns in collector.start_ns]),
+        ("duration_ns", "BIGINT", collector.duration_ns.tolist()),
+        ("status", "VARCHAR", list(collector.statuses)),
+        ("run_id", "VARCHAR", [collector.run.run_id] * len(collector)),
+    ]
+    projection = []
+    for index, field in enumerate(fieldnames):
+        if field in _EXPRESSIONS:
+            expression, column_type = _EXPRESSIONS[field]
+            if field == "Start Time" and "Start Date" not in fieldnames:
+                expression, column_type = "started", "TIMESTAMP"
+        else:
+            values = [extra.get(name, {}).get(field) for name in collector.names]
+            column_type = _column_type(values)
+            expression = f"extra_{index}"
+            columns.append((expression, column_type, values))
+        projection.append((field, expression, column_type))
+    return columns, projection
+
+
+def _create_table(con, table, projection):
+    con.execute(
+        f"CREATE TABLE IF NOT EXISTS {_quote(table)} ("
+        + ", ".join(f"{_quote(field)} {column_type}" for field, _, column_type in projection)
+        + ")"
+    )
+    existing = {row[0] for row in con.execute(f"DESCRIBE {_quote(table)}").fetchall()}
+    for field, _, column_type in projection:
+        if field not in existing:
+            con.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(field)} {column_type}")
+
+
+def insert_batch(con, table, collector, fieldnames=REPORT_COLUMNS, extra=None):
+    # Creates or extends `table` and appends the collector's rows, on an open
+    # connection (the caller owns the transaction)
+    columns, projection = _batch(collector, fieldnames, extra or {})
+    _create_table(con, table, projection)
+    insert = (
+        f"INSERT INTO {_quote(table)} ({', '.join(_quote(field) for field, _, _ in projection)}) "
+        f"SELECT {', '.join(expression for _, expression, _ in projection)} FROM "
+    )
+    unnested = ", ".join(f"unnest(?::{column_type}[]) AS {name}" for name, column_type, _ in columns)
+    con.execute(insert + f"(SELECT {unnested})", [values for _, _, values in columns])
+
+
+def write_results(table, collector, db_file=None, fieldnames=REPORT_COLUMNS, extra=None):
+    # Appends the collector's rows to `table`, its aggregates to
+    # test_summary and the run to test_runs; returns the number of rows.
+    # There is no index on the results, so the cost depends only on the size
+    # of this run.
+    con = duckdb.connect(database=db_file or config.RESULTS_DATABASE, read_only=False)
+    try:
+        con.execute("BEGIN TRANSACTION")
+        try:
+            insert_batch(con, table, collector, fieldnames, extra)
+            summary.update(con, table, collector)
+            runs.record_run(con, collector.run, table, len(collector))
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.close()
+    return len(collector)
+
+
+def export_history(suite, collector, fieldnames=REPORT_COLUMNS, extra=None, db_file=None, history_dir=None):
+    # The run as one Parquet file per date partition (harness/history.py):
+    # the common columns plus the suite's own, with a full "Start Time"
+    fields = history.HISTORY_COLUMNS + [field for field in fieldnames if field not in REPORT_COLUMNS]
+    con = duckdb.connect()
+    try:
+        insert_batch(con, "run", collector, fields, extra)
+        history.export_run(con, suite, "run", history_dir)
+    finally:
+        con.close()
+    history.create_view(db_file, history_dir)
+
+
+def write_report(
+    collector, table, csv_file=None, fieldnames=REPORT_COLUMNS, extra=None, db_file=None, history_dir=None
+):
+    # A suite's results go to DuckDB and the Parquet history; the CSV report
+    # is only written when HARNESS_CSV_EXPORT is set
+    if not len(collector):
+        return
+    rows = write_results(table, collector, db_file, fieldnames, extra)
+    print(f"Wrote {rows} results to {table} ({db_file or config.RESULTS_DATABASE})")
+    if config.HISTORY:
+        export_history(table, collector, fieldnames, extra, db_file, history_dir)
+    if csv_file and config.CSV_EXPORT:
+        generate_csv_report(csv_file, collector, fieldnames, extra)
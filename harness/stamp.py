@@ -0,0 +1,101 @@
+import argparse
+import csv
+import glob
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+# Adds "date" and "time" columns (the time of the stamping run) to CSV
+# reports. Rows are streamed from the input to the output one at a time, so
+# memory does not grow with the report, and the output is written to a
+# temporary file in the same directory and renamed over the target only once
+# it is complete: Evidence never picks up a half-written report, and an
+# in-place stamp that fails leaves the original untouched.
+STAMP_COLUMNS = ["date", "time"]
+
+
+def stamped_name(input_csv):
+    stem, ext = os.path.splitext(input_csv)
+    return f"{stem}_with_timestamp{ext or '.csv'}"
+
+
+def is_stamped(header):
+    return header[-len(STAMP_COLUMNS):] == STAMP_COLUMNS
+
+
+def stamp_file(input_csv, output_csv=None, now=None):
+    # Returns the number of data rows written, or None if the report already
+    # has the stamp columns (or is empty) and was left alone
+    output_csv = output_csv or stamped_name(input_csv)
+    now = now or datetime.now()
+    stamp = [now.strftime("%Y-%m-%d"), now.strftime("%H:%M:%S")]
+
+    with open(input_csv, mode="r", newline="") as infile:
+        reader = csv.reader(infile)
+        header = next(reader, None)
+        if header is None or is_stamped(header):
+            return None
+
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(output_csv)}.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(output_csv))
+        )
+        try:
+            with os.fdopen(fd, mode="w", newline="") as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow(header + STAMP_COLUMNS)
+                rows = 0
+                for row in reader:
+                    writer.writerow(row + stamp)
+                    rows += 1
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            # mkstemp creates the file private to the user
+            shutil.copymode(input_csv, tmp_path)
+            os.replace(tmp_path, output_csv)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return rows
+
+
+def stamp_files(patterns, in_place=False, now=None):
+    # Every file matching the patterns gets the same timestamp
+    now = now or datetime.now()
+    stamped = {}
+    for pattern in patterns:
+        for input_csv in sorted(glob.glob(pattern)) or [pattern]:
+            if input_csv in stamped:
+                continue
+            output_csv = input_csv if in_place else stamped_name(input_csv)
+            rows = stamp_file(input_csv, output_csv, now)
+            stamped[input_csv] = rows
+            if rows is None:
+                print(f"Already stamped, skipped: {input_csv}")
+            else:
+                print(f"CSV file updated with date and time: {output_csv} ({rows} rows)")
+    return stamped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add date and time columns to CSV test reports")
+    parser.add_argument("reports", nargs="+", help="report files or glob patterns, e.g. 'testing_report_*.csv'")
+    parser.add_argument("-o", "--output", help="output file (single report only)")
+    parser.add_argument("--in-place", action="store_true", help="replace each report instead of writing <name>_with_timestamp.csv")
+    args = parser.parse_args()
+
+    if args.output:
+        reports = [path for pattern in args.reports for path in (sorted(glob.glob(pattern)) or [pattern])]
+        if len(reports) != 1:
+            parser.error("--output needs exactly one report")
+        if stamp_file(reports[0], args.output) is None:
+            print(f"Already stamped, skipped: {reports[0]}")
+        else:
+            print(f"CSV file updated with date and time: {args.output}")
+    else:
+        stamp_files(args.reports, in_place=args.in_place)
+
+
+if __name__ == "__main__":
+    main()
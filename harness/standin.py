@@ -0,0 +1,376 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Local stand-in for the GT agent (/interact, /interact/classification,
+# /get_docs, /rate_response) and tool (/tools/holiday/book) services. It
+# answers with the same response shapes as the real servers, with
+# configurable latency, injected errors and padded payloads, so the harness
+# can be benchmarked without the remote hosts.
+
+
+def parse_latency(spec):
+    # "fixed:0.05", "uniform:0.01,0.2", "normal:0.1,0.02",
+    # "lognormal:-2.3,0.5" (mu/sigma of the underlying normal), "exponential:0.1"
+    if not spec:
+        return lambda rng: 0.0
+    name, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if name == "fixed":
+        return lambda rng: values[0]
+    if name == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if name == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if name == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    if name == "exponential":
+        return lambda rng: rng.expovariate(1.0 / values[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class StandinConfig:
+    def __init__(self, latency=None, endpoint_latency=None, error_rate=0.0, payload_bytes=0, seed=None):
+        self.latency = parse_latency(latency)
+        self.endpoint_latency = {
+            path: parse_latency(spec) for path, spec in (endpoint_latency or {}).items()
+        }
+        self.error_rate = error_rate
+        self.payload_bytes = payload_bytes
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+    def delay_for(self, path):
+        sample = self.endpoint_latency.get(path, self.latency)
+        with self.rng_lock:
+            return sample(self.rng)
+
+    def should_fail(self):
+        if self.error_rate <= 0:
+            return False
+        with self.rng_lock:
+            return self.rng.random() < self.error_rate
+
+
+class ServerError(Exception):
+    pass
+
+
+class ValidationError(Exception):
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def _error(loc, msg, type_):
+    return {"loc": loc, "msg": msg, "type": type_}
+
+
+def validate_fields(body, fields):
+    # Mirrors the FastAPI/pydantic 422 body: {"detail": [{"loc", "msg", "type"}]}
+    if not isinstance(body, dict):
+        raise ValidationError([_error(["body"], "Input should be a valid dictionary", "dict_type")])
+    errors = []
+    for name, kind in fields.items():
+        if name not in body:
+            errors.append(_error(["body", name], "Field required", "missing"))
+            continue
+        value = body[name]
+        if kind == "str" and not isinstance(value, str):
+            errors.append(_error(["body", name], "Input should be a valid string", "string_type"))
+        elif kind == "int" and (not isinstance(value, int) or isinstance(value, bool)):
+            errors.append(_error(["body", name], "Input should be a valid integer", "int_type"))
+        elif kind == "list[str]" and not (
+            isinstance(value, list) and all(isinstance(v, str) for v in value)
+        ):
+            errors.append(_error(["body", name], "Input should be a valid list", "list_type"))
+        elif kind == "dict[str,str]" and not (
+            isinstance(value, dict) and all(isinstance(v, str) for v in value.values())
+        ):
+            errors.append(_error(["body", name], "Input should be a valid dictionary", "dict_type"))
+        elif kind == "dict" and not isinstance(value, dict):
+            errors.append(_error(["body", name], "Input should be a valid dictionary", "dict_type"))
+    if errors:
+        raise ValidationError(errors)
+
+
+INTERACT_FIELDS = {
+    "user_id": "str",
+    "channel": "str",
+    "request_id": "str",
+    "topics": "list[str]",
+    "message": "str",
+    "metadata": "dict[str,str]",
+}
+RATE_FIELDS = {
+    "user_id": "str",
+    "channel": "str",
+    "response_id": "str",
+    "rating": "int",
+    "comment": "str",
+}
+BOOKING_FIELDS = {"request_id": "str", "params": "dict"}
+BOOKING_QUESTIONS = {
+    "name": "What is your name?",
+    "country": "Which country do you want to travel to?",
+    "age": "What is your age?",
+    "insurance": "As you are over 50, do you need insurance?",
+}
+
+CLASSIFICATION_RULES = [
+    ("evacuation-planning", re.compile(r"evacuat|stuck|fire|earthquake|flood|gas leak|trapped", re.I)),
+    ("triage", re.compile(r"patient|unconscious|breath|\bhr\b|pulse|injur", re.I)),
+    ("medical", re.compile(r"symptom|fever|fasting|bleeding|disease", re.I)),
+    ("greeting", re.compile(
+        r"^\s*(hi|hello|hey|howdy|good (morning|afternoon|evening))\b|hello|"
+        r"你好|안녕|こんにちは|Привет|مرحبا|नमस्ते", re.I)),
+]
+
+
+def classify(text):
+    for label, pattern in CLASSIFICATION_RULES:
+        if pattern.search(text):
+            return label
+    return "other"
+
+
+def now_string():
+    return datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+class StandinService:
+    def __init__(self, config):
+        self.config = config
+        self.bookings = {}
+        self.bookings_lock = threading.Lock()
+
+    def padding(self):
+        return "." * self.config.payload_bytes
+
+    def interact(self, body):
+        validate_fields(body, INTERACT_FIELDS)
+        started = time.perf_counter()
+        text = f"[{classify(body['message'])}] {body['message']}{self.padding()}"
+        return {
+            "user_id": body["user_id"],
+            "channel": body["channel"],
+            "request_id": body["request_id"],
+            "datetime_response": now_string(),
+            "response_duration": time.perf_counter() - started,
+            "agent_answer": {"text_sections": [{"text": text}]},
+        }
+
+    def classification(self, query):
+        text = query.get("interaction_text", [""])[0]
+        return {
+            "interaction_text": text,
+            "classification": classify(text),
+            "implementation": "agent002",
+        }
+
+    def get_docs(self, query):
+        if "user_id" not in query:
+            raise ValidationError([_error(["query", "user_id"], "Field required", "missing")])
+        pages = [
+            {"page": n, "url": f"/static/21-12_JTS_Prolonged_Casualty_Care_Guidelines.pdf#page={n}"}
+            for n in range(1, 4)
+        ]
+        doc = {"doc_name": "21-12_JTS_Prolonged_Casualty_Care_Guidelines.pdf", "pages": pages}
+        if self.config.payload_bytes:
+            doc["summary"] = self.padding()
+        return {"user_id": query["user_id"][0], "doc_pages": [doc]}
+
+    def rate_response(self, body):
+        validate_fields(body, RATE_FIELDS)
+        response = {key: body[key] for key in RATE_FIELDS}
+        response.update(
+            datetime_rating=now_string(),
+            success_code=0,
+            message="Rating received",
+        )
+        return response
+
+    def book_holiday(self, body):
+        validate_fields(body, BOOKING_FIELDS)
+        # The real tool only accepts string params and a whole-number age;
+        # anything else fails inside the service with a 500.
+        for key, value in body["params"].items():
+            if not isinstance(value, str):
+                raise ServerError(f"param {key} must be a string")
+        age = body["params"].get("age")
+        if age and not age.strip().isdigit():
+            raise ServerError("age must be a whole number")
+        with self.bookings_lock:
+            booking = self.bookings.setdefault(
+                body["request_id"], {"params": {}, "booking_id": None}
+            )
+            if booking["booking_id"] is None:
+                booking["params"].update(body["params"])
+            params = booking["params"]
+            missing = [key for key in ("name", "country", "age") if not params.get(key)]
+            needs_insurance = bool(params.get("age")) and int(params["age"]) >= 50
+            if not missing and needs_insurance and not params.get("insurance"):
+                missing.append("insurance")
+            if not missing and booking["booking_id"] is None:
+                booking["booking_id"] = uuid.uuid4().hex[:8]
+            complete = booking["booking_id"] is not None
+            return {
+                "request_id": body["request_id"],
+                "params": dict(params),
+                "complete": complete,
+                "booking_id": booking["booking_id"],
+                "interactions": None if complete else [
+                    {"variable_name": key, "question": BOOKING_QUESTIONS[key]} for key in missing
+                ],
+            }
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service = None  # set by make_server
+
+    POST_ROUTES = {
+        "/interact": "interact",
+        "/rate_response": "rate_response",
+        "/tools/holiday/book": "book_holiday",
+    }
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def handle_route(self, path, call):
+        config = self.service.config
+        delay = config.delay_for(path)
+        if delay > 0:
+            time.sleep(delay)
+        if config.should_fail():
+            self.send_json(503, {"detail": "Injected error"})
+            return
+        try:
+            self.send_json(200, call())
+        except ValidationError as exc:
+            self.send_json(422, {"detail": exc.detail})
+        except ServerError:
+            body = b"Internal Server Error"
+            self.send_response(500)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/get_docs":
+            query = parse_qs(parts.query, keep_blank_values=True)
+            self.handle_route(parts.path, lambda: self.service.get_docs(query))
+        else:
+            self.send_json(404, {"detail": "Not Found"})
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        raw = self.read_body()
+        if parts.path == "/interact/classification":
+            query = parse_qs(parts.query, keep_blank_values=True)
+            self.handle_route(parts.path, lambda: self.service.classification(query))
+            return
+        method = self.POST_ROUTES.get(parts.path)
+        if method is None:
+            self.send_json(404, {"detail": "Not Found"})
+            return
+
+        def call():
+            content_type = self.headers.get("Content-Type", "")
+            if "json" not in content_type:
+                raise ValidationError([_error(["body"], "Input should be a valid dictionary", "model_attributes_type")])
+            try:
+                body = json.loads(raw or b"null")
+            except ValueError:
+                raise ValidationError([_error(["body", 0], "JSON decode error", "json_invalid")])
+            return getattr(self.service, method)(body)
+
+        self.handle_route(parts.path, call)
+
+
+def make_server(host="127.0.0.1", port=0, config=None):
+    handler = type("BoundStandinHandler", (StandinHandler,), {})
+    handler.service = StandinService(config or StandinConfig())
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class StandinServer:
+    # In-process server for tests and benchmarks:
+    #   with StandinServer(StandinConfig(latency="fixed:0.01")) as base_url: ...
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.server = make_server(host, port, config)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the GT agent and tool endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", help="Latency distribution for every endpoint, e.g. lognormal:-2.3,0.5")
+    parser.add_argument(
+        "--endpoint-latency", action="append", default=[], metavar="PATH=SPEC",
+        help="Latency distribution for one endpoint, e.g. /interact=uniform:0.5,2",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="Extra bytes added to each answer")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    endpoint_latency = dict(item.split("=", 1) for item in args.endpoint_latency)
+    config = StandinConfig(args.latency, endpoint_latency, args.error_rate, args.payload_bytes, args.seed)
+    server = make_server(args.host, args.port, config)
+    print(f"Stand-in serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
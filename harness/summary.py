@@ -0,0 +1,205 @@
+import argparse
+from datetime import datetime
+
+import duckdb
+
+from harness import config
+
+# Pass/fail counts and durations per suite, day and status, kept up to date
+# as results are written: the sink (harness/sink.py) adds each run's
+# aggregates in the transaction that stores its rows, and so do the importer
+# (harness/importer.py) and the watcher (harness/watch.py) for the report
+# rows they load, so the Evidence pages read a handful of summary rows
+# instead of grouping the raw results. The suite is the table the rows went
+# to. Duration sums (not averages) are stored so runs can be added together;
+# avg = duration_sum / results. `python -m harness.summary` rebuilds the
+# table from the result tables, e.g. for results written before it existed.
+SUMMARY_TABLE = "test_summary"
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+_UPSERT = """
+    ON CONFLICT DO UPDATE SET
+        results = results + excluded.results,
+        duration_sum = duration_sum + excluded.duration_sum,
+        duration_min = least(duration_min, excluded.duration_min),
+        duration_max = greatest(duration_max, excluded.duration_max)
+"""
+
+
+def create_table(con, create="CREATE TABLE IF NOT EXISTS"):
+    con.execute(
+        f"""
+        {create} {SUMMARY_TABLE} (
+            suite VARCHAR,
+            run_date DATE,
+            status VARCHAR,
+            results BIGINT,
+            duration_sum DOUBLE,
+            duration_min DOUBLE,
+            duration_max DOUBLE,
+            PRIMARY KEY (suite, run_date, status)
+        )
+        """
+    )
+
+
+def _aggregates(collector):
+    groups = {}
+    for start, duration, status in zip(collector.start_ns, collector.duration_ns, collector.statuses):
+        key = (datetime.fromtimestamp(start / 1e9).date(), status)
+        seconds = duration / 1e9
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [1, seconds, seconds, seconds]
+        else:
+            group[0] += 1
+            group[1] += seconds
+            group[2] = min(group[2], seconds)
+            group[3] = max(group[3], seconds)
+    return groups
+
+
+def update(con, suite, collector):
+    # Adds one run to the summary, on an open connection (the caller owns
+    # the transaction); costs one row per day and status of the run
+    groups = _aggregates(collector)
+    if not groups:
+        return
+    create_table(con)
+    keys, values = list(groups), list(groups.values())
+    con.execute(
+        f"""
+        INSERT INTO {SUMMARY_TABLE}
+        SELECT * FROM (
+            SELECT
+                unnest(?::VARCHAR[]) AS suite,
+                unnest(?::DATE[]) AS run_date,
+                unnest(?::VARCHAR[]) AS status,
+                unnest(?::BIGINT[]) AS results,
+                unnest(?::DOUBLE[]) AS duration_sum,
+                unnest(?::DOUBLE[]) AS duration_min,
+                unnest(?::DOUBLE[]) AS duration_max
+        )
+        {_UPSERT}
+        """,
+        [
+            [suite] * len(keys),
+            [day for day, _ in keys],
+            [status for _, status in keys],
+            *([value[index] for value in values] for index in range(4)),
+        ],
+    )
+
+
+def result_tables(con):
+    # Tables with the report columns the summary is built from
+    columns = {}
+    for table, column in con.execute(
+        "SELECT table_name, column_name FROM information_schema.columns "
+        "WHERE table_name IN (SELECT table_name FROM information_schema.tables WHERE table_type = 'BASE TABLE')"
+    ).fetchall():
+        columns.setdefault(table, set()).add(column)
+    return {table: names for table, names in columns.items() if is_result(names)}
+
+
+def is_result(columns):
+    return {"Status", "Duration (seconds)"} <= set(columns) and bool(set(columns) & {"Start Date", "Start Time"})
+
+
+def _grouped(suite, source, columns):
+    # The summary rows of `source` (a table or table function with the
+    # report columns)
+    day = '"Start Date"' if "Start Date" in columns else '"Start Time"'
+    return f"""
+        SELECT {_literal(suite)}, run_date, status, count(*), sum(duration), min(duration), max(duration)
+        FROM (
+            SELECT
+                TRY_CAST({day} AS DATE) AS run_date,
+                coalesce("Status", 'unknown') AS status,
+                "Duration (seconds)" AS duration
+            FROM {source}
+        )
+        WHERE run_date IS NOT NULL
+        GROUP BY run_date, status
+    """
+
+
+def add(con, suite, source):
+    # Adds the rows of `source` to the summary of `suite` on an open
+    # connection (the caller owns the transaction), e.g. the rows of a CSV
+    # chunk just appended to a table; a source without the report columns
+    # (Status, Duration, Start Date or Time) is left out
+    columns = [column[0] for column in con.execute(f"SELECT * FROM {source} LIMIT 0").description]
+    if not is_result(columns):
+        return
+    create_table(con)
+    con.execute(f"INSERT INTO {SUMMARY_TABLE} {_grouped(suite, source, columns)} {_UPSERT}")
+
+
+def rebuild(con, suites=None):
+    # Recomputes the summary of the given suites (default: every result
+    # table) in one transaction; returns {suite: summary rows}
+    con.execute("BEGIN TRANSACTION")
+    try:
+        rows = replace(con, suites)
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    return rows
+
+
+def replace(con, suites=None):
+    # rebuild() inside the caller's transaction, e.g. for a table the
+    # importer has just replaced. The summary table is recreated rather than
+    # emptied because DuckDB still sees keys deleted earlier in a
+    # transaction as conflicts.
+    tables = result_tables(con)
+    suites = sorted(tables) if suites is None else suites
+    create_table(con)
+    con.execute(f"CREATE TEMP TABLE summary_rebuild AS SELECT * FROM {SUMMARY_TABLE} WHERE false")
+    con.execute(
+        f"INSERT INTO summary_rebuild SELECT * FROM {SUMMARY_TABLE} "
+        f"WHERE suite NOT IN ({', '.join(_literal(suite) for suite in suites) or 'NULL'})"
+    )
+    for suite in suites:
+        if suite not in tables:
+            raise ValueError(f"{suite} is not a result table")
+        con.execute(f"INSERT INTO summary_rebuild {_grouped(suite, _quote(suite), tables[suite])}")
+    create_table(con, "CREATE OR REPLACE TABLE")
+    con.execute(f"INSERT INTO {SUMMARY_TABLE} SELECT * FROM summary_rebuild")
+    con.execute("DROP TABLE summary_rebuild")
+    rows = dict(
+        con.execute(
+            f"SELECT suite, count(*) FROM {SUMMARY_TABLE} "
+            f"WHERE suite IN ({', '.join(_literal(suite) for suite in suites) or 'NULL'}) GROUP BY suite"
+        ).fetchall()
+    )
+    return {suite: rows.get(suite, 0) for suite in suites}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the test_summary table from the result tables")
+    parser.add_argument("suites", nargs="*", help="result tables to rebuild (default: all)")
+    parser.add_argument("--db", default=config.RESULTS_DATABASE)
+    args = parser.parse_args()
+
+    con = duckdb.connect(database=args.db, read_only=False)
+    try:
+        rebuilt = rebuild(con, args.suites or None)
+    finally:
+        con.close()
+    for suite, rows in rebuilt.items():
+        print(f"{suite}: {rows} summary rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import functools
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Per-phase timing of the HTTP requests a test makes. A capture is started in
+# setUp and collected in tearDown; every request sent from that thread in
+# between adds its phase durations to it:
+#   dns      - resolving the host name (new connections only)
+#   connect  - TCP handshake (new connections only)
+#   tls      - TLS handshake (new HTTPS connections only)
+#   ttfb     - from the request being sent until the status line and headers
+#              have arrived
+#   download - reading the response body
+# A request over a reused keep-alive connection only has ttfb and download.
+#
+# The capture belongs to the thread that started it. Work a test hands to a
+# thread pool is wrapped with bind(): it runs with a capture of its own that
+# is added to the test's when it returns, so the phases are the total over
+# all of the test's requests (concurrent ones can add up to more than the
+# test's duration).
+PHASES = ("dns", "connect", "tls", "ttfb", "download")
+PHASE_KEYS = [f"{phase}_seconds" for phase in PHASES]
+PHASE_COLUMNS = ["DNS (seconds)", "Connect (seconds)", "TLS (seconds)", "TTFB (seconds)", "Download (seconds)"]
+
+_local = threading.local()
+_lock = threading.Lock()  # for captures that other threads add to
+
+
+def start_capture():
+    _local.phases = dict.fromkeys(PHASES, 0.0)
+
+
+def stop_capture():
+    phases = getattr(_local, "phases", None) or dict.fromkeys(PHASES, 0.0)
+    _local.phases = None
+    return {f"{phase}_seconds": phases[phase] for phase in PHASES}
+
+
+def merge(captured):
+    # Add a capture taken on another thread (e.g. a hedged request) to this
+    # thread's capture
+    for phase in PHASES:
+        _add(phase, captured[f"{phase}_seconds"])
+
+
+def bind(function):
+    # `function`, to run on another thread, with its phases added to the
+    # capture of the calling thread
+    target = getattr(_local, "phases", None)
+    if target is None:
+        return function
+
+    @functools.wraps(function)
+    def bound(*args, **kwargs):
+        previous = getattr(_local, "phases", None)
+        start_capture()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            captured = stop_capture()
+            _local.phases = previous
+            with _lock:
+                for phase in PHASES:
+                    target[phase] += captured[f"{phase}_seconds"]
+
+    return bound
+
+
+def _add(phase, seconds):
+    phases = getattr(_local, "phases", None)
+    if phases is not None:
+        with _lock:
+            phases[phase] += seconds
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except socket.gaierror:
+            # Let urllib3 resolve again and raise its own error
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        _add("dns", resolved - start)
+        # Connect straight to the resolved address; `host` (used for the
+        # Host header and TLS server name) is restored right after
+        self._dns_host = address
+        try:
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+        _add("connect", time.perf_counter() - resolved)
+        return sock
+
+    def getresponse(self, *args, **kwargs):
+        start = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        _add("ttfb", time.perf_counter() - start)
+        return response
+
+
+class TimedHTTPSConnection(TimedHTTPConnection, HTTPSConnection):
+    def connect(self):
+        # _new_conn accounts for dns and connect; the rest is the handshake
+        phases = getattr(_local, "phases", None)
+        before = phases["dns"] + phases["connect"] if phases else 0.0
+        start = time.perf_counter()
+        super().connect()
+        if phases:
+            socket_time = phases["dns"] + phases["connect"] - before
+            _add("tls", time.perf_counter() - start - socket_time)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, **kwargs):
+        response = super().send(request, stream=stream, **kwargs)
+        if not stream:
+            # Session.send would read the body right after this anyway
+            start = time.perf_counter()
+            response.content
+            _add("download", time.perf_counter() - start)
+        return response
@@ -0,0 +1,346 @@
+import argparse
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import re
+import select
+import struct
+import tempfile
+import time
+
+import duckdb
+
+from harness import config, summary
+from harness.importer import csv_source, table_name
+
+# Keeps DuckDB tables in step with the CSV reports as the suites write them.
+# The watcher follows the repo root and the suite folders (inotify through
+# ctypes on Linux, stat polling elsewhere) and, for every report that
+# changed, loads only the bytes appended since the last pass into the
+# report's table: named after the file like harness/importer.py, with a live_
+# prefix so it never takes the name of a table that harness/reports.py or the
+# importer builds from the same report with their own columns.
+#
+# Per report the ingest_offsets table records the file's inode, how far it
+# has been ingested and the last bytes before that point. Rows and offset
+# are committed together, so a crash never loads a range twice. A report
+# that was replaced (new inode), truncated or rewritten in place (the bytes
+# before the offset changed) is loaded again from the start. Only complete
+# records are loaded: a line still being written waits for the next pass.
+# The test_summary rows of the table (harness/summary.py) are updated in the
+# same transaction: the new rows are added, a reloaded table is summarised
+# again.
+#
+# While another process holds the database lock (a suite writing its
+# results, the importer, a second watcher) a pass fails to connect; the
+# changed reports stay pending and the pass is retried, waiting twice as
+# long after every failure up to MAX_BACKOFF seconds.
+OFFSETS_TABLE = "ingest_offsets"
+PATTERNS = ("testing_report_*.csv", "test_report_*.csv")
+WATCH_DIRS = [
+    config.REPO_ROOT,
+    os.path.join(config.REPO_ROOT, "unit_tests"),
+    os.path.join(config.REPO_ROOT, "unit_tests_ASU_tools"),
+    os.path.join(config.REPO_ROOT, "unit_tests_booking"),
+]
+PREFIX = "live_"
+TAIL_BYTES = 256
+MAX_BACKOFF = 30.0
+BLOCK_SIZE = 1 << 20
+
+# inotify(7)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+_EVENT = struct.Struct("iIII")
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def is_report(name):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in PATTERNS)
+
+
+def scan(dirs):
+    reports = []
+    for directory in dirs:
+        try:
+            names = sorted(os.listdir(directory))
+        except FileNotFoundError:
+            continue
+        reports += [os.path.join(directory, name) for name in names if is_report(name)]
+    return reports
+
+
+def create_table(con):
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {OFFSETS_TABLE} (
+            path VARCHAR PRIMARY KEY,
+            table_name VARCHAR,
+            inode BIGINT,
+            ingested_to BIGINT,
+            tail BLOB,
+            updated_at TIMESTAMP
+        )
+        """
+    )
+
+
+def _copy_records(file, start, end, out):
+    # Copies [start, end) to `out` and cuts it after the last complete
+    # record: the last newline outside a quoted field (quotes inside fields
+    # are doubled, so an even number of quotes means outside). Returns the
+    # file offset just after that record.
+    file.seek(start)
+    position, boundary, quoted = start, start, False
+    while position < end:
+        block = file.read(min(BLOCK_SIZE, end - position))
+        if not block:
+            break
+        out.write(block)
+        if b'"' not in block and not quoted:
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                boundary = position + newline + 1
+        else:
+            for match in re.finditer(rb'["\n]', block):
+                if match.group() == b'"':
+                    quoted = not quoted
+                elif not quoted:
+                    boundary = position + match.start() + 1
+        position += len(block)
+    return boundary
+
+
+class Ingester:
+    def __init__(self, db_file=None, prefix=PREFIX):
+        self.db_file = db_file or config.RESULTS_DATABASE
+        self.prefix = prefix
+
+    def ingest(self, paths):
+        # Returns {path: rows loaded} for the reports that had new rows. The
+        # database is only open for the pass so Evidence can read it between
+        # passes.
+        loaded = {}
+        con = duckdb.connect(database=self.db_file, read_only=False)
+        try:
+            create_table(con)
+            for path in paths:
+                try:
+                    rows = self.ingest_file(con, path)
+                except FileNotFoundError:
+                    continue
+                except duckdb.Error:
+                    # e.g. a detected column type the new rows do not fit
+                    try:
+                        rows = self.ingest_file(con, path, reload=True)
+                    except duckdb.Error as error:
+                        # A report DuckDB cannot read at all (ragged rows,
+                        # ...): skip it, it is tried again when it changes
+                        print(f"Skipping {path}: {error}")
+                        continue
+                if rows:
+                    loaded[path] = rows
+        finally:
+            con.close()
+        return loaded
+
+    def ingest_file(self, con, path, reload=False):
+        path = os.path.abspath(path)
+        table = self.prefix + table_name(path)
+        state = con.execute(
+            f"SELECT table_name, inode, ingested_to, tail FROM {OFFSETS_TABLE} WHERE path = ?", [path]
+        ).fetchone()
+        existing = con.execute(
+            f"SELECT path FROM {OFFSETS_TABLE} WHERE table_name = ? AND path <> ?", [table, path]
+        ).fetchone()
+        if existing is not None or (state is None and self._table_exists(con, table)):
+            print(f"Skipping {path}: table {table} is not managed by the watcher for this file")
+            return 0
+
+        with open(path, mode="rb") as file:
+            stat = os.fstat(file.fileno())
+            header = file.readline()
+            if not header.endswith(b"\n"):
+                return 0
+            if state is not None and not reload:
+                _, inode, ingested_to, tail = state
+                file.seek(ingested_to - len(tail))
+                reload = inode != stat.st_ino or stat.st_size < ingested_to or file.read(len(tail)) != tail
+            start = len(header) if state is None or reload else state[2]
+            if start >= stat.st_size and not reload:
+                return 0
+
+            fd, chunk_file = tempfile.mkstemp(suffix=".csv")
+            try:
+                with os.fdopen(fd, mode="wb") as out:
+                    out.write(header)
+                    boundary = _copy_records(file, start, stat.st_size, out)
+                    out.truncate(len(header) + boundary - start)
+                if boundary == start and not reload:
+                    return 0
+                file.seek(max(0, boundary - TAIL_BYTES))
+                tail = file.read(boundary - max(0, boundary - TAIL_BYTES))
+                return self._load(con, path, table, chunk_file, reload, stat.st_ino, boundary, tail)
+            finally:
+                os.remove(chunk_file)
+
+    def _table_exists(self, con, table):
+        return con.execute("SELECT count(*) FROM information_schema.tables WHERE table_name = ?", [table]).fetchone()[0] > 0
+
+    def _load(self, con, path, table, chunk_file, reload, inode, ingested_to, tail):
+        source = csv_source([chunk_file])
+        con.execute("BEGIN TRANSACTION")
+        try:
+            if reload:
+                con.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            con.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} AS SELECT * FROM {source} LIMIT 0")
+            rows = con.execute(f"INSERT INTO {_quote(table)} BY NAME SELECT * FROM {source}").fetchone()[0]
+            if not reload:
+                summary.add(con, table, source)
+            elif table in summary.result_tables(con):
+                summary.replace(con, [table])
+            con.execute(
+                f"INSERT OR REPLACE INTO {OFFSETS_TABLE} VALUES (?, ?, ?, ?, ?, now())",
+                [path, table, inode, ingested_to, tail],
+            )
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        return rows
+
+
+class PollingWatcher:
+    def __init__(self, dirs):
+        self.dirs = dirs
+        self.signatures = self._signatures()
+
+    def _signatures(self):
+        signatures = {}
+        for path in scan(self.dirs):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signatures[path] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def changes(self, timeout):
+        time.sleep(timeout)
+        signatures = self._signatures()
+        changed = {path for path, signature in signatures.items() if self.signatures.get(path) != signature}
+        self.signatures = signatures
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    def __init__(self, dirs):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for directory in dirs:
+            if not os.path.isdir(directory):
+                continue
+            wd = libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+            )
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.dirs[wd] = directory
+
+    def changes(self, timeout):
+        changed = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        while readable:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                name = os.fsdecode(name)
+                if wd in self.dirs and is_report(name):
+                    changed.add(os.path.join(self.dirs[wd], name))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(dirs, poll=False):
+    if not poll:
+        try:
+            return InotifyWatcher(dirs)
+        except (OSError, AttributeError):
+            # AttributeError: no inotify_init1 in this libc (not Linux)
+            pass
+    return PollingWatcher(dirs)
+
+
+def watch(dirs, ingester, interval=2.0, settle=0.2, poll=False):
+    watcher = make_watcher(dirs, poll)
+    print(f"Watching {len(dirs)} directories ({type(watcher).__name__}) into {ingester.db_file}")
+    pending, retry_at, backoff = set(scan(dirs)), 0.0, interval
+    try:
+        while True:
+            if pending and time.monotonic() >= retry_at:
+                try:
+                    report(ingester.ingest(sorted(pending)))
+                    pending, backoff = set(), interval
+                except duckdb.IOException as error:
+                    print(f"{time.strftime('%H:%M:%S')} {error}; retrying {len(pending)} reports in {backoff:g}s")
+                    retry_at = time.monotonic() + backoff
+                    backoff = min(backoff * 2, MAX_BACKOFF)
+            timeout = max(0.0, retry_at - time.monotonic()) if pending else interval
+            changed = watcher.changes(timeout)
+            if changed:
+                # Let a burst of writes finish before the pass
+                changed |= watcher.changes(settle)
+                pending |= changed
+    finally:
+        watcher.close()
+
+
+def report(loaded):
+    for path, rows in loaded.items():
+        print(f"{time.strftime('%H:%M:%S')} +{rows} rows from {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load appended report rows into DuckDB as they are written")
+    parser.add_argument("--db", default=config.RESULTS_DATABASE)
+    parser.add_argument("--dir", action="append", dest="dirs", help="directory to watch (repeatable)")
+    parser.add_argument("--interval", type=float, default=2.0, help="polling interval in seconds")
+    parser.add_argument("--poll", action="store_true", help="poll with stat() instead of inotify")
+    parser.add_argument("--prefix", default=PREFIX, help="prefix for the table names")
+    parser.add_argument("--once", action="store_true", help="load what is new and exit")
+    args = parser.parse_args()
+
+    dirs = args.dirs or WATCH_DIRS
+    ingester = Ingester(args.db, args.prefix)
+    if args.once:
+        report(ingester.ingest(scan(dirs)))
+        return
+    try:
+        watch(dirs, ingester, args.interval, poll=args.poll)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,20 @@
+import os
+import sys
+
 import duckdb
-import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from harness.importer import import_reports
 
 # Path to your CSV file and DuckDB database file
 csv_file = "unit_tests/test_report_with_timestamp.csv"
 db_file = "my_duckdb_data.db"
 
-# Connect to DuckDB and create a database file
-con = duckdb.connect(database=db_file, read_only=False)
-
-# Read CSV data into a DataFrame
-df = pd.read_csv(csv_file)
-print("CSV data loaded successfully:", df.head())  # Check if CSV data is loaded
-
-# Register DataFrame as a table in DuckDB
-con.register("test_data", df)
-print("Table 'test_data' registered successfully.")
-
-# Optionally, you can query or manipulate the data
-# For example, print the first 5 rows
-result = con.execute("SELECT * FROM test_data LIMIT 5")
-print(result.fetch_df())
+# Loads the report into a persistent, typed "test_data" table with DuckDB's
+# CSV reader; `python -m harness.importer` imports any number of reports
+rows = import_reports([csv_file], db_file, table="test_data")["test_data"]
+print(f"Table 'test_data' created with {rows} rows.")
 
-# Close the connection
+con = duckdb.connect(database=db_file, read_only=True)
+print(con.sql("SELECT * FROM test_data LIMIT 5"))
 con.close()
@@ -0,0 +1 @@
+select * from test_history where suite = 'asu_patient_prior' and run_date >= current_date - interval 90 day;
\ No newline at end of file
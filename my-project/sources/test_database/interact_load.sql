@@ -0,0 +1 @@
+select * from interact_load;
\ No newline at end of file
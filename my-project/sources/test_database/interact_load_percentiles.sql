@@ -0,0 +1 @@
+select * from interact_load_percentiles;
\ No newline at end of file
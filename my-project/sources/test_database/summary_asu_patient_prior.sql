@@ -0,0 +1 @@
+select * from test_summary where suite = 'asu_patient_prior';
\ No newline at end of file
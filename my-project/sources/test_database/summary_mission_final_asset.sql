@@ -0,0 +1 @@
+select * from test_summary where suite = 'mission_final_asset';
\ No newline at end of file
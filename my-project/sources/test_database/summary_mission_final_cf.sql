@@ -0,0 +1 @@
+select * from test_summary where suite = 'mission_final_cf';
\ No newline at end of file
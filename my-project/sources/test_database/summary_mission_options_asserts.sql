@@ -0,0 +1 @@
+select * from test_summary where suite = 'mission_options_asserts';
\ No newline at end of file
@@ -0,0 +1 @@
+select * from test_summary where suite = 'triage_category';
\ No newline at end of file
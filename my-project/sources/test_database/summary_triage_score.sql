@@ -0,0 +1 @@
+select * from test_summary where suite = 'triage_score';
\ No newline at end of file
@@ -0,0 +1 @@
+select * from test_report_interact;
\ No newline at end of file
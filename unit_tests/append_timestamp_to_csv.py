@@ -1,28 +1,14 @@
 # no longer needed as it only appends the timestamp but no wthe code is been added to each py file to convert py into csv with timestamp of each test methods!
 
-import csv
-from datetime import datetime
+import os
+import sys
 
-# File paths
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness.stamp import stamp_file
+
+# See harness/stamp.py; `python -m harness.stamp` stamps any number of reports
 input_csv = "test_report.csv"
 output_csv = "test_report_with_timestamp.csv"
 
-# Read the CSV file
-with open(input_csv, mode="r") as infile:
-    reader = csv.reader(infile)
-    rows = list(reader)
-
-# Get the current date and time
-current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-# Add the date and time to the header
-rows[0].extend(["date", "time"])
-for row in rows[1:]:
-    row.extend([current_time.split()[0], current_time.split()[1]])
-
-# Write the updated rows to a new CSV file
-with open(output_csv, mode="w", newline="") as outfile:
-    writer = csv.writer(outfile)
-    writer.writerows(rows)
-
+stamp_file(input_csv, output_csv)
 print(f"CSV file updated with date and time: {output_csv}")
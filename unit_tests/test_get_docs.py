@@ -1,17 +1,21 @@
 import unittest
-import requests
 import os
-import csv
 from datetime import datetime
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import api_report, client, runs, timing
+from harness.config import AGENT_BASE_URL
 
 
 class TestGetDocs(unittest.TestCase):
-    BASE_URL="http://3.82.58.102:8000/get_docs"
+    BASE_URL=f"{AGENT_BASE_URL}/get_docs"
     test_timings = {}
     def setUp(self):
         self.base_url = self.BASE_URL
         self.headers = {"accept": "application/json"}
         self.start_time = datetime.now()
+        timing.start_capture()
 
     def tearDown(self):
         duration = datetime.now() - self.start_time
@@ -19,21 +23,22 @@ class TestGetDocs(unittest.TestCase):
         self.test_timings[test_name] = {
             "start_time": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
             "duration_seconds": duration.total_seconds(),
+            **timing.stop_capture(),
         }
 
     def test_status_code(self):
         params = {"user_id": "any_string"}
-        response = requests.get(self.base_url, headers=self.headers, params=params)
+        response = client.get(self.base_url, headers=self.headers, params=params)
         self.assertEqual(response.status_code, 200)
 
     def test_content_type(self):
         params = {"user_id": "any_string"}
-        response = requests.get(self.base_url, headers=self.headers, params=params)
+        response = client.get(self.base_url, headers=self.headers, params=params)
         self.assertEqual(response.headers["content-type"], "application/json")
 
     def test_response_structure(self):
         params = {"user_id": "any_string"}
-        response = requests.get(self.base_url, headers=self.headers, params=params)
+        response = client.get(self.base_url, headers=self.headers, params=params)
         response_data = response.json()
 
         # Assert basic structure of the response
@@ -50,7 +55,7 @@ class TestGetDocs(unittest.TestCase):
 
     def test_response_content(self):
         params = {"user_id": "any_string"}
-        response = requests.get(self.base_url, headers=self.headers, params=params)
+        response = client.get(self.base_url, headers=self.headers, params=params)
         response_data = response.json()
 
         # Assert content of the response
@@ -66,29 +71,15 @@ class TestGetDocs(unittest.TestCase):
             self.assertGreater(len(first_doc["pages"]), 0)
 
 
-def generate_csv_report():
-    csv_file = "test_report_get_docs.csv"
-    print(f"Generating CSV report: {csv_file}")
-
-    with open(
-        csv_file, "w", newline=""
-    ) as file:  # Use 'w' mode to overwrite and include headers
-        writer = csv.writer(file)
-        writer.writerow(
-            ["Test Name", "Start Time", "Duration (seconds)"]
-        )  # Writing headers
-        for test_name, timings in TestGetDocs.test_timings.items():
-            writer.writerow(
-                [test_name, timings["start_time"], timings["duration_seconds"]]
-            )
-            print(
-                f"Written row: {[test_name, timings['start_time'], timings['duration_seconds']]}"
-            )
+def generate_csv_report(run):
+    api_report.write_report("test_report_get_docs", "test_report_get_docs.csv", TestGetDocs.test_timings, run)
 
 
 if __name__ == "__main__":
+    run = runs.Run()
     unittest.main(
         exit=False
     )  # Make sure to use exit=False so that the script continues after tests
-    generate_csv_report()
+    generate_csv_report(run)
+    client.generate_connection_report("connection_report_get_docs.csv")
     print("CSV report generation completed.")
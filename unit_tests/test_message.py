@@ -1,14 +1,17 @@
 import unittest
-import requests
 import json
 from datetime import datetime
-import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import api_report, client, runs, timing
+from harness.config import AGENT_BASE_URL
 
 
 class TestInteractEndpoint(unittest.TestCase):
     test_timings = {}
-    BASE_URL = "http://3.82.58.102:8000"
+    BASE_URL = AGENT_BASE_URL
 
     def setUp(self):
         self.base_url = self.BASE_URL
@@ -18,6 +21,7 @@ class TestInteractEndpoint(unittest.TestCase):
             "Content-Type": "application/json",
         }
         self.start_time = datetime.now()
+        timing.start_capture()
 
     def tearDown(self):
         duration = datetime.now() - self.start_time
@@ -25,6 +29,7 @@ class TestInteractEndpoint(unittest.TestCase):
         self.test_timings[test_name] = {
             "start_time": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
             "duration_seconds": duration.total_seconds(),
+            **timing.stop_capture(),
         }
 
     def test_successful_interaction(self):
@@ -43,7 +48,7 @@ class TestInteractEndpoint(unittest.TestCase):
         }
 
         # Send POST request
-        response = requests.post(
+        response = client.post(
             self.base_url + self.endpoint, headers=self.headers, json=payload
         )
 
@@ -60,7 +65,7 @@ class TestInteractEndpoint(unittest.TestCase):
         }
 
         # Send POST request
-        response = requests.post(
+        response = client.post(
             self.base_url + self.endpoint, headers=self.headers, json=payload
         )
 
@@ -70,29 +75,15 @@ class TestInteractEndpoint(unittest.TestCase):
         self.assertIsInstance(response.json()["detail"], list)
 
 
-def generate_csv_report():
-    csv_file = "test_report_message.csv"
-    print(f"Generating CSV report: {csv_file}")
-
-    with open(
-        csv_file, "w", newline=""
-    ) as file:  # Use 'w' mode to overwrite and include headers
-        writer = csv.writer(file)
-        writer.writerow(
-            ["Test Name", "Start Time", "Duration (seconds)"]
-        )  # Writing headers
-        for test_name, timings in TestInteractEndpoint.test_timings.items():
-            writer.writerow(
-                [test_name, timings["start_time"], timings["duration_seconds"]]
-            )
-            print(
-                f"Written row: {[test_name, timings['start_time'], timings['duration_seconds']]}"
-            )
+def generate_csv_report(run):
+    api_report.write_report("test_report_message", "test_report_message.csv", TestInteractEndpoint.test_timings, run)
 
 
 if __name__ == "__main__":
+    run = runs.Run()
     unittest.main(
         exit=False
     )  # Make sure to use exit=False so that the script continues after tests
-    generate_csv_report()
+    generate_csv_report(run)
+    client.generate_connection_report("connection_report_message.csv")
     print("CSV report generation completed.")
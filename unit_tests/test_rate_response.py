@@ -1,24 +1,29 @@
 import unittest
-import requests
 from datetime import datetime
 import os
-import csv
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import api_report, client, runs, timing
+from harness.config import AGENT_BASE_URL
 
 
 class TestRateResponse(unittest.TestCase):
-    base_url = "http://3.82.58.102:8000"
+    base_url = AGENT_BASE_URL
     endpoint = "/rate_response"
     test_timings = {}
 
     def setUp(self):
         self.start_time = datetime.now()
+        timing.start_capture()
 
     def tearDown(self):
         duration = datetime.now() - self.start_time
         test_name = self.id().split('.')[-1]
         self.test_timings[test_name] = {
             'start_time': self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
-            'duration_seconds': duration.total_seconds()
+            'duration_seconds': duration.total_seconds(),
+            **timing.stop_capture(),
         }
 
     def test_successful_rating(self):
@@ -32,7 +37,7 @@ class TestRateResponse(unittest.TestCase):
         }
 
         # Make POST request to the endpoint
-        response = requests.post(self.base_url + self.endpoint, json=payload)
+        response = client.post(self.base_url + self.endpoint, json=payload)
 
         # Assert status code is 200
         self.assertEqual(response.status_code, 200)
@@ -58,7 +63,7 @@ class TestRateResponse(unittest.TestCase):
         }
 
         # Make POST request to the endpoint
-        response = requests.post(self.base_url + self.endpoint, json=payload)
+        response = client.post(self.base_url + self.endpoint, json=payload)
 
         # Assert status code is 422
         self.assertEqual(response.status_code, 422)
@@ -74,29 +79,15 @@ class TestRateResponse(unittest.TestCase):
         self.assertIn("type", error_detail)
 
 
-def generate_csv_report():
-    csv_file = "test_report_rating.csv"
-    print(f"Generating CSV report: {csv_file}")
-
-    with open(
-        csv_file, "w", newline=""
-    ) as file:  # Use 'w' mode to overwrite and include headers
-        writer = csv.writer(file)
-        writer.writerow(
-            ["Test Name", "Start Time", "Duration (seconds)"]
-        )  # Writing headers
-        for test_name, timings in TestRateResponse.test_timings.items():
-            writer.writerow(
-                [test_name, timings["start_time"], timings["duration_seconds"]]
-            )
-            print(
-                f"Written row: {[test_name, timings['start_time'], timings['duration_seconds']]}"
-            )
+def generate_csv_report(run):
+    api_report.write_report("test_report_rating", "test_report_rating.csv", TestRateResponse.test_timings, run)
 
 
 if __name__ == "__main__":
+    run = runs.Run()
     unittest.main(
         exit=False
     )  # Make sure to use exit=False so that the script continues after tests
-    generate_csv_report()
+    generate_csv_report(run)
+    client.generate_connection_report("connection_report_rating.csv")
     print("CSV report generation completed.")
@@ -0,0 +1,170 @@
+import argparse
+import time
+
+import numpy as np
+
+# Which assets can fly which missions, as bitmasks. Every mission is packed
+# once into a uint64 of what it requires, every asset into a uint64 of what
+# it offers; an asset can take a mission when no required bit is missing:
+#
+#   (mission_mask & ~asset_mask) == 0
+#
+# The flags (REQUIREMENTS) pair a MissionRequirements test with an Asset
+# test. Litter and ambulatory spaces are thermometer bits: one bit per
+# distinct number of spaces the missions ask for, set on an asset whose
+# capacity reaches it, so capacity is checked by the same AND. If the
+# missions ask for too many different numbers to fit in the 64 bits, those
+# capacities are compared as arrays instead.
+#
+# Missions with the same mask share one row of the result: the distinct masks
+# are matched against all assets and the rows gathered back per mission.
+REQUIREMENTS = (
+    ("medevac", lambda mission: mission.medevac_needed, lambda asset: asset.asset_mission_type == "medevac"),
+    ("evac", lambda mission: mission.evac_needed, lambda asset: asset.asset_mission_type == "evac"),
+    ("resupply", lambda mission: mission.resupply_needed, lambda asset: asset.asset_mission_type == "resupply"),
+    ("vtol", lambda mission: mission.require_vtol, lambda asset: asset.asset_type == "vtol"),
+    ("ctol", lambda mission: mission.require_ctol, lambda asset: asset.asset_type == "ctol"),
+    ("ground", lambda mission: mission.require_ground_vehicle, lambda asset: asset.asset_type == "ground"),
+    ("day", lambda mission: mission.day_mission, lambda asset: asset.operational_day),
+    ("night", lambda mission: mission.night_mission, lambda asset: asset.operational_night),
+    (
+        "adverse_weather",
+        lambda mission: mission.weather_condition != "clear",
+        lambda asset: asset.operational_adverse_weather,
+    ),
+    ("iv_provisions", lambda mission: mission.require_iv_provisions, lambda asset: asset.has_iv_provisions),
+    (
+        "medical_monitoring_system",
+        lambda mission: mission.require_medical_monitoring_system,
+        lambda asset: asset.has_medical_monitoring_system,
+    ),
+    (
+        "life_support_equipment",
+        lambda mission: mission.require_life_support_equipment,
+        lambda asset: asset.has_life_support_equipment,
+    ),
+    (
+        "oxygen_generation_system",
+        lambda mission: mission.require_oxygen_generation_system,
+        lambda asset: asset.has_oxygen_generation_system,
+    ),
+    (
+        "patient_litter_lift_system",
+        lambda mission: mission.require_patient_litter_lift_system,
+        lambda asset: asset.has_patient_litter_lift_system,
+    ),
+    ("available", lambda mission: True, lambda asset: asset.asset_status == "available"),
+)
+CAPACITIES = (
+    ("litters_spaces_required", "litter_capacity"),
+    ("ambulatory_spaces_required", "ambulatory_capacity"),
+)
+MASK_BITS = 64
+BLOCK = 4096  # missions per block when capacities are compared as arrays
+
+
+def compatible(mission, asset):
+    # The same rules field by field, for one pair
+    return all(asset_test(asset) for _, mission_test, asset_test in REQUIREMENTS if mission_test(mission)) and all(
+        getattr(asset, capacity) >= getattr(mission, required) for required, capacity in CAPACITIES
+    )
+
+
+def pack(objects, tests):
+    # uint64 masks with bit i set where tests[i] holds
+    masks = np.zeros(len(objects), dtype=np.uint64)
+    for bit, test in enumerate(tests):
+        flags = np.fromiter((bool(test(item)) for item in objects), dtype=bool, count=len(objects))
+        masks |= flags.astype(np.uint64) << np.uint64(bit)
+    return masks
+
+
+def _levels(required, capacity):
+    # Distinct numbers of spaces asked for that some asset lacks, sorted
+    if not len(capacity):
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(required[required > capacity.min()])
+
+
+def _thermometer(values, levels, first_bit):
+    # Bit first_bit + i set where values >= levels[i]: a mission needing n
+    # spaces sets every level up to n, an asset every level up to its
+    # capacity, so a level the asset lacks means too few spaces
+    masks = np.zeros(len(values), dtype=np.uint64)
+    for index, level in enumerate(levels.tolist()):
+        masks |= (values >= level).astype(np.uint64) << np.uint64(first_bit + index)
+    return masks
+
+
+class CapabilityMatcher:
+    def __init__(self, mission_masks, asset_masks, mission_spaces, asset_capacity):
+        # Masks from pack(); spaces and capacities are (litters, ambulatory)
+        # arrays. Capacities that fit become thermometer bits.
+        self.mission_masks = mission_masks.copy()
+        self.asset_masks = asset_masks.copy()
+        self.compared = []  # (required, capacity) arrays left to compare
+        bit = len(REQUIREMENTS)
+        for required, capacity in zip(mission_spaces, asset_capacity):
+            required = np.asarray(required, dtype=np.int64)
+            capacity = np.asarray(capacity, dtype=np.int64)
+            levels = _levels(required, capacity)
+            if bit + len(levels) > MASK_BITS:
+                self.compared.append((required, capacity))
+                continue
+            self.mission_masks |= _thermometer(required, levels, bit)
+            self.asset_masks |= _thermometer(capacity, levels, bit)
+            bit += len(levels)
+
+    @classmethod
+    def from_objects(cls, missions, assets):
+        return cls(
+            pack(missions, [mission_test for _, mission_test, _ in REQUIREMENTS]),
+            pack(assets, [asset_test for _, _, asset_test in REQUIREMENTS]),
+            [np.array([getattr(mission, required) for mission in missions], dtype=np.int64) for required, _ in CAPACITIES],
+            [np.array([getattr(asset, capacity) for asset in assets], dtype=np.int64) for _, capacity in CAPACITIES],
+        )
+
+    def feasibility(self):
+        # (missions x assets) bool matrix
+        distinct, inverse = np.unique(self.mission_masks, return_inverse=True)
+        missing = ~self.asset_masks
+        table = (distinct[:, None] & missing[None, :]) == 0
+        result = table[inverse.reshape(-1)]
+        for required, capacity in self.compared:
+            for start in range(0, len(required), BLOCK):
+                rows = slice(start, start + BLOCK)
+                result[rows] &= capacity[None, :] >= required[rows, None]
+        return result
+
+    def feasible_assets(self, mission):
+        # Indices of the assets that can take one mission
+        fits = (self.mission_masks[mission] & ~self.asset_masks) == 0
+        for required, capacity in self.compared:
+            fits &= capacity >= required[mission]
+        return np.flatnonzero(fits)
+
+
+def benchmark(missions=100_000, assets=1_000, seed=0):
+    # Random masks and capacities; returns (seconds, feasible pairs)
+    rng = np.random.default_rng(seed)
+    flags = len(REQUIREMENTS)
+    mission_bits = rng.random((missions, flags)) < 0.15
+    mission_bits[:, -1] = True  # every mission needs an available asset
+    asset_bits = rng.random((assets, flags)) < 0.8
+    weights = np.uint64(1) << np.arange(flags, dtype=np.uint64)
+    mission_masks = (mission_bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+    asset_masks = (asset_bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+    spaces = [rng.integers(0, 7, size=missions), rng.integers(0, 7, size=missions)]
+    capacity = [rng.integers(0, 25, size=assets), rng.integers(0, 25, size=assets)]
+    started = time.perf_counter()
+    result = CapabilityMatcher(mission_masks, asset_masks, spaces, capacity).feasibility()
+    return time.perf_counter() - started, int(result.sum())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the mission x asset feasibility matrix")
+    parser.add_argument("--missions", type=int, default=100_000)
+    parser.add_argument("--assets", type=int, default=1_000)
+    args = parser.parse_args()
+    seconds, pairs = benchmark(args.missions, args.assets)
+    print(f"{args.missions} missions x {args.assets} assets in {seconds * 1000:.1f} ms ({pairs} feasible pairs)")
@@ -0,0 +1,103 @@
+import argparse
+import time
+
+import numpy as np
+
+from patient_batch import PatientBatch
+
+# Triage score -> triage category for a whole batch. The thresholds are
+# compiled once into sorted cut points; np.searchsorted then puts every
+# score in its band, and the result is one int8 code per patient plus the
+# category names (TriageCategories), not a string per patient.
+#
+# Two threshold layouts are understood:
+#
+#   {"triage_score": MockThreshold(0, 100)}
+#       the range is split into four equal bands, lowest scores first:
+#       minor, delayed, immediate, expectant
+#   {"minor": MockThreshold(0, 24), "delayed": MockThreshold(25, 49), ...}
+#       one range per category; a category starts at its min_value
+#
+# A score below the first band falls in the first category and one above the
+# last in the last.
+CATEGORIES = ("minor", "delayed", "immediate", "expectant")
+SCORE_FIELD = "triage_score"
+
+
+class TriageCategories:
+    # Categories of a batch: codes index into labels
+    def __init__(self, codes, labels):
+        self.codes = codes
+        self.labels = tuple(labels)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.labels[self.codes[index]]
+
+    def __iter__(self):
+        labels = self.labels
+        return (labels[code] for code in self.codes.tolist())
+
+    def tolist(self):
+        return list(self)
+
+    def mask(self, label):
+        return self.codes == self.labels.index(label)
+
+    def counts(self):
+        counts = np.bincount(self.codes, minlength=len(self.labels))
+        return dict(zip(self.labels, counts.tolist()))
+
+
+class CategoryEngine:
+    def __init__(self, thresholds, categories=CATEGORIES):
+        # Sorted cut points: cuts[i] is where labels[i + 1] starts
+        named = [(thresholds[label].min_value, label) for label in categories if label in thresholds]
+        if named:
+            named.sort(key=lambda item: item[0])
+            self.labels = tuple(label for _, label in named)
+            self.cuts = np.array([start for start, _ in named[1:]], dtype=np.float64)
+        else:
+            threshold = thresholds[SCORE_FIELD]
+            self.labels = tuple(categories)
+            self.cuts = np.linspace(threshold.min_value, threshold.max_value, len(categories) + 1)[1:-1]
+
+    def assign(self, scores):
+        # TriageCategories for an array of scores
+        scores = np.asarray(scores)
+        codes = np.searchsorted(self.cuts, scores, side="right").astype(np.int8)
+        return TriageCategories(codes, self.labels)
+
+    def categorize(self, patients, field=SCORE_FIELD):
+        # TriageCategories for a PatientBatch or a list of patients with a
+        # triage score each
+        if isinstance(patients, PatientBatch):
+            if field not in patients.columns or not patients.present[field].all():
+                raise AttributeError(f"not every patient has '{field}'")
+            if field not in patients.labels and patients.columns[field].dtype.kind in "biuf":
+                return self.assign(patients.columns[field])
+            return self.assign(patients.values(field))
+        return self.assign(np.array([getattr(patient, field) for patient in patients], dtype=np.float64))
+
+
+def benchmark(patients=10_000_000, seed=0):
+    # Buckets `patients` random scores in [0, 100]; returns seconds
+    class Threshold:
+        def __init__(self, min_value, max_value):
+            self.min_value = min_value
+            self.max_value = max_value
+
+    engine = CategoryEngine({SCORE_FIELD: Threshold(0, 100)})
+    scores = np.random.default_rng(seed).integers(0, 101, size=patients)
+    started = time.perf_counter()
+    engine.assign(scores)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time batch triage categories")
+    parser.add_argument("--patients", type=int, default=10_000_000)
+    args = parser.parse_args()
+    print(f"Categorized {args.patients} patients in {benchmark(args.patients) * 1000:.1f} ms")
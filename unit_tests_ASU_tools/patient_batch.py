@@ -0,0 +1,207 @@
+import argparse
+import sys
+import tracemalloc
+
+import numpy as np
+
+# Struct-of-arrays patients for the ASU tools mocks. A MockPatient is one
+# Python object (and __dict__) per patient; a PatientBatch keeps one array
+# per field instead:
+#
+#   names             int32 codes into name_labels (each name stored once)
+#   columns[field]    int64 / float64 / bool values, or int32 codes into
+#                     labels[field] for text fields such as "category"
+#   present[field]    False where the patient has no such attribute
+#
+# Values that fit none of these (None, mixed ints and floats, ints beyond 64
+# bits, ...) are kept as an object column so a batch always converts back to
+# the same patients. Missing values are stored as False / 0.0 / 0 (-1 for
+# text codes).
+_MISSING = object()
+
+
+def intern(values):
+    # int32 codes and the distinct values in first-seen order
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int32, count=len(values))
+    return codes, list(index)
+
+
+def _column(values, mask):
+    # Typed array (and labels for text) for one field's values; missing
+    # entries get a filler of the field's own type so bools stay bools
+    kinds = {type(value) for value, present in zip(values, mask) if present}
+    filler = False if kinds == {bool} else 0.0 if kinds == {float} else 0
+    filled = [value if present else filler for value, present in zip(values, mask)]
+    array = np.array(filled) if filled else np.zeros(0, dtype=np.int64)
+    kind = array.dtype.kind
+    if kind == "u" or kind == "f" and any(type(value) is not float for value, present in zip(values, mask) if present):
+        kind = "O"  # ints beyond int64, or ints and floats in one field
+    if kind in "biuf" and array.ndim == 1:
+        return array, None
+    present_values = [value for value, present in zip(values, mask) if present]
+    if present_values and all(isinstance(value, str) for value in present_values):
+        codes, labels = intern(present_values)
+        column = np.full(len(values), -1, dtype=np.int32)
+        column[mask] = codes
+        return column, labels
+    column = np.empty(len(values), dtype=object)
+    column[:] = filled
+    return column, None
+
+
+class PatientBatch:
+    def __init__(self, names, name_labels, columns, present, labels=None):
+        self.names_codes = names
+        self.name_labels = name_labels
+        self.columns = columns
+        self.present = present
+        self.labels = labels or {}
+
+    @classmethod
+    def from_patients(cls, patients, fields=None):
+        # Every attribute but the name becomes a field, in first-seen order
+        # (pass `fields` to skip that scan over each patient's __dict__)
+        if fields is None:
+            fields = list(dict.fromkeys(field for patient in patients for field in vars(patient) if field != "name"))
+        names, name_labels = intern([patient.name for patient in patients])
+        columns, present, labels = {}, {}, {}
+        for field in fields:
+            values = [getattr(patient, field, _MISSING) for patient in patients]
+            mask = np.fromiter((value is not _MISSING for value in values), dtype=bool, count=len(values))
+            columns[field], field_labels = _column(values, mask)
+            present[field] = mask
+            if field_labels is not None:
+                labels[field] = field_labels
+        return cls(names, name_labels, columns, present, labels)
+
+    @classmethod
+    def from_columns(cls, names, columns, present=None):
+        # From a list of names and {field: array or list}; `present` gives
+        # the masks of fields some patients lack
+        names, name_labels = intern(list(names))
+        present = dict(present or {})
+        arrays, labels = {}, {}
+        for field, values in columns.items():
+            mask = np.asarray(present.get(field, np.ones(len(names), dtype=bool)), dtype=bool)
+            if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+                arrays[field] = values
+            else:
+                arrays[field], field_labels = _column(list(values), mask)
+                if field_labels is not None:
+                    labels[field] = field_labels
+            present[field] = mask
+        return cls(names, name_labels, arrays, present, labels)
+
+    def __len__(self):
+        return len(self.names_codes)
+
+    @property
+    def fields(self):
+        return list(self.columns)
+
+    def names(self):
+        labels = self.name_labels
+        return [labels[code] for code in self.names_codes.tolist()]
+
+    def values(self, field):
+        # The field as Python values, like reading the attribute of every
+        # patient
+        if field not in self.columns or not self.present[field].all():
+            raise AttributeError(f"not every patient has '{field}'")
+        return self._decode(field, self.columns[field])
+
+    def _decode(self, field, column):
+        if field in self.labels:
+            labels = self.labels[field]
+            return [labels[code] for code in column.tolist()]
+        return column.tolist()
+
+    def matrix(self, fields):
+        # (patients x fields) values, presence mask and which fields hold
+        # floats, for numeric fields; (None, None, None) if a field is an
+        # object column. Fields the batch does not have are all missing.
+        columns, present, floats = [], [], []
+        for field in fields:
+            if field not in self.columns:
+                columns.append(np.zeros(len(self), dtype=np.int64))
+                present.append(np.zeros(len(self), dtype=bool))
+                floats.append(False)
+                continue
+            if field in self.labels:
+                raise TypeError(f"unsupported operand type(s) for +: 'int' and 'str' ({field})")
+            column = self.columns[field]
+            if column.dtype.kind not in "biuf":
+                return None, None, None
+            columns.append(column)
+            present.append(self.present[field])
+            floats.append(column.dtype.kind == "f")
+        if not columns:
+            return np.zeros((len(self), 0), dtype=np.int64), np.zeros((len(self), 0), dtype=bool), np.zeros(0, dtype=bool)
+        dtype = np.float64 if any(floats) else np.int64
+        values = np.empty((len(self), len(columns)), dtype=dtype)
+        for index, column in enumerate(columns):
+            values[:, index] = column
+        return values, np.column_stack(present), np.array(floats)
+
+    def to_patients(self, patient_class):
+        # patient_class(name=..., **fields) for every patient, with only the
+        # fields that patient had
+        names = self.names()
+        fields = [(field, self._decode(field, self.columns[field]), self.present[field].tolist()) for field in self.columns]
+        return [
+            patient_class(name=name, **{field: values[row] for field, values, mask in fields if mask[row]})
+            for row, name in enumerate(names)
+        ]
+
+    def nbytes(self):
+        # Arrays plus the interned names and labels
+        size = self.names_codes.nbytes + sys.getsizeof(self.name_labels)
+        size += sum(sys.getsizeof(name) for name in self.name_labels)
+        for field, column in self.columns.items():
+            size += column.nbytes + self.present[field].nbytes
+            if column.dtype == object:
+                size += sum(sys.getsizeof(value) for value in column)
+            for label in self.labels.get(field, []):
+                size += sys.getsizeof(label)
+        return size
+
+
+class _Patient:
+    # Same shape as the suites' MockPatient
+    def __init__(self, name, **kwargs):
+        self.name = name
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def memory_per_patient(patients=100_000, seed=0):
+    # Bytes per patient held by MockPatient objects and by a PatientBatch of
+    # the same LIFE triage fields, measured with tracemalloc. The name
+    # strings exist before either is built and are not counted.
+    rng = np.random.default_rng(seed)
+    fields = ["external_hemorrhage", "tension_pneumothorax", "traumatic_brain_injury", "burn", "gcs", "sbp", "rr"]
+    data = rng.integers(0, 220, size=(len(fields), patients)).tolist()
+    names = [f"Patient {index}" for index in range(patients)]
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [_Patient(name, **dict(zip(fields, row))) for name, row in zip(names, zip(*data))]
+        object_bytes = tracemalloc.get_traced_memory()[0] - before
+        before = tracemalloc.get_traced_memory()[0]
+        batch = PatientBatch.from_patients(objects, fields)
+        batch_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return {"objects": object_bytes / patients, "batch": batch_bytes / patients}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory per patient: MockPatient objects vs PatientBatch")
+    parser.add_argument("--patients", type=int, default=100_000)
+    args = parser.parse_args()
+    result = memory_per_patient(args.patients)
+    print(f"{args.patients} patients, 7 fields (name strings not counted):")
+    print(f"  MockPatient objects: {result['objects']:.0f} bytes/patient")
+    print(f"  PatientBatch:        {result['batch']:.0f} bytes/patient")
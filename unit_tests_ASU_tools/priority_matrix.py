@@ -0,0 +1,141 @@
+import argparse
+import time
+
+import numpy as np
+
+from category_engine import TriageCategories
+from patient_batch import PatientBatch, intern
+
+# Patient priority matrix without a wrapper object per patient. Patients are
+# put in one bucket queue per category, in treatment order:
+#
+#   immediate, delayed, minor, expectant, other (any other category)
+#
+# BASIC keeps arrival order within a bucket. ADVANCED orders a bucket by
+# triage score, highest first, ties in arrival order. The buckets are a
+# stable sort on a small integer key (the category's rank, and for ADVANCED
+# the score level): NumPy sorts 8 and 16 bit keys with a radix sort, so the
+# matrix is built in linear time. ADVANCED with float scores, or integer
+# scores spanning too many levels for a 16 bit key, falls back to a stable
+# O(n log n) lexsort.
+#
+# The matrix is the patients' indices in priority order plus where each
+# bucket starts; iterating it decodes names and categories in chunks.
+PRIORITY = ("immediate", "delayed", "minor", "expectant")
+BUCKETS = PRIORITY + ("other",)
+MODES = ("BASIC", "ADVANCED")
+CHUNK = 65536
+
+
+class PriorityMatrix:
+    def __init__(self, order, starts, codes, labels, names=None):
+        self.order = order  # patient indices, highest priority first
+        self.starts = starts  # bucket i is order[starts[i]:starts[i + 1]]
+        self.codes = codes
+        self.labels = labels
+        self.names = names  # (name codes, name labels) or None
+
+    def __len__(self):
+        return len(self.order)
+
+    def bucket(self, name):
+        index = BUCKETS.index(name)
+        return self.order[self.starts[index]:self.starts[index + 1]]
+
+    def counts(self):
+        return dict(zip(BUCKETS, np.diff(self.starts).tolist()))
+
+    def chunks(self, size=CHUNK):
+        # Patient indices in priority order, `size` at a time
+        for start in range(0, len(self.order), size):
+            yield self.order[start:start + size]
+
+    def __iter__(self):
+        # (name, category) in priority order; the patient's index stands in
+        # for the name when the matrix was built without names
+        labels = self.labels
+        for chunk in self.chunks():
+            categories = [labels[code] for code in self.codes[chunk].tolist()]
+            if self.names is None:
+                yield from zip(chunk.tolist(), categories)
+            else:
+                name_codes, name_labels = self.names
+                yield from zip((name_labels[code] for code in name_codes[chunk].tolist()), categories)
+
+
+def _categories(patients, field):
+    # (category codes, labels, names) for TriageCategories, a PatientBatch
+    # or a list of patients
+    if isinstance(patients, TriageCategories):
+        return patients.codes, list(patients.labels), None
+    if isinstance(patients, PatientBatch):
+        names = (patients.names_codes, patients.name_labels)
+        if field in patients.labels and patients.present[field].all():
+            return patients.columns[field], patients.labels[field], names
+        codes, labels = intern(patients.values(field))
+        return codes, labels, names
+    codes, labels = intern([getattr(patient, field) for patient in patients])
+    return codes, labels, intern([patient.name for patient in patients])
+
+
+def _scores(patients, scores):
+    if scores is not None:
+        return np.asarray(scores)
+    if isinstance(patients, PatientBatch):
+        return np.asarray(patients.values("triage_score"))
+    if isinstance(patients, TriageCategories):
+        raise ValueError("ADVANCED needs the triage scores of the categories")
+    return np.asarray([patient.triage_score for patient in patients])
+
+
+def _order(ranks, scores):
+    # Stable order by rank, then by score (highest first) if given
+    if scores is None:
+        return np.argsort(ranks, kind="stable")
+    if len(scores) and scores.dtype.kind in "iu":
+        low, high = int(scores.min()), int(scores.max())
+        levels = high - low + 1
+        if levels * len(BUCKETS) <= np.iinfo(np.int16).max:
+            key = ranks.astype(np.int16) * levels + (high - scores).astype(np.int16)
+            return np.argsort(key, kind="stable")
+    return np.lexsort((-scores, ranks))
+
+
+def build(patients, mode="BASIC", scores=None, field="category"):
+    # PriorityMatrix for TriageCategories, a PatientBatch or a list of
+    # patients; ADVANCED takes the scores from `scores` or the patients'
+    # triage_score
+    if mode not in MODES:
+        raise ValueError(f"Unknown priority matrix mode {mode!r}; use one of {', '.join(MODES)}")
+    codes, labels, names = _categories(patients, field)
+    rank_of = np.array(
+        [PRIORITY.index(label) if label in PRIORITY else len(PRIORITY) for label in labels] or [0], dtype=np.int8
+    )
+    ranks = rank_of[codes]
+    if mode == "ADVANCED":
+        scores = _scores(patients, scores)
+        if len(scores) != len(ranks):
+            raise ValueError(f"{len(scores)} scores for {len(ranks)} patients")
+    else:
+        scores = None
+    starts = np.concatenate(([0], np.cumsum(np.bincount(ranks, minlength=len(BUCKETS)))))
+    return PriorityMatrix(_order(ranks, scores), starts, codes, labels, names)
+
+
+def benchmark(patients=10_000_000, mode="BASIC", seed=0):
+    # Builds the matrix for `patients` random categories (and scores 0-100);
+    # returns seconds
+    rng = np.random.default_rng(seed)
+    categories = TriageCategories(rng.integers(0, len(PRIORITY), size=patients).astype(np.int8), PRIORITY)
+    scores = rng.integers(0, 101, size=patients)
+    started = time.perf_counter()
+    build(categories, mode, scores)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the priority matrix")
+    parser.add_argument("--patients", type=int, default=10_000_000)
+    parser.add_argument("--mode", choices=MODES, default="BASIC")
+    args = parser.parse_args()
+    print(f"Built the {args.mode} matrix for {args.patients} patients in {benchmark(args.patients, args.mode) * 1000:.1f} ms")
@@ -1,10 +1,14 @@
 import unittest
-from datetime import datetime
 import os
-import csv
+import random
 import sys
 from typing import List
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import config, sink
+from harness.collector import CollectingTestRunner
+from capability_matcher import CapabilityMatcher, benchmark, compatible
+
 class MissionRequirements:
     def __init__(self, name, medevac_needed, evac_needed, resupply_needed, require_vtol, require_ctol, require_ground_vehicle,
                  litters_spaces_required, ambulatory_spaces_required, weather_condition, day_mission, night_mission, require_iv_provisions,
@@ -907,94 +911,93 @@ class TestAssetAdditional11(unittest.TestCase):
         self.assertIn('medic_2', asset.crew)
         self.assertEqual(asset.litter_capacity, 4)
 
-class CustomTestResult(unittest.TextTestResult):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.test_timings = {}
-        self.test_results = {}
-
-    def addSuccess(self, test):
-        super().addSuccess(test)
-        self.test_results[test.id().split(".")[-1]] = "pass"
-
-    def addFailure(self, test, err):
-        super().addFailure(test, err)
-        self.test_results[test.id().split(".")[-1]] = "fail"
-
-    def addError(self, test, err):
-        super().addError(test, err)
-        self.test_results[test.id().split(".")[-1]] = "error"
-
-    def startTest(self, test):
-        super().startTest(test)
-        self.test_timings[test.id().split(".")[-1]] = {
-            "start_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-
-    def stopTest(self, test):
-        super().stopTest(test)
-        test_id = test.id().split(".")[-1]
-        start_time = datetime.strptime(self.test_timings[test_id]["start_time"], "%Y-%m-%d %H:%M:%S")
-        end_time = datetime.now()
-        duration = end_time - start_time
-        self.test_timings[test_id]["duration_seconds"] = duration.total_seconds()
-
-class CustomTestRunner(unittest.TextTestRunner):
-    def _makeResult(self):
-        return CustomTestResult(self.stream, self.descriptions, self.verbosity)
-
-def generate_csv_report(test_timings, test_results):
-    filename = "testing_report_mission_options_asserts.csv"
-    fieldnames = ["Test Case Name", "Start Date", "Start Time", "Duration (seconds)", "Status"]
-
-    existing_tests = set()
-
-    # Read existing test case names from the CSV file
-    if os.path.isfile(filename):
-        with open(filename, mode="r", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                existing_tests.add(row["Test Case Name"])
-
-    with open(filename, mode="a", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-        # Write header only if file is empty
-        if not os.path.isfile(filename) or os.stat(filename).st_size == 0:
-            writer.writeheader()
-
-        for test_name, timing in test_timings.items():
-            if test_name not in existing_tests:  # Check if test case already exists
-                status = test_results.get(test_name, "unknown")
-                
-                # Splitting timestamp into date and time
-                start_date, start_time = timing["start_time"].split()
-
-                writer.writerow({
-                    "Test Case Name": test_name,
-                    "Start Date": start_date,
-                    "Start Time": start_time,
-                    "Duration (seconds)": timing["duration_seconds"],
-                    "Status": status
-                })
-                existing_tests.add(test_name)  # Add to set to prevent duplicates
+class TestCapabilityMatcher(unittest.TestCase):
+
+    def random_mission(self, rng, index, max_spaces=6):
+        flags = {name: rng.random() < 0.3 for name in (
+            'medevac_needed', 'evac_needed', 'resupply_needed', 'require_vtol', 'require_ctol', 'require_ground_vehicle',
+            'day_mission', 'night_mission', 'require_iv_provisions', 'require_medical_monitoring_system',
+            'require_life_support_equipment', 'require_oxygen_generation_system', 'require_patient_litter_lift_system')}
+        return MissionRequirements(
+            name=f'Mission {index}',
+            litters_spaces_required=rng.randint(0, max_spaces),
+            ambulatory_spaces_required=rng.randint(0, max_spaces),
+            weather_condition=rng.choice(['clear', 'clear', 'rainy', 'extreme']),
+            **flags
+        )
+
+    def random_asset(self, rng, index, max_capacity=8):
+        flags = {name: rng.random() < 0.7 for name in (
+            'operational_day', 'operational_night', 'operational_adverse_weather', 'has_iv_provisions',
+            'has_medical_monitoring_system', 'has_life_support_equipment', 'has_oxygen_generation_system',
+            'has_patient_litter_lift_system')}
+        return Asset(
+            asset_name=f'Asset {index}',
+            asset_type=rng.choice(['vtol', 'ctol', 'ground']),
+            asset_status=rng.choice(['available', 'available', 'maintenance', 'unavailable']),
+            asset_mission_type=rng.choice(['medevac', 'evac', 'resupply', 'unknown']),
+            crew=['pilot', 'medic_1'],
+            litter_capacity=rng.randint(0, max_capacity),
+            ambulatory_capacity=rng.randint(0, max_capacity),
+            **flags
+        )
+
+    def assert_matches_field_by_field(self, missions, assets):
+        matcher = CapabilityMatcher.from_objects(missions, assets)
+        feasible = matcher.feasibility()
+        self.assertEqual(feasible.shape, (len(missions), len(assets)))
+        expected = [[compatible(mission, asset) for asset in assets] for mission in missions]
+        self.assertEqual(feasible.tolist(), expected)
+        for index in range(len(missions)):
+            self.assertEqual(matcher.feasible_assets(index).tolist(), [i for i, fits in enumerate(expected[index]) if fits])
+        return matcher, feasible
+
+    def test_matches_field_by_field(self):
+        rng = random.Random(7)
+        missions = [self.random_mission(rng, index) for index in range(300)]
+        assets = [self.random_asset(rng, index) for index in range(60)]
+        matcher, feasible = self.assert_matches_field_by_field(missions, assets)
+        self.assertEqual(matcher.compared, [])  # capacities packed into the masks
+        self.assertTrue(feasible.any())
+
+    def test_capacity_compared_when_too_many_levels(self):
+        rng = random.Random(11)
+        missions = [self.random_mission(rng, index, max_spaces=120) for index in range(200)]
+        assets = [self.random_asset(rng, index, max_capacity=120) for index in range(40)]
+        matcher, _ = self.assert_matches_field_by_field(missions, assets)
+        self.assertEqual(len(matcher.compared), 2)
+
+    def test_capacity_thresholds(self):
+        mission = MissionRequirements(
+            name='Capacity Mission', medevac_needed=True, evac_needed=False, resupply_needed=False, require_vtol=True,
+            require_ctol=False, require_ground_vehicle=False, litters_spaces_required=4, ambulatory_spaces_required=2,
+            weather_condition='clear', day_mission=True, night_mission=False, require_iv_provisions=True,
+            require_medical_monitoring_system=False, require_life_support_equipment=False,
+            require_oxygen_generation_system=False, require_patient_litter_lift_system=False
+        )
+        assets = [
+            Asset(asset_name=f'Black hawk {litters}', asset_type='vtol', asset_status='available', asset_mission_type='medevac',
+                  crew=['pilot'], litter_capacity=litters, ambulatory_capacity=ambulatory, operational_day=True,
+                  operational_night=False, operational_adverse_weather=False, has_iv_provisions=True,
+                  has_medical_monitoring_system=False, has_life_support_equipment=False,
+                  has_oxygen_generation_system=False, has_patient_litter_lift_system=False)
+            for litters, ambulatory in [(3, 6), (4, 2), (6, 1), (24, 24), (-1, 0)]
+        ]
+        matcher = CapabilityMatcher.from_objects([mission], assets)
+        self.assertEqual(matcher.feasible_assets(0).tolist(), [1, 3])
+        self.assertEqual(CapabilityMatcher.from_objects([], assets).feasibility().shape, (0, 5))
+
+    @unittest.skipUnless(config.BENCHMARKS, "timed benchmark, set HARNESS_BENCHMARKS=1")
+    def test_one_hundred_thousand_missions(self):
+        seconds, pairs = benchmark(missions=100_000, assets=1_000)
+        self.assertLess(seconds, 5.0)
+        self.assertGreater(pairs, 0)
+
+def write_report(collector):
+    sink.write_report(collector, "mission_options_asserts", "testing_report_mission_options_asserts.csv")
+
 
 if __name__ == "__main__":
-    # Run tests and get the results
     suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
-    runner = CustomTestRunner()
-    result = runner.run(suite)
-    
-    # Generate CSV report with test timings and results
-    generate_csv_report(result.test_timings, result.test_results)
-
-
-
-
-
-
-
-
-
-
-
+    result = CollectingTestRunner().run(suite)
+    write_report(result.collector)
@@ -1,10 +1,12 @@
 import unittest
-from datetime import datetime
 import os
-import csv
 import sys
 from typing import List
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import sink
+from harness.collector import CollectingTestRunner
+
 # Example classes (replace with your actual classes)
 class MissionRequirements:
     def __init__(self, name: str, required_medical_services: List[str], required_medical_specialities: List[str], required_medical_supplies: List[str]):
@@ -124,84 +126,11 @@ class TestCareFacility(unittest.TestCase):
         self.assertIn('orthopedic_surgery', cf.available_medical_specialities)
         self.assertEqual(len(cf.available_medical_supplies), 0)
 
-class CustomTestResult(unittest.TextTestResult):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.test_timings = {}
-        self.test_results = {}
-
-    def addSuccess(self, test):
-        super().addSuccess(test)
-        self.test_results[test.id().split(".")[-1]] = "pass"
-
-    def addFailure(self, test, err):
-        super().addFailure(test, err)
-        self.test_results[test.id().split(".")[-1]] = "fail"
-
-    def addError(self, test, err):
-        super().addError(test, err)
-        self.test_results[test.id().split(".")[-1]] = "error"
-
-    def startTest(self, test):
-        super().startTest(test)
-        self.test_timings[test.id().split(".")[-1]] = {
-            "start_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-
-    def stopTest(self, test):
-        super().stopTest(test)
-        test_id = test.id().split(".")[-1]
-        start_time = datetime.strptime(self.test_timings[test_id]["start_time"], "%Y-%m-%d %H:%M:%S")
-        end_time = datetime.now()
-        duration = end_time - start_time
-        self.test_timings[test_id]["duration_seconds"] = duration.total_seconds()
-
-class CustomTestRunner(unittest.TextTestRunner):
-    def _makeResult(self):
-        return CustomTestResult(self.stream, self.descriptions, self.verbosity)
-
-def generate_csv_report(test_timings, test_results):
-    filename = "testing_report_mission_options_cf.csv"
-    fieldnames = ["Test Case Name", "Start Date", "Start Time", "Duration (seconds)", "Status"]
-
-    existing_tests = set()
-
-    # Read existing test case names from the CSV file
-    if os.path.isfile(filename):
-        with open(filename, mode="r", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                existing_tests.add(row["Test Case Name"])
-
-    with open(filename, mode="a", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-        # Write header only if file is empty
-        if not os.path.isfile(filename) or os.stat(filename).st_size == 0:
-            writer.writeheader()
-
-        for test_name, timing in test_timings.items():
-            if test_name not in existing_tests:  # Check if test case already exists
-                status = test_results.get(test_name, "unknown")
-                
-                # Splitting timestamp into date and time
-                start_date, start_time = timing["start_time"].split()
-
-                writer.writerow({
-                    "Test Case Name": test_name,
-                    "Start Date": start_date,
-                    "Start Time": start_time,
-                    "Duration (seconds)": timing["duration_seconds"],
-                    "Status": status
-                })
-                existing_tests.add(test_name)  # Add to set to prevent duplicates
+def write_report(collector):
+    sink.write_report(collector, "mission_options_cf", "testing_report_mission_options_cf.csv")
+
 
 if __name__ == "__main__":
-    # Run tests and get the results
     suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
-    runner = CustomTestRunner()
-    result = runner.run(suite)
-    
-    # Generate CSV report with test timings and results
-    generate_csv_report(result.test_timings, result.test_results)
-
+    result = CollectingTestRunner().run(suite)
+    write_report(result.collector)
@@ -1,7 +1,16 @@
 import unittest
-import csv
 import os
-from datetime import datetime
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import config, sink
+from harness.collector import CollectingTestRunner
+import priority_matrix
+from category_engine import TriageCategories
+from patient_batch import PatientBatch
 
 # Mock classes and functions
 
@@ -11,14 +20,24 @@ class MockPatient:
         self.category = category
 
 class MockTriagecategoryToPatientMatrixAlgo:
+    def __init__(self, mode="BASIC"):
+        self.mode = mode
+
+    def build_priority_matrix(self, patients, scores=None):
+        # Bucket queues per category (priority_matrix.py), iterated lazily
+        return priority_matrix.build(patients, self.mode, scores)
+
     def return_patient_priority_matrix(self, patients):
         # Mock implementation: returns a simple transformation of the input
+        if isinstance(patients, PatientBatch):
+            categories = zip(patients.names(), patients.values("category"))
+            return [MockMatrixPatient(name, f"Priority for {category}") for name, category in categories]
         return [MockMatrixPatient(patient.name, f"Priority for {patient.category}") for patient in patients]
 
 class MockTriagecategoryToPatientmatrixFactory:
     @staticmethod
     def create_triageCategory_to_patientMatrix_algo(mode):
-        return MockTriagecategoryToPatientMatrixAlgo()
+        return MockTriagecategoryToPatientMatrixAlgo(mode)
 
 class MockMatrixPatient:
     def __init__(self, patient_name, priority_details):
@@ -31,21 +50,8 @@ class MockMatrixPatient:
 # Unit test case
 class TestPatientPriorityMatrix(unittest.TestCase):
 
-    test_timings = {}
-    test_results = {}  # Dictionary to store test results
-        
-
-    def tearDown(self):
-        duration = datetime.now() - self.start_time
-        test_name = self.id().split(".")[-1]
-        self.test_timings[test_name] = {
-            "start_time": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "duration_seconds": duration.total_seconds(),
-        }
-
     def setUp(self):
         # Setting up patients
-        self.start_time = datetime.now()
         self.patient1_cat = MockPatient(name='Adrian Monk', category='immediate')
         self.patient2_cat = MockPatient(name='Natalie Tieger', category='immediate')
         self.patient3_cat = MockPatient(name='Leland Stottlemeyer', category='immediate')
@@ -818,66 +824,82 @@ class TestPatientPriorityMatrix(unittest.TestCase):
         self.assertEqual(matrix_all_patients[0].priority_details, 'Priority for immediate')
         self.assertEqual(matrix_all_patients[0].patient_name, 'Patient with ñôn-ÃSCÏÏ Çhárãçtérs')
 
+    def test_patient_batch(self):
+        print("")
+        print("ALGO :: Patients as a PatientBatch")
+        batch = PatientBatch.from_patients(self.all_patients_cat * 100)
+        self.assertEqual(batch.labels['category'], ['immediate', 'expectant', 'delayed', 'minor'])
+        self.assertEqual(len(batch.name_labels), 10)
 
-class CustomTestResult(unittest.TextTestResult):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.test_results = {}
-
-    def addSuccess(self, test):
-        super().addSuccess(test)
-        self.test_results[test.id().split(".")[-1]] = "pass"
-
-    def addFailure(self, test, err):
-        super().addFailure(test, err)
-        self.test_results[test.id().split(".")[-1]] = "fail"
+        algo_patient_matrix = MockTriagecategoryToPatientmatrixFactory.create_triageCategory_to_patientMatrix_algo(mode="BASIC")
+        matrix_batch = algo_patient_matrix.return_patient_priority_matrix(batch)
+        matrix_objects = algo_patient_matrix.return_patient_priority_matrix(self.all_patients_cat * 100)
+        self.assertEqual([(p.patient_name, p.priority_details) for p in matrix_batch],
+                         [(p.patient_name, p.priority_details) for p in matrix_objects])
 
-    def addError(self, test, err):
-        super().addError(test, err)
-        self.test_results[test.id().split(".")[-1]] = "error"
+        odd_patients = [MockPatient(name=None, category=None), MockPatient(name=7, category=3)]
+        matrix_odd = algo_patient_matrix.return_patient_priority_matrix(PatientBatch.from_patients(odd_patients))
+        self.assertEqual([(p.patient_name, p.priority_details) for p in matrix_odd],
+                         [(None, 'Priority for None'), (7, 'Priority for 3')])
 
-class CustomTestRunner(unittest.TextTestRunner):
-    def _makeResult(self):
-        return CustomTestResult(self.stream, self.descriptions, self.verbosity)
+    def test_basic_priority_matrix(self):
+        print("")
+        print("ALGO :: BASIC priority matrix")
+        patients = self.all_patients_cat + [MockPatient(name='Unknown Patient', category='unknown')]
+        algo_patient_matrix = MockTriagecategoryToPatientmatrixFactory.create_triageCategory_to_patientMatrix_algo(mode="BASIC")
+        for matrix in (algo_patient_matrix.build_priority_matrix(patients),
+                       algo_patient_matrix.build_priority_matrix(PatientBatch.from_patients(patients))):
+            self.assertEqual(list(matrix), [
+                ('Adrian Monk', 'immediate'), ('Natalie Tieger', 'immediate'), ('Leland Stottlemeyer', 'immediate'),
+                ('Trudy Monk', 'immediate'), ('Sharona Fleming', 'delayed'), ('Julie Trieger', 'delayed'),
+                ('Benjy Fleming', 'delayed'), ('Charles Kroger', 'minor'), ('Jake Peralta', 'expectant'),
+                ('Randy Disher', 'expectant'), ('Unknown Patient', 'unknown'),
+            ])
+            self.assertEqual(matrix.counts(), {'immediate': 4, 'delayed': 3, 'minor': 1, 'expectant': 2, 'other': 1})
+            self.assertEqual(matrix.bucket('expectant').tolist(), [3, 5])
+        self.assertEqual(list(algo_patient_matrix.build_priority_matrix([])), [])
 
-def generate_csv_report(test_timings, test_results):
-    filename = "testing_report_patient_priority_matrix.csv"
-    fieldnames = ["Test Case Name", "Start Date", "Start Time", "Duration (seconds)", "Status"]
+    def test_advanced_priority_matrix(self):
+        print("")
+        print("ALGO :: ADVANCED priority matrix")
+        scores = [30, 80, 30, 10, 50, 90, 95, 5, 50, 60]
+        algo_patient_matrix = MockTriagecategoryToPatientmatrixFactory.create_triageCategory_to_patientMatrix_algo(mode="ADVANCED")
+        matrix = algo_patient_matrix.build_priority_matrix(self.all_patients_cat, scores)
+        expected = [6, 1, 0, 2, 9, 4, 8, 7, 5, 3]  # by category, then highest score, ties in arrival order
+        self.assertEqual(np.concatenate(list(matrix.chunks(3))).tolist(), expected)
 
-    existing_tests = set()
+        float_matrix = algo_patient_matrix.build_priority_matrix(self.all_patients_cat, [score + 0.5 for score in scores])
+        self.assertEqual(float_matrix.order.tolist(), expected)
+        wide_matrix = algo_patient_matrix.build_priority_matrix(self.all_patients_cat, [score * 10_000 for score in scores])
+        self.assertEqual(wide_matrix.order.tolist(), expected)
 
-    # Read existing test case names from the CSV file
-    if os.path.isfile(filename):
-        with open(filename, mode="r", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                existing_tests.add(row["Test Case Name"])
+        with self.assertRaises(ValueError):
+            algo_patient_matrix.build_priority_matrix(self.all_patients_cat, scores[:-1])
+        with self.assertRaises(ValueError):
+            MockTriagecategoryToPatientmatrixFactory.create_triageCategory_to_patientMatrix_algo(mode="EXPERT").build_priority_matrix(self.all_patients_cat)
 
-    with open(filename, mode="a", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
+    @unittest.skipUnless(config.BENCHMARKS, "timed benchmark, set HARNESS_BENCHMARKS=1")
+    def test_ten_million_casualties(self):
+        print("")
+        print("ALGO :: Ten million casualties")
+        codes = np.tile(np.array([2, 0, 3, 1], dtype=np.int8), 2_500_000)  # immediate, minor, expectant, delayed
+        categories = TriageCategories(codes, ('minor', 'delayed', 'immediate', 'expectant'))
+        algo_patient_matrix = MockTriagecategoryToPatientmatrixFactory.create_triageCategory_to_patientMatrix_algo(mode="BASIC")
+        started = time.perf_counter()
+        matrix = algo_patient_matrix.build_priority_matrix(categories)
+        self.assertLess(time.perf_counter() - started, 5.0)
+        self.assertEqual(len(matrix), 10_000_000)
+        self.assertEqual(matrix.counts()['immediate'], 2_500_000)
+        self.assertEqual(matrix.bucket('delayed')[:3].tolist(), [3, 7, 11])
+        first = next(iter(matrix))
+        self.assertEqual(first, (0, 'immediate'))
 
-        # Write header only if file is empty
-        if not os.path.isfile(filename) or os.stat(filename).st_size == 0:
-            writer.writeheader()
 
-        for test_name, timing in test_timings.items():
-            if test_name not in existing_tests:  # Check if test case already exists
-                status = test_results.get(test_name, "unknown")
-                
-                # Splitting timestamp into date and time
-                start_date, start_time = timing["start_time"].split()
+def write_report(collector):
+    sink.write_report(collector, "asu_patient_prior", "testing_report_patient_priority_matrix.csv")
 
-                writer.writerow({
-                    "Test Case Name": test_name,
-                    "Start Date": start_date,
-                    "Start Time": start_time,
-                    "Duration (seconds)": timing["duration_seconds"],
-                    "Status": status
-                })
-                existing_tests.add(test_name)  # Add to set to prevent duplicates
 
 if __name__ == "__main__":
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPatientPriorityMatrix)
-    runner = CustomTestRunner()
-    result = runner.run(suite)
-    generate_csv_report(TestPatientPriorityMatrix.test_timings, result.test_results)
\ No newline at end of file
+    result = CollectingTestRunner().run(suite)
+    write_report(result.collector)
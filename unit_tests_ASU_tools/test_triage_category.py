@@ -1,7 +1,15 @@
 import unittest
 import os
-import csv
-from datetime import datetime
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import config, sink
+from harness.collector import CollectingTestRunner
+from category_engine import CategoryEngine
+from patient_batch import PatientBatch
 
 # Mock classes and functions
 class MockThreshold:
@@ -25,9 +33,20 @@ class MockTriageCategoryPatient:
 class MockTriagescoreToTriagecategoryAlgo:
     def __init__(self, thresholds):
         self.thresholds = thresholds
+        self.engine = None
+
+    def categorize(self, patients):
+        # Categories for the whole batch as one TriageCategories array
+        # (category_engine.py); the cut points are compiled on first use
+        if self.engine is None:
+            self.engine = CategoryEngine(self.thresholds)
+        return self.engine.categorize(patients)
 
     def return_triage_categories(self, patients):
         # Mock implementation: returns a simple transformation of the input
+        if isinstance(patients, PatientBatch):
+            scores = zip(patients.names(), patients.values("triage_score"))
+            return [MockTriageCategoryPatient(name, f"Category for score {score}") for name, score in scores]
         return [MockTriageCategoryPatient(patient.name, f"Category for score {patient.triage_score}") for patient in patients]
 
 class MockTriagescoreToTriagecategoryFactory:
@@ -37,21 +56,7 @@ class MockTriagescoreToTriagecategoryFactory:
 
 # Unit test case
 class TestTriageScoreToTriageCategory(unittest.TestCase):
-    test_timings = {}
-    test_results = {}  # Dictionary to store test results
-        
-
-    def tearDown(self):
-        duration = datetime.now() - self.start_time
-        test_name = self.id().split(".")[-1]
-        self.test_timings[test_name] = {
-            "start_time": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "duration_seconds": duration.total_seconds(),
-        }
-        
-
     def setUp(self):
-        self.start_time = datetime.now()
         # Setting up thresholds and patients
         self.thresholds_data = {
             'triage_score': MockThreshold(min_value=0, max_value=100)
@@ -819,65 +824,65 @@ class TestTriageScoreToTriageCategory(unittest.TestCase):
         self.assertEqual(triage_categories_mixed_types[0].triage_category, 'Category for score 50')
         self.assertEqual(triage_categories_mixed_types[1].triage_category, 'Category for score 50.5')
 
-class CustomTestResult(unittest.TextTestResult):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.test_results = {}
-
-    def addSuccess(self, test):
-        super().addSuccess(test)
-        self.test_results[test.id().split(".")[-1]] = "pass"
-
-    def addFailure(self, test, err):
-        super().addFailure(test, err)
-        self.test_results[test.id().split(".")[-1]] = "fail"
-
-    def addError(self, test, err):
-        super().addError(test, err)
-        self.test_results[test.id().split(".")[-1]] = "error"
-
-class CustomTestRunner(unittest.TextTestRunner):
-    def _makeResult(self):
-        return CustomTestResult(self.stream, self.descriptions, self.verbosity)
-
-def generate_csv_report(test_timings, test_results):
-    filename = "testing_report_triage_category.csv"
-    fieldnames = ["Test Case Name", "Start Date", "Start Time", "Duration (seconds)", "Status"]
-
-    existing_tests = set()
-
-    # Read existing test case names from the CSV file
-    if os.path.isfile(filename):
-        with open(filename, mode="r", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                existing_tests.add(row["Test Case Name"])
-
-    with open(filename, mode="a", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-        # Write header only if file is empty
-        if not os.path.isfile(filename) or os.stat(filename).st_size == 0:
-            writer.writeheader()
-
-        for test_name, timing in test_timings.items():
-            if test_name not in existing_tests:  # Check if test case already exists
-                status = test_results.get(test_name, "unknown")
-                
-                # Splitting timestamp into date and time
-                start_date, start_time = timing["start_time"].split()
-
-                writer.writerow({
-                    "Test Case Name": test_name,
-                    "Start Date": start_date,
-                    "Start Time": start_time,
-                    "Duration (seconds)": timing["duration_seconds"],
-                    "Status": status
-                })
-                existing_tests.add(test_name)  # Add to set to prevent duplicates
+    def test_patient_batch(self):
+        # A PatientBatch gets the same categories as the patient objects
+        patients = self.all_patients + [MockPatient(name='Patient Float', triage_score=50.5)]
+        algo = MockTriagescoreToTriagecategoryFactory.create_triageScore_to_triageCategory_algo(mode="BASIC", thresholds=self.thresholds_data)
+        for batch in (PatientBatch.from_patients(self.all_patients), PatientBatch.from_patients(patients)):
+            expected = algo.return_triage_categories(batch.to_patients(MockPatient))
+            triage_categories_batch = algo.return_triage_categories(batch)
+            self.assertEqual([(p.patient_name, p.triage_category) for p in triage_categories_batch],
+                             [(p.patient_name, p.triage_category) for p in expected])
+        self.assertEqual(triage_categories_batch[-1].triage_category, 'Category for score 50.5')
+
+    def test_categorize(self):
+        # Four equal bands of the triage_score range, lowest scores first
+        algo = MockTriagescoreToTriagecategoryFactory.create_triageScore_to_triageCategory_algo(mode="BASIC", thresholds=self.thresholds_data)
+        categories = algo.categorize(self.all_patients)
+        self.assertEqual(categories.tolist(), ['delayed', 'delayed', 'delayed', 'minor', 'expectant',
+                                               'minor', 'delayed', 'expectant', 'expectant', 'expectant'])
+        self.assertEqual(categories.codes.dtype, np.int8)
+        self.assertEqual(categories.counts(), {'minor': 2, 'delayed': 4, 'immediate': 0, 'expectant': 4})
+        self.assertEqual(categories.mask('minor').nonzero()[0].tolist(), [3, 5])
+
+        edges = [MockPatient(name=f'Patient {score}', triage_score=score) for score in (-10, 0, 24.9, 25, 50, 75, 100, 1000)]
+        self.assertEqual(algo.categorize(PatientBatch.from_patients(edges)).tolist(),
+                         ['minor', 'minor', 'minor', 'delayed', 'immediate', 'expectant', 'expectant', 'expectant'])
+        self.assertEqual(len(algo.categorize([])), 0)
+
+    def test_categorize_named_ranges(self):
+        # One range per category; a category starts at its min_value
+        thresholds = {
+            'expectant': MockThreshold(min_value=90, max_value=100),
+            'minor': MockThreshold(min_value=0, max_value=39),
+            'immediate': MockThreshold(min_value=60, max_value=89),
+            'delayed': MockThreshold(min_value=40, max_value=59),
+        }
+        algo = MockTriagescoreToTriagecategoryFactory.create_triageScore_to_triageCategory_algo(mode="BASIC", thresholds=thresholds)
+        categories = algo.categorize(self.all_patients)
+        self.assertEqual(categories[0], 'minor')
+        self.assertEqual(categories[2], 'delayed')
+        self.assertEqual(categories[7], 'expectant')
+        self.assertEqual(categories[8], 'immediate')
+        with self.assertRaises(KeyError):
+            MockTriagescoreToTriagecategoryFactory.create_triageScore_to_triageCategory_algo(mode="BASIC", thresholds={}).categorize(self.all_patients)
+
+    @unittest.skipUnless(config.BENCHMARKS, "timed benchmark, set HARNESS_BENCHMARKS=1")
+    def test_categorize_ten_million_scores(self):
+        # Bucketing ten million scores is a single searchsorted
+        engine = CategoryEngine(self.thresholds_data)
+        scores = np.arange(10_000_000) % 101
+        started = time.perf_counter()
+        categories = engine.assign(scores)
+        self.assertLess(time.perf_counter() - started, 2.0)
+        self.assertEqual(categories.codes.nbytes, 10_000_000)
+        self.assertEqual(categories.counts()['expectant'], int((scores >= 75).sum()))
+
+def write_report(collector):
+    sink.write_report(collector, "triage_category", "testing_report_triage_category.csv")
+
 
 if __name__ == "__main__":
     suite = unittest.TestLoader().loadTestsFromTestCase(TestTriageScoreToTriageCategory)
-    runner = CustomTestRunner()
-    result = runner.run(suite)
-    generate_csv_report(TestTriageScoreToTriageCategory.test_timings, result.test_results)
\ No newline at end of file
+    result = CollectingTestRunner().run(suite)
+    write_report(result.collector)
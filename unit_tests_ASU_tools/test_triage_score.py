@@ -1,7 +1,15 @@
 import unittest
 import os
-import csv
-from datetime import datetime
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import config, sink
+from harness.collector import CollectingTestRunner
+from patient_batch import PatientBatch
+from triage_engine import TriageEngine
 
 # Mock classes and functions
 
@@ -19,10 +27,17 @@ class MockPatient:
 
 
 class MockTriageAlgo:
-    def __init__(self, thresholds):
+    def __init__(self, thresholds, normalize=False):
         self.thresholds = thresholds
+        self.engine = TriageEngine(thresholds, normalize)
 
     def triage(self, patients):
+        # Scores the whole batch at once (triage_engine.py)
+        scores = self.engine.scores(patients).tolist()
+        names = patients.names() if isinstance(patients, PatientBatch) else [patient.name for patient in patients]
+        return [MockTriageScore(name, score) for name, score in zip(names, scores)]
+
+    def triage_per_patient(self, patients):
         # Mock implementation: returns a simple transformation of the input
         return [
             MockTriageScore(
@@ -35,8 +50,8 @@ class MockTriageAlgo:
 
 class MockTriageFactory:
     @staticmethod
-    def create_triage_algo(algo_name, thresholds):
-        return MockTriageAlgo(thresholds)
+    def create_triage_algo(algo_name, thresholds, normalize=False):
+        return MockTriageAlgo(thresholds, normalize)
 
 
 class MockTriageScore:
@@ -50,20 +65,7 @@ class MockTriageScore:
 
 # Unit test case
 class TestPatientTriage(unittest.TestCase):
-    test_timings = {}
-    test_results = {}  # Dictionary to store test results
-        
-
-    def tearDown(self):
-        duration = datetime.now() - self.start_time
-        test_name = self.id().split(".")[-1]
-        self.test_timings[test_name] = {
-            "start_time": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "duration_seconds": duration.total_seconds(),
-        }
-
     def setUp(self):
-        self.start_time = datetime.now()
         # Setting up thresholds and patients
         self.thresholds_data_algo3 = {
             "external_hemorrhage": MockThreshold(min_value=1, max_value=6),
@@ -639,67 +641,109 @@ class TestPatientTriage(unittest.TestCase):
         self.assertEqual(triage_scores[1].score, 150)
         self.assertEqual(triage_scores[2].score, 110)
 
+    def test_batch_matches_per_patient(self):
+        # The batch scores equal the per-patient sums, ints and floats alike
+        triage_life_algo = MockTriageFactory.create_triage_algo(
+            algo_name="LIFE", thresholds=self.thresholds_data_algo3
+        )
+        vectorized = self.all_patients + [
+            MockPatient(name="Bool Patient", gcs=True, burn=2),
+            MockPatient(name="Missing Patient"),
+        ]
+        fallback = vectorized + [
+            MockPatient(name="Float Patient", gcs=10.5, sbp=80, rr=30.25),
+            MockPatient(name="Big Patient", gcs=2**70, sbp=1),
+        ]
+        # int64 columns whose sum could overflow, and ints too large for a
+        # float matrix next to a float field
+        overflow = vectorized + [MockPatient(name="Overflow Patient", gcs=2**62, sbp=2**62)]
+        inexact = [MockPatient(name="Large Patient", gcs=2**53 + 1, rr=1), MockPatient(name="Float Patient", burn=0.5)]
+        self.assertIsNotNone(triage_life_algo.engine.values(vectorized)[0])
+        self.assertIsNone(triage_life_algo.engine.values(fallback)[0])
+        self.assertEqual(triage_life_algo.triage(overflow)[-1].score, 2**63)
+        self.assertEqual(triage_life_algo.triage(inexact)[0].score, 2**53 + 2)
+        for group in (vectorized, fallback, overflow, inexact):
+            single = triage_life_algo.triage_per_patient(group)
+            for batch in (triage_life_algo.triage(group), triage_life_algo.triage(PatientBatch.from_patients(group))):
+                self.assertEqual([score.patient_name for score in batch], [score.patient_name for score in single])
+                self.assertEqual([score.score for score in batch], [score.score for score in single])
+                self.assertEqual([type(score.score) for score in batch], [type(score.score) for score in single])
+
+        # Int and float fields in one batch: only the patients with a float
+        # field get a float score
+        mixed = [
+            MockPatient(name="Patient 1", gcs=10, burn=1.5),
+            MockPatient(name="Patient 2", gcs=10),
+            MockPatient(name="Patient 3", burn=0.25, rr=3),
+        ]
+        self.assertIsNotNone(triage_life_algo.engine.values(mixed)[0])
+        triage_scores = triage_life_algo.triage(mixed)
+        self.assertEqual(
+            [(score.score, type(score.score)) for score in triage_scores],
+            [(score.score, type(score.score)) for score in triage_life_algo.triage_per_patient(mixed)],
+        )
+        self.assertEqual([type(score.score) for score in triage_scores], [float, int, float])
+
+    def test_patient_batch_round_trip(self):
+        # A PatientBatch converts back to the same patients
+        patients = self.all_patients + [
+            MockPatient(name="Mixed Patient", gcs=10.5, sbp=None, rr=2**70),
+            MockPatient(name="Adrian Monk", burn=1.5, rr=7),
+            MockPatient(name="Alive Patient", alive=True, pulse=72.5),
+            MockPatient(name="Dead Patient", alive=False),
+        ]
+        batch = PatientBatch.from_patients(patients)
+        self.assertEqual(len(batch), len(patients))
+        self.assertEqual(len(batch.name_labels), len(patients) - 1)  # names are stored once
+        self.assertEqual(batch.columns["alive"].dtype, bool)
+        self.assertEqual(batch.columns["pulse"].dtype, np.float64)
+        self.assertEqual(batch.columns["sbp"].dtype.kind, "O")
+        self.assertEqual(batch.columns["external_hemorrhage"].dtype, np.int64)
+        self.assertEqual(PatientBatch.from_patients(patients[:2]).values("sbp"), [60, 100])
+        with self.assertRaises(AttributeError):
+            batch.values("burn")
+        for original, copy in zip(patients, batch.to_patients(MockPatient)):
+            self.assertEqual(vars(copy), vars(original))
+            self.assertEqual(
+                {key: type(value) for key, value in vars(copy).items()},
+                {key: type(value) for key, value in vars(original).items()},
+            )
 
+    def test_normalized_scores(self):
+        # Each field scored against its threshold, clipped to [0, 1]
+        triage_life_algo = MockTriageFactory.create_triage_algo(
+            algo_name="LIFE", thresholds=self.thresholds_data_algo3, normalize=True
+        )
+        patients = [
+            MockPatient(name="Patient 1", gcs=9, sbp=219, rr=-10),
+            MockPatient(name="Patient 2", external_hemorrhage=6, burn=1, gcs=20),
+            MockPatient(name="Patient 3"),
+        ]
+        triage_scores = triage_life_algo.triage(patients)
+        self.assertAlmostEqual(triage_scores[0].score, 1.5)
+        self.assertAlmostEqual(triage_scores[1].score, 2.0)
+        self.assertEqual(triage_scores[2].score, 0)
+        with self.assertRaises(TypeError):
+            triage_life_algo.triage([MockPatient(name="Patient 4", gcs="high")])
 
-class CustomTestResult(unittest.TextTestResult):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.test_results = {}
-
-    def addSuccess(self, test):
-        super().addSuccess(test)
-        self.test_results[test.id().split(".")[-1]] = "pass"
-
-    def addFailure(self, test, err):
-        super().addFailure(test, err)
-        self.test_results[test.id().split(".")[-1]] = "fail"
-
-    def addError(self, test, err):
-        super().addError(test, err)
-        self.test_results[test.id().split(".")[-1]] = "error"
-
-class CustomTestRunner(unittest.TextTestRunner):
-    def _makeResult(self):
-        return CustomTestResult(self.stream, self.descriptions, self.verbosity)
-
-def generate_csv_report(test_timings, test_results):
-    filename = "testing_report_triage_score.csv"
-    fieldnames = ["Test Case Name", "Start Date", "Start Time", "Duration (seconds)", "Status"]
-
-    existing_tests = set()
-
-    # Read existing test case names from the CSV file
-    if os.path.isfile(filename):
-        with open(filename, mode="r", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                existing_tests.add(row["Test Case Name"])
+    @unittest.skipUnless(config.BENCHMARKS, "timed benchmark, set HARNESS_BENCHMARKS=1")
+    def test_score_one_million_patients(self):
+        # Scoring a million casualties as arrays stays well under a second
+        engine = TriageEngine(self.thresholds_data_algo3)
+        values = np.tile(np.arange(len(engine.fields)), (1_000_000, 1))
+        started = time.perf_counter()
+        scores = engine.score_values(values)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(scores.shape, (1_000_000,))
+        self.assertTrue((scores == sum(range(len(engine.fields)))).all())
 
-    with open(filename, mode="a", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
 
-        # Write header only if file is empty
-        if not os.path.isfile(filename) or os.stat(filename).st_size == 0:
-            writer.writeheader()
 
-        for test_name, timing in test_timings.items():
-            if test_name not in existing_tests:  # Check if test case already exists
-                status = test_results.get(test_name, "unknown")
-                
-                # Splitting timestamp into date and time
-                start_date, start_time = timing["start_time"].split()
+def write_report(collector):
+    sink.write_report(collector, "triage_score", "testing_report_triage_score.csv")
 
-                writer.writerow({
-                    "Test Case Name": test_name,
-                    "Start Date": start_date,
-                    "Start Time": start_time,
-                    "Duration (seconds)": timing["duration_seconds"],
-                    "Status": status
-                })
-                existing_tests.add(test_name)  # Add to set to prevent duplicates
 
 if __name__ == "__main__":
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPatientTriage)
-    runner = CustomTestRunner()
-    result = runner.run(suite)
-    generate_csv_report(TestPatientTriage.test_timings, result.test_results)
\ No newline at end of file
+    result = CollectingTestRunner().run(suite)
+    write_report(result.collector)
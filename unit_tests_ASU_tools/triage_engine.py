@@ -0,0 +1,123 @@
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from patient_batch import PatientBatch
+
+# Batch scoring for the triage mocks. The thresholds dict is turned into
+# arrays once (field order, min, max); a batch of casualties is scored as
+# one (patients x fields) matrix instead of one getattr/sum per patient.
+#
+# The default mode gives exactly what MockTriageAlgo computed per patient:
+# the sum of the threshold fields a patient has (missing fields count 0),
+# added up field by field in the thresholds' order. normalize=True scores
+# each field against its MockThreshold instead, (value - min) / (max - min)
+# clipped to [0, 1], and sums those.
+
+
+class TriageEngine:
+    def __init__(self, thresholds, normalize=False):
+        self.fields = list(thresholds)
+        self.normalize = normalize
+        self.minimum = np.array([thresholds[field].min_value for field in self.fields], dtype=np.float64)
+        self.maximum = np.array([thresholds[field].max_value for field in self.fields], dtype=np.float64)
+        span = self.maximum - self.minimum
+        self.span = np.where(span > 0, span, 1.0)
+
+    def values(self, patients):
+        # (patients x fields) matrix, presence mask and float fields from a
+        # PatientBatch or a list of patients; (None, None, None) if a field
+        # holds something NumPy cannot add up the same way (None, ints
+        # beyond 64 bits, ints and floats mixed, ...), so the caller falls
+        # back to Python sums
+        if not isinstance(patients, PatientBatch):
+            patients = PatientBatch.from_patients(patients, self.fields)
+        return patients.matrix(self.fields)
+
+    def score_values(self, values, present=None):
+        # Scores for a (patients x fields) matrix; `present` marks the fields
+        # each patient has (all of them when omitted)
+        if self.normalize:
+            scaled = np.clip((values - self.minimum) / self.span, 0.0, 1.0)
+            if present is not None:
+                scaled = np.where(present, scaled, 0.0)
+            return self._sum_columns(scaled)
+        if present is not None:
+            values = np.where(present, values, 0)
+        return self._sum_columns(values)
+
+    def _sum_columns(self, values):
+        # Field by field, left to right, like sum() over one patient
+        total = np.zeros(values.shape[0], dtype=values.dtype)
+        for index in range(values.shape[1]):
+            total += values[:, index]
+        return total
+
+    def scores(self, patients):
+        # Scores for a PatientBatch or a list of patients
+        values, present, floats = self.values(patients)
+        if values is None or not self.normalize and not self._exact(values, floats):
+            return self._python_scores(patients)
+        scores = self.score_values(values, present)
+        if not self.normalize and floats.any():
+            # A patient without float fields gets an int, as sum() gives
+            int_rows = ~(present & floats).any(axis=1)
+            if int_rows.any():
+                ints = self._sum_columns(np.where(present[int_rows], values[int_rows], 0).astype(np.int64))
+                scores = scores.astype(object)
+                scores[int_rows] = ints.tolist()
+        return scores
+
+    def _exact(self, values, floats):
+        # Whether the int fields add up without overflow: int64 sums stay
+        # below 2**63, and ints held in a float matrix below 2**53
+        ints = ~floats
+        if not len(values) or not ints.any():
+            return True
+        limit = 2**53 if floats.any() else 2**63 - 1
+        columns = values[:, ints]
+        largest = np.maximum(np.abs(columns.min(axis=0).astype(object)), np.abs(columns.max(axis=0).astype(object)))
+        return sum(int(value) for value in largest) <= limit
+
+    def _python_scores(self, patients):
+        if self.normalize:
+            raise TypeError("normalized scores need numeric fields")
+        if isinstance(patients, PatientBatch):
+            patients = patients.to_patients(SimpleNamespace)
+        return np.array([sum([getattr(patient, field, 0) for field in self.fields]) for patient in patients], dtype=object)
+
+
+def benchmark(patients=1_000_000, normalize=False, seed=0):
+    # Scores `patients` random casualties against the LIFE thresholds;
+    # returns seconds
+    class Threshold:
+        def __init__(self, min_value, max_value):
+            self.min_value = min_value
+            self.max_value = max_value
+
+    thresholds = {
+        "external_hemorrhage": Threshold(1, 6),
+        "tension_pneumothorax": Threshold(1, 6),
+        "traumatic_brain_injury": Threshold(1, 6),
+        "burn": Threshold(1, 6),
+        "gcs": Threshold(3, 15),
+        "sbp": Threshold(0, 219),
+        "rr": Threshold(0, 100),
+    }
+    engine = TriageEngine(thresholds, normalize)
+    rng = np.random.default_rng(seed)
+    values = rng.integers(engine.minimum, engine.maximum + 1, size=(patients, len(engine.fields)))
+    present = rng.random((patients, len(engine.fields))) < 0.8
+    started = time.perf_counter()
+    engine.score_values(values, present)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time batch triage scoring")
+    parser.add_argument("--patients", type=int, default=1_000_000)
+    parser.add_argument("--normalize", action="store_true")
+    args = parser.parse_args()
+    print(f"Scored {args.patients} patients in {benchmark(args.patients, args.normalize) * 1000:.1f} ms")
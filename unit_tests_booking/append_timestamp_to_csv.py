@@ -1,26 +1,8 @@
-import csv
-from datetime import datetime
+import os
+import sys
 
-# File paths
-input_csv = "test_report*.csv"
-output_csv = "test_report_with_timestamp.csv"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness.stamp import stamp_files
 
-# Read the CSV file
-with open(input_csv, mode="r") as infile:
-    reader = csv.reader(infile)
-    rows = list(reader)
-
-# Get the current date and time
-current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-# Add the date and time to the header
-rows[0].extend(["date", "time"])
-for row in rows[1:]:
-    row.extend([current_time.split()[0], current_time.split()[1]])
-
-# Write the updated rows to a new CSV file
-with open(output_csv, mode="w", newline="") as outfile:
-    writer = csv.writer(outfile)
-    writer.writerows(rows)
-
-print(f"CSV file updated with date and time: {output_csv}")
+# See harness/stamp.py; `python -m harness.stamp` stamps any number of reports
+stamp_files(["test_report*.csv"])
@@ -1,30 +1,27 @@
 import unittest
 import json
-import requests
-from datetime import datetime
-import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import client, sink, timing
+from harness.collector import CollectingTestRunner
+from harness.config import TOOLS_BASE_URL
 
 
 class TestHolidayBooking(unittest.TestCase):
 
-    base_url = "http://100.25.26.186:8002/tools/holiday/book"
-    test_timings = {}
-    test_results = {}  # Dictionary to store test results
+    base_url = f"{TOOLS_BASE_URL}/tools/holiday/book"
+    test_timings = {}  # per-test HTTP phase timings
 
     def setUp(self):
-        self.start_time = datetime.now()
+        timing.start_capture()
 
     def tearDown(self):
-        duration = datetime.now() - self.start_time
-        test_name = self.id().split(".")[-1]
-        self.test_timings[test_name] = {
-            "start_time": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "duration_seconds": duration.total_seconds(),
-        }
+        self.test_timings[self.id().split(".")[-1]] = timing.stop_capture()
 
     def post_request(self, data):
-        response = requests.post(
+        response = client.post(
             self.base_url,
             headers={"accept": "application/json", "Content-Type": "application/json"},
             data=json.dumps(data),
@@ -1152,67 +1149,24 @@ class TestHolidayBooking(unittest.TestCase):
         self.assertEqual(response.status_code, 422)
 
     def test_request_with_invalid_json_format(self):
-        response = requests.post(
+        response = client.post(
             self.base_url,
             headers={"accept": "application/json", "Content-Type": "application/json"},
             data="invalid_json_format"
         )
         self.assertEqual(response.status_code, 422)
 
-class CustomTestResult(unittest.TextTestResult):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.test_results = {}
-
-    def addSuccess(self, test):
-        super().addSuccess(test)
-        self.test_results[test.id().split(".")[-1]] = "pass"
-
-    def addFailure(self, test, err):
-        super().addFailure(test, err)
-        self.test_results[test.id().split(".")[-1]] = "fail"
-
-    def addError(self, test, err):
-        super().addError(test, err)
-        self.test_results[test.id().split(".")[-1]] = "error"
-
-class CustomTestRunner(unittest.TextTestRunner):
-    def _makeResult(self):
-        return CustomTestResult(self.stream, self.descriptions, self.verbosity)
-
-def generate_csv_report(test_timings, test_results):
-    filename = "test_report_holiday_booking.csv"
-    fieldnames = ["Test Case Name", "Start Time", "Duration (seconds)", "Status"]
-
-    existing_tests = set()
-
-    # Read existing test case names from the CSV file
-    if os.path.isfile(filename):
-        with open(filename, mode="r", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                existing_tests.add(row["Test Case Name"])
-
-    with open(filename, mode="a", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-        # Write header only if file is empty
-        if not os.path.isfile(filename) or os.stat(filename).st_size == 0:
-            writer.writeheader()
-
-        for test_name, timing in test_timings.items():
-            if test_name not in existing_tests:  # Check if test case already exists
-                status = test_results.get(test_name, "unknown")
-                writer.writerow({
-                    "Test Case Name": test_name,
-                    "Start Time": timing["start_time"],
-                    "Duration (seconds)": timing["duration_seconds"],
-                    "Status": status
-                })
-                existing_tests.add(test_name)  # Add to set to prevent duplicates
+def write_report(collector):
+    fieldnames = ["Test Case Name", "Start Time", "Duration (seconds)", "Status", "Run ID"] + timing.PHASE_COLUMNS
+    phases = {
+        test_name: dict(zip(timing.PHASE_COLUMNS, (timings[key] for key in timing.PHASE_KEYS)))
+        for test_name, timings in TestHolidayBooking.test_timings.items()
+    }
+    sink.write_report(collector, "test_report_holiday_booking", "test_report_holiday_booking.csv", fieldnames, phases)
+
 
 if __name__ == "__main__":
     suite = unittest.TestLoader().loadTestsFromTestCase(TestHolidayBooking)
-    runner = CustomTestRunner()
-    result = runner.run(suite)
-    generate_csv_report(TestHolidayBooking.test_timings, result.test_results)
+    result = CollectingTestRunner().run(suite)
+    write_report(result.collector)
+    client.generate_connection_report("connection_report_holiday_booking.csv")
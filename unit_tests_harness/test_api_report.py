@@ -0,0 +1,95 @@
+import unittest
+import csv
+import os
+import sys
+import tempfile
+from datetime import date
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import api_report, history, reports, runs, timing
+
+
+def make_timings(*names):
+    return {
+        name: {"start_time": "2024-07-06 10:00:00", "duration_seconds": 0.5, **dict.fromkeys(timing.PHASE_KEYS, 0.1)}
+        for name in names
+    }
+
+
+class TestApiReport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_file = os.path.join(self.tmp.name, "results.db")
+        self.csv_file = os.path.join(self.tmp.name, "test_report_demo.csv")
+        self.history_dir = os.path.join(self.tmp.name, "test_history")
+
+    def write(self, test_timings, run):
+        api_report.write_report("test_report_demo", self.csv_file, test_timings, run, self.db_file, self.history_dir)
+
+    def read_report(self):
+        with open(self.csv_file, newline="") as file:
+            return list(csv.reader(file))
+
+    def test_rows_carry_the_run_id(self):
+        run = runs.Run()
+        self.write(make_timings("test_b", "test_a"), run)
+        rows = self.read_report()
+        self.assertEqual(rows[0], api_report.REPORT_COLUMNS)
+        self.assertEqual([row[0] for row in rows[1:]], ["test_a", "test_b"])
+        self.assertEqual({row[-1] for row in rows[1:]}, {run.run_id})
+
+        con = duckdb.connect(self.db_file, read_only=True)
+        try:
+            recorded = con.execute(f"SELECT run_id, suite, tests FROM {runs.RUNS_TABLE}").fetchall()
+        finally:
+            con.close()
+        self.assertEqual(recorded, [(run.run_id, "test_report_demo", 2)])
+
+    def test_report_table_matches_the_empty_one(self):
+        run = runs.Run()
+        self.write(make_timings("test_a"), run)
+        empty_db = os.path.join(self.tmp.name, "empty.db")
+        con = duckdb.connect(empty_db)
+        try:
+            reports.create_table(con, "test_report_demo")
+            expected = con.execute("DESCRIBE test_report_demo").fetchall()
+        finally:
+            con.close()
+        con = duckdb.connect(self.db_file, read_only=True)
+        try:
+            self.assertEqual([row[:2] for row in con.execute("DESCRIBE test_report_demo").fetchall()],
+                             [row[:2] for row in expected])
+            self.assertEqual(con.execute("SELECT test_name, run_id FROM test_report_demo").fetchall(),
+                             [("test_a", run.run_id)])
+        finally:
+            con.close()
+
+    def test_each_run_overwrites_the_report(self):
+        first, second = runs.Run(), runs.Run()
+        self.write(make_timings("test_a"), first)
+        self.write(make_timings("test_c"), second)
+        self.assertEqual(self.read_report()[1:], [["test_c", "2024-07-06 10:00:00", "0.5"] + ["0.1"] * 5 + [second.run_id]])
+
+        # ...while the history keeps both runs
+        con = history.connect(self.db_file, read_only=True)
+        try:
+            rows = con.execute(
+                f'SELECT suite, run_date, "Test Case Name", "Run ID", "TTFB (seconds)" FROM {history.VIEW} '
+                'ORDER BY "Test Case Name"'
+            ).fetchall()
+        finally:
+            con.close()
+        self.assertEqual(
+            rows,
+            [
+                ("test_report_demo", date(2024, 7, 6), "test_a", first.run_id, 0.1),
+                ("test_report_demo", date(2024, 7, 6), "test_c", second.run_id, 0.1),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
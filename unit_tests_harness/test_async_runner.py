@@ -0,0 +1,78 @@
+import unittest
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness.async_runner import AsyncSuiteRunner
+
+
+def make_slow_cases():
+    # Built on demand so the loaders do not collect these as real tests
+    class SlowCases(unittest.TestCase):
+        BASE_URL = "http://example.invalid:8000/interact"
+        test_timings = {}
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        def setUp(self):
+            with self.lock:
+                type(self).in_flight += 1
+                type(self).max_in_flight = max(type(self).max_in_flight, type(self).in_flight)
+
+        def tearDown(self):
+            with self.lock:
+                type(self).in_flight -= 1
+            self.test_timings[self.id().split(".")[-1]] = True
+
+        def test_a(self):
+            time.sleep(0.2)
+
+        def test_b(self):
+            time.sleep(0.2)
+
+        def test_c(self):
+            time.sleep(0.2)
+
+        def test_d(self):
+            time.sleep(0.2)
+
+        def test_fails(self):
+            time.sleep(0.2)
+            self.assertEqual(1, 2)
+
+    return SlowCases
+
+
+class TestAsyncSuiteRunner(unittest.TestCase):
+    def setUp(self):
+        self.cases = make_slow_cases()
+
+    def run_cases(self, **kwargs):
+        suite = unittest.TestLoader().loadTestsFromTestCase(self.cases)
+        return AsyncSuiteRunner(stream=io.StringIO(), **kwargs).run(suite)
+
+    def test_cases_run_in_parallel(self):
+        start = time.perf_counter()
+        result = self.run_cases(concurrency=8, per_host=8)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result.testsRun, 5)
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(len(self.cases.test_timings), 5)
+
+    def test_outcomes_are_merged(self):
+        result = self.run_cases()
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn("test_fails", result.failures[0][0].id())
+        self.assertFalse(result.wasSuccessful())
+
+    def test_per_host_limit(self):
+        self.run_cases(concurrency=8, per_host=2)
+        self.assertEqual(self.cases.max_in_flight, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import cassette, client
+from harness.standin import StandinConfig, StandinServer
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".cassette")
+        os.close(fd)
+
+    def tearDown(self):
+        client.use_cassette(None, None)
+        client.close_all()
+        os.remove(self.path)
+
+    def record(self, config=None):
+        client.use_cassette(self.path, "record")
+        with StandinServer(config) as base_url:
+            url = base_url + "/tools/holiday/book"
+            first = client.post(url, json={"request_id": "r1", "params": {"name": "marshall"}})
+            repeat = client.post(url, json={"request_id": "r1", "params": {"name": "marshall"}})
+            docs = client.get(base_url + "/get_docs", params={"user_id": "u1"})
+        self.assertEqual(cassette.save(), 2)
+        return base_url, [first, repeat, docs]
+
+    def test_replay_without_server(self):
+        base_url, recorded = self.record()
+        client.use_cassette(self.path, "replay")
+        url = base_url + "/tools/holiday/book"
+        first = client.post(url, json={"request_id": "r1", "params": {"name": "marshall"}})
+        repeat = client.post(url, json={"request_id": "r1", "params": {"name": "marshall"}})
+        again = client.post(url, json={"request_id": "r1", "params": {"name": "marshall"}})
+        docs = client.get(base_url + "/get_docs", params={"user_id": "u1"})
+        self.assertEqual(first.json(), recorded[0].json())
+        self.assertEqual(repeat.content, recorded[1].content)
+        self.assertEqual(again.content, recorded[1].content)
+        self.assertEqual(docs.status_code, 200)
+        self.assertEqual(docs.headers["content-type"], "application/json")
+        self.assertEqual(docs.json(), recorded[2].json())
+
+    def test_unrecorded_request(self):
+        base_url, _ = self.record()
+        client.use_cassette(self.path, "replay")
+        with self.assertRaises(cassette.CassetteMiss):
+            client.get(base_url + "/get_docs", params={"user_id": "someone else"})
+
+    def test_replay_latency(self):
+        base_url, _ = self.record(StandinConfig(latency="fixed:0.1"))
+        client.use_cassette(self.path, "replay")
+        start = time.perf_counter()
+        client.get(base_url + "/get_docs", params={"user_id": "u1"})
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+        client.use_cassette(self.path, "replay", replay_latency=True)
+        start = time.perf_counter()
+        client.get(base_url + "/get_docs", params={"user_id": "u1"})
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+
+    def test_request_key(self):
+        self.assertEqual(
+            cassette.request_key("post", "http://h/x", '{"a": 1}'),
+            cassette.request_key("POST", "http://h/x", b'{"a": 1}'),
+        )
+        self.assertNotEqual(
+            cassette.request_key("POST", "http://h/x", b"{}"),
+            cassette.request_key("POST", "http://h/x", None),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
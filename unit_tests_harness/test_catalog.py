@@ -0,0 +1,99 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import catalog
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.sources_dir = os.path.join(self.tmp.name, "sources")
+        self.pages_dir = os.path.join(self.tmp.name, "pages")
+        os.makedirs(self.pages_dir)
+
+    def add_source(self, name, filename, statements, queries):
+        directory = os.path.join(self.sources_dir, name)
+        os.makedirs(directory)
+        with open(os.path.join(directory, "connection.yaml"), "w") as file:
+            file.write(f"# This file was automatically generated\nname: {name}\ntype: duckdb\noptions:\n  filename: {filename}\n")
+        con = duckdb.connect(os.path.join(directory, filename))
+        for statement in statements:
+            con.execute(statement)
+        con.close()
+        for query, sql in queries.items():
+            with open(os.path.join(directory, f"{query}.sql"), "w") as file:
+                file.write(sql)
+
+    def query(self, sql):
+        con = duckdb.connect(os.path.join(self.sources_dir, "catalog", "catalog.duckdb"), read_only=True)
+        try:
+            return con.execute(sql).fetchall()
+        finally:
+            con.close()
+
+    def test_migrate(self):
+        self.add_source(
+            "bookings",
+            "bookings.db",
+            [
+                "CREATE TABLE booking (id INTEGER, name VARCHAR)",
+                "INSERT INTO booking VALUES (1, 'a'), (2, 'b')",
+                "CREATE TABLE booking_copy AS SELECT * FROM booking ORDER BY id DESC",
+                "CREATE TABLE booking_other AS SELECT * FROM booking WHERE id = 1",
+            ],
+            {"bookings": "select * from booking;", "orders": "select * from booking_copy"},
+        )
+        self.add_source(
+            "shop",
+            "shop.duckdb",
+            ["CREATE TABLE orders (id INTEGER, name VARCHAR)", "INSERT INTO orders VALUES (2, 'b'), (1, 'a')"],
+            {"orders": 'SELECT o.id FROM "orders" o JOIN orders p ON o.id = p.id'},
+        )
+        self.add_source("test_database", "results.db", ["CREATE TABLE triage_score (x INTEGER)"], {"t": "select 1"})
+        with open(os.path.join(self.pages_dir, "page.md"), "w") as file:
+            file.write("FROM bookings.bookings\nFROM bookings.orders\nFROM shop.orders\nFROM test_database.t\n")
+
+        result = catalog.migrate(self.sources_dir, self.pages_dir)
+        self.assertEqual(result["sources"], ["bookings", "shop"])
+        self.assertEqual(result["tables"], 2)
+        self.assertEqual(
+            result["duplicates"],
+            {("bookings", "booking_copy"): ("bookings", "booking"), ("shop", "orders"): ("bookings", "booking")},
+        )
+        self.assertEqual(
+            self.query("SELECT schema_name, table_name FROM duckdb_tables() ORDER BY ALL"),
+            [("bookings", "booking"), ("bookings", "booking_other")],
+        )
+        self.assertEqual(self.query('SELECT * FROM shop.orders ORDER BY id'), [(1, "a"), (2, "b")])
+
+        catalog_source = catalog.read_queries(os.path.join(self.sources_dir, "catalog"))
+        self.assertEqual(sorted(catalog_source), ["bookings", "bookings_orders", "shop_orders"])
+        self.assertIn('select * from "bookings".booking;', catalog_source["bookings"])
+        self.assertIn('FROM "shop"."orders" o JOIN "shop".orders p', catalog_source["shop_orders"])
+        self.assertEqual(self.query(catalog_source["shop_orders"].split("\n", 1)[1]), [(1,), (2,)])
+
+        with open(os.path.join(self.pages_dir, "page.md")) as file:
+            self.assertEqual(
+                file.read(),
+                "FROM catalog.bookings\nFROM catalog.bookings_orders\nFROM catalog.shop_orders\nFROM test_database.t\n",
+            )
+        self.assertEqual(catalog.read_connection(os.path.join(self.sources_dir, "catalog"))["filename"], "catalog.duckdb")
+        self.assertTrue(os.path.isdir(os.path.join(self.sources_dir, "shop")))
+
+    def test_remove_and_nothing_left(self):
+        self.add_source("shop", "shop.duckdb", ["CREATE TABLE orders (id INTEGER)"], {"orders": "select * from orders"})
+        catalog.migrate(self.sources_dir, self.pages_dir, remove=True)
+        self.assertEqual(sorted(os.listdir(self.sources_dir)), ["catalog"])
+        with self.assertRaises(ValueError):
+            catalog.migrate(self.sources_dir, self.pages_dir)
+        self.assertEqual(self.query("SELECT count(*) FROM shop.orders"), [(0,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
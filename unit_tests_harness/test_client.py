@@ -0,0 +1,146 @@
+import unittest
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import client
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # {"sleep": S} delays the answer, {"sleep_once": KEY, ...} only the first
+    # time KEY is seen, {"fail": KEY, "times": N} answers 503 N times per KEY
+    seen = {}
+    seen_lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) or b"{}"
+        request = json.loads(body)
+        with self.seen_lock:
+            once = request.get("sleep_once") not in self.seen
+            self.seen[request.get("sleep_once")] = True
+            failures = self.seen.get(("fail", request.get("fail")), 0)
+            self.seen[("fail", request.get("fail"))] = failures + 1
+        if "sleep" in request and (once or "sleep_once" not in request):
+            time.sleep(request["sleep"])
+        status = 503 if failures < request.get("times", 0) else 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out or took the hedged copy
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSharedClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        client.close_all()
+
+    def tearDown(self):
+        client.close_all()
+        client.set_deadline(None)
+
+    def test_session_shared_per_base_url(self):
+        self.assertIs(
+            client.session_for(self.base_url + "/interact"),
+            client.session_for(self.base_url + "/get_docs"),
+        )
+        self.assertIsNot(
+            client.session_for(self.base_url),
+            client.session_for("http://127.0.0.2:1"),
+        )
+
+    def test_connection_reused(self):
+        for i in range(5):
+            response = client.post(self.base_url + "/interact", json={"i": i})
+            self.assertEqual(response.json(), {"i": i})
+        stats = client.connection_stats()[self.base_url]
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["handshakes"], 1)
+        self.assertEqual(stats["reused"], 4)
+
+    def test_connection_report(self):
+        client.post(self.base_url + "/interact", data=json.dumps({}))
+        csv_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_connection_report.csv")
+        try:
+            client.generate_connection_report(csv_file)
+            with open(csv_file) as file:
+                lines = file.read().splitlines()
+        finally:
+            os.remove(csv_file)
+        self.assertEqual(
+            lines[0], "Base URL,Requests,Handshakes,Reused,Retries,Hedged,Hedge Wins,Timeouts,Deadline Exceeded"
+        )
+        self.assertEqual(lines[1], f"{self.base_url},1,1,0,0,0,0,0,0")
+
+    def test_timeout(self):
+        with self.assertRaises(client.requests.exceptions.Timeout):
+            client.post(self.base_url + "/interact", json={"sleep": 1}, timeout=0.1)
+        self.assertEqual(client.connection_stats()[self.base_url]["timeouts"], 1)
+
+    def test_deadline(self):
+        client.post(self.base_url + "/interact", json={})
+        client.set_deadline(0.2)
+        with self.assertRaises(client.requests.exceptions.Timeout):
+            client.post(self.base_url + "/interact", json={"sleep": 1})
+        with self.assertRaises(client.DeadlineExceeded):
+            client.post(self.base_url + "/interact", json={})
+        stats = client.connection_stats()[self.base_url]
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["deadline_exceeded"], 1)
+        self.assertEqual(stats["requests"], 2)
+
+    def test_retries(self):
+        backoff, client.RETRY_BACKOFF = client.RETRY_BACKOFF, 0.01
+        try:
+            response = client.post(self.base_url + "/interact", json={"fail": "a", "times": 2}, retries=2)
+            self.assertEqual(response.status_code, 200)
+            response = client.post(self.base_url + "/interact", json={"fail": "b", "times": 2}, retries=1)
+            self.assertEqual(response.status_code, 503)
+        finally:
+            client.RETRY_BACKOFF = backoff
+        stats = client.connection_stats()[self.base_url]
+        self.assertEqual(stats["retries"], 3)
+        self.assertEqual(stats["requests"], 5)
+
+    def test_hedged_request(self):
+        url = self.base_url + "/interact"
+        for i in range(client.HEDGE_MIN_SAMPLES):
+            client.post(url, json={"i": i}, hedge=True)
+        self.assertIsNotNone(client.hedge_delay("POST", url))
+        self.assertEqual(client.connection_stats()[self.base_url]["hedges"], 0)
+
+        start = time.perf_counter()
+        response = client.post(url, json={"sleep": 2, "sleep_once": "hedge"}, hedge=True)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(response.json()["sleep_once"], "hedge")
+        stats = client.connection_stats()[self.base_url]
+        self.assertEqual(stats["hedges"], 1)
+        self.assertEqual(stats["hedge_wins"], 1)
+        self.assertEqual(stats["retries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import unittest
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+from harness.collector import CollectingTestRunner, ResultCollector, generate_csv_report
+from harness.report_index import ReportIndex, index_file
+
+
+def make_cases():
+    # Built on demand so the loaders do not collect these as real tests
+    class Cases(unittest.TestCase):
+        def test_pass(self):
+            time.sleep(0.002)
+
+        def test_fail(self):
+            self.fail("expected")
+
+        def test_error(self):
+            raise RuntimeError("expected")
+
+        @unittest.skip("expected")
+        def test_skip(self):
+            pass
+
+        def test_subtest_fail(self):
+            for i in range(2):
+                with self.subTest(i=i):
+                    self.assertEqual(i, 0)
+
+    return Cases
+
+
+class TestCollector(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.csv_file = os.path.join(self.tmp.name, "report.csv")
+
+    def run_cases(self):
+        suite = unittest.TestLoader().loadTestsFromTestCase(make_cases())
+        return CollectingTestRunner(stream=io.StringIO()).run(suite)
+
+    def read_report(self):
+        with open(self.csv_file, newline="") as file:
+            return list(csv.reader(file))
+
+    def test_statuses(self):
+        result = self.run_cases()
+        self.assertEqual(
+            result.test_results,
+            {
+                "test_error": "error",
+                "test_fail": "fail",
+                "test_pass": "pass",
+                "test_skip": "skip",
+                "test_subtest_fail": "fail",
+            },
+        )
+
+    def test_sub_second_durations(self):
+        result = self.run_cases()
+        duration = result.collector.duration_seconds("test_pass")
+        self.assertGreaterEqual(duration, 0.002)
+        self.assertLess(duration, 1)
+        self.assertEqual(result.test_timings["test_pass"]["duration_seconds"], duration)
+
+    def test_columns(self):
+        collector = ResultCollector()
+        for name in ("test_a", "test_b", "test_a"):
+            collector.start(name)
+            collector.stop(name)
+        collector.set_status("test_a", "pass")
+        self.assertEqual(collector.names, ["test_a", "test_b"])
+        self.assertEqual(collector.statuses, ["pass", "unknown"])
+        self.assertEqual(len(collector.duration_ns), 2)
+
+    def test_report_appends_every_run(self):
+        first = self.run_cases()
+        generate_csv_report(self.csv_file, first.collector)
+        second = self.run_cases()
+        generate_csv_report(self.csv_file, second.collector)
+
+        rows = self.read_report()
+        self.assertEqual(rows[0], ["Test Case Name", "Start Date", "Start Time", "Duration (seconds)", "Status", "Run ID"])
+        self.assertEqual([row[0] for row in rows[1:]], first.collector.names + second.collector.names)
+        self.assertEqual(
+            {row[5] for row in rows[1:]}, {first.collector.run.run_id, second.collector.run.run_id}
+        )
+        self.assertNotEqual(first.collector.run.run_id, second.collector.run.run_id)
+        date, start_time = rows[1][1], rows[1][2]
+        self.assertRegex(date, r"^\d{4}-\d{2}-\d{2}$")
+        self.assertRegex(start_time, r"^\d{2}:\d{2}:\d{2}$")
+
+    def test_run_finished_with_the_test_run(self):
+        result = self.run_cases()
+        run = result.collector.run
+        self.assertIsNotNone(run.ended_at)
+        self.assertLessEqual(run.started_at, run.ended_at)
+
+    def test_old_report_gets_run_id_column(self):
+        with open(self.csv_file, "w", newline="") as file:
+            file.write("Test Case Name,Start Date,Start Time,Duration (seconds),Status\nold_test,2024-07-09,02:17:46,6e-05,pass\n")
+        collector = self.run_cases().collector
+        generate_csv_report(self.csv_file, collector)
+        rows = self.read_report()
+        self.assertEqual(rows[0][-1], "Run ID")
+        self.assertEqual(rows[1], ["old_test", "2024-07-09", "02:17:46", "6e-05", "pass", ""])
+        self.assertEqual(len(rows), 2 + len(collector))
+
+    def test_report_with_extra_columns_rewrites_header(self):
+        with open(self.csv_file, "w", newline="") as file:
+            file.write("Test Case Name,Start Time,Duration (seconds),Status\nold_test,2024-07-06 00:35:52,0.1,pass\n")
+        collector = ResultCollector()
+        collector.start("test_new")
+        collector.stop("test_new")
+        collector.set_status("test_new", "pass")
+        fieldnames = ["Test Case Name", "Start Time", "Duration (seconds)", "Status", "TTFB (seconds)"]
+        generate_csv_report(self.csv_file, collector, fieldnames, {"test_new": {"TTFB (seconds)": 0.25}})
+
+        rows = self.read_report()
+        self.assertEqual(rows[0], fieldnames)
+        self.assertEqual(rows[1], ["old_test", "2024-07-06 00:35:52", "0.1", "pass", ""])
+        self.assertEqual(rows[2][0], "test_new")
+        self.assertRegex(rows[2][1], r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+        self.assertEqual(rows[2][3:], ["pass", "0.25"])
+
+    def test_same_run_appended_once(self):
+        collector = self.run_cases().collector
+        generate_csv_report(self.csv_file, collector)
+        generate_csv_report(self.csv_file, collector)
+        self.assertEqual(len(self.read_report()), 1 + len(collector))
+        with ReportIndex(self.csv_file) as index:
+            self.assertTrue(index.in_sync())
+            self.assertEqual(len(index), len(collector))
+
+    def test_index_rebuilt_from_report(self):
+        collector = self.run_cases().collector
+        generate_csv_report(self.csv_file, collector)
+        os.remove(index_file(self.csv_file))
+        generate_csv_report(self.csv_file, collector)
+        self.assertEqual(len(self.read_report()), 1 + len(collector))
+
+        # Edited outside the harness: the dropped rows are appended again
+        rows = self.read_report()
+        with open(self.csv_file, "w", newline="") as file:
+            csv.writer(file).writerows(rows[:2])
+        generate_csv_report(self.csv_file, collector)
+        rows = self.read_report()
+        self.assertEqual(len(rows), 1 + len(collector))
+        self.assertEqual(sorted(row[0] for row in rows[1:]), sorted(collector.names))
+
+    def test_pytest_plugin(self):
+        suite_dir = os.path.join(self.tmp.name, "suite")
+        os.mkdir(suite_dir)
+        with open(os.path.join(suite_dir, "conftest.py"), "w") as file:
+            file.write(f"import sys\nsys.path.insert(0, {REPO_ROOT!r})\nfrom harness.pytest_plugin import *\n")
+        with open(os.path.join(suite_dir, "test_demo.py"), "w") as file:
+            file.write(textwrap.dedent(f"""
+                import time
+                import unittest
+                from harness.collector import generate_csv_report
+
+                class TestDemo(unittest.TestCase):
+                    def test_pass(self):
+                        time.sleep(0.002)
+
+                    def test_fail(self):
+                        self.fail("expected")
+
+                def write_report(collector):
+                    generate_csv_report({self.csv_file!r}, collector)
+            """))
+        env = dict(os.environ, HARNESS_PYTEST_REPORTS="1")
+        subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", suite_dir],
+            cwd=self.tmp.name, env=env, capture_output=True,
+        )
+        rows = self.read_report()
+        statuses = {row[0]: row[4] for row in rows[1:]}
+        self.assertEqual(statuses, {"test_pass": "pass", "test_fail": "fail"})
+        durations = {row[0]: float(row[3]) for row in rows[1:]}
+        self.assertGreaterEqual(durations["test_pass"], 0.002)
+
+
+if __name__ == "__main__":
+    unittest.main()
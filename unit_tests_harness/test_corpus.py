@@ -0,0 +1,166 @@
+import unittest
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import client, config, corpus
+from harness.async_runner import AsyncSuiteRunner
+from harness.standin import StandinServer
+
+
+class _Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        if self.body is None:
+            raise ValueError("no body")
+        return self.body
+
+
+class TestCorpus(unittest.TestCase):
+    def write_corpus(self, lines):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            for line in lines:
+                file.write(line if isinstance(line, str) else json.dumps(line))
+                file.write("\n")
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_read_cases_defaults_and_repeat(self):
+        path = self.write_corpus([
+            "# comment",
+            {"defaults": {"expect": {"status": 200}}},
+            {"id": "a", "message": {"$repeat": ["ab", 3]}},
+            "",
+            {"id": "b", "expect": {"status": 422}},
+            {"defaults": {}},
+            {"id": "c", "topics": {"$repeat": [["x"], 2]}},
+        ])
+        cases = list(corpus.read_cases(path))
+        self.assertEqual(cases[0], {"id": "a", "message": "ababab", "expect": {"status": 200}})
+        self.assertEqual(cases[1]["expect"], {"status": 422})
+        self.assertEqual(cases[2], {"id": "c", "topics": ["x", "x"]})
+
+    def test_read_cases_is_lazy(self):
+        path = self.write_corpus([{"id": "a"}, "not json"])
+        cases = corpus.read_cases(path)
+        self.assertEqual(next(cases)["id"], "a")
+        with self.assertRaisesRegex(ValueError, ":2:"):
+            next(cases)
+
+    def test_validate(self):
+        case = {
+            "id": "x",
+            "classification": "triage",
+            "expect": {
+                "status": 200,
+                "json_keys": ["agent_answer"],
+                "equals": {"classification": {"$case": "classification"}},
+                "contains": {"agent_answer.text_sections.0.text": "EDT"},
+            },
+        }
+        good = {"classification": "triage", "agent_answer": {"text_sections": [{"text": "5 PM EDT"}]}}
+        self.assertEqual(corpus.validate(case, _Response(200, good)), [])
+        bad = {"classification": "other", "agent_answer": {"text_sections": []}}
+        self.assertEqual(len(corpus.validate(case, _Response(500, bad))), 3)
+        self.assertEqual(corpus.validate(case, _Response(200, None)), ["response is not JSON"])
+        # status-only expectations never parse the body
+        self.assertEqual(corpus.validate({"expect": {"status": 422}}, _Response(422, None)), [])
+
+    def test_run_cases_keeps_order_and_bounds_in_flight(self):
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0, "read": 0}
+
+        def cases():
+            for i in range(40):
+                state["read"] += 1
+                yield {"id": f"case_{i}", "expect": {"status": 200}}
+
+        def send(case):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.001 * (int(case["id"].split("_")[1]) % 3))
+            with lock:
+                state["in_flight"] -= 1
+            return _Response(200, None)
+
+        results = corpus.run_cases(cases(), send, batch_size=4)
+        first = next(results)
+        self.assertLessEqual(state["read"], 5)
+        ids = [first.case_id] + [result.case_id for result in results]
+        self.assertEqual(ids, [f"case_{i}" for i in range(40)])
+        self.assertLessEqual(state["peak"], 4)
+
+    def test_run_cases_share_the_runner_limits(self):
+        # Two corpus tests under the asyncio runner: their cases together
+        # never exceed --concurrency, whatever the batch size
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def send(case):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.01)
+            with lock:
+                state["in_flight"] -= 1
+            return _Response(200, None)
+
+        class CorpusCases(unittest.TestCase):
+            BASE_URL = "http://example.invalid:8000/interact"
+
+            def run_corpus(self):
+                cases = [{"id": f"case_{i}", "expect": {"status": 200}} for i in range(20)]
+                results = list(corpus.run_cases(cases, send, batch_size=8))
+                self.assertEqual(len(results), 20)
+                self.assertTrue(all(not result.failures for result in results))
+
+            def test_corpus_a(self):
+                self.run_corpus()
+
+            def test_corpus_b(self):
+                self.run_corpus()
+
+        suite = unittest.TestLoader().loadTestsFromTestCase(CorpusCases)
+        result = AsyncSuiteRunner(concurrency=3, per_host=8, stream=io.StringIO()).run(suite)
+        self.assertTrue(result.wasSuccessful())
+        self.assertLessEqual(state["peak"], 3)
+        self.assertGreater(state["peak"], 1)
+
+    def test_run_cases_reports_errors(self):
+        def send(case):
+            raise ConnectionError("down")
+
+        [result] = corpus.run_cases([{"id": "a"}], send)
+        self.assertIsInstance(result.error, ConnectionError)
+        self.assertEqual(set(result.timings()), {"start_time", "duration_seconds"} | set(
+            f"{phase}_seconds" for phase in ("dns", "connect", "tls", "ttfb", "download")
+        ))
+
+    def test_classification_corpus_against_standin(self):
+        with StandinServer() as base_url:
+            url = base_url + "/interact/classification"
+
+            def send(case):
+                return client.post(url, params={"interaction_text": case["interaction_text"]})
+
+            results = list(corpus.run_cases(corpus.read_cases(config.CLASSIFICATION_CORPUS), send))
+        client.close_all()
+        self.assertEqual(len(results), 67)
+        self.assertTrue(all(result.error is None for result in results))
+        # The stand-in's keyword classifier agrees with most of the corpus
+        passed = sum(not result.failures for result in results)
+        self.assertGreater(passed, len(results) // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
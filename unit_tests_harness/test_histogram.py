@@ -0,0 +1,58 @@
+import unittest
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_exact_for_small_values(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record_value(value)
+        self.assertEqual(histogram.total_count, 1000)
+        self.assertEqual(histogram.value_at_percentile(50), 500)
+        self.assertEqual(histogram.value_at_percentile(99), 990)
+        self.assertEqual(histogram.value_at_percentile(100), 1000)
+
+    def test_relative_precision(self):
+        histogram = LatencyHistogram(significant_figures=3)
+        rng = random.Random(7)
+        values = sorted(rng.randint(1, 10 ** 9) for _ in range(10000))
+        for value in values:
+            histogram.record_value(value)
+        for percentile in (50, 90, 99, 99.9):
+            expected = values[int(percentile / 100 * len(values)) - 1]
+            actual = histogram.value_at_percentile(percentile)
+            self.assertLess(abs(actual - expected) / expected, 0.002)
+
+    def test_highest_equivalent_value(self):
+        histogram = LatencyHistogram(significant_figures=2)
+        self.assertEqual(histogram.highest_equivalent_value(100), 100)
+        self.assertGreaterEqual(histogram.highest_equivalent_value(100000), 100000)
+        self.assertLess(histogram.highest_equivalent_value(100000), 100000 * 1.01)
+
+    def test_corrected_value_backfills(self):
+        histogram = LatencyHistogram()
+        histogram.record_corrected_value(1000, expected_interval=100)
+        self.assertEqual(histogram.total_count, 10)
+        self.assertEqual(histogram.min_value, 100)
+        self.assertEqual(histogram.max_value, 1000)
+
+    def test_add_and_distribution(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record_value(10)
+        second.record_value(20, count=3)
+        first.add(second)
+        self.assertEqual(first.total_count, 4)
+        self.assertEqual(first.value_at_percentile(25), 10)
+        self.assertEqual(first.value_at_percentile(50), 20)
+        distribution = first.percentile_distribution()
+        self.assertEqual(distribution[0], (0.0, 10))
+        self.assertEqual(distribution[-1], (100.0, 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
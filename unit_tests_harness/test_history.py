@@ -0,0 +1,110 @@
+import unittest
+import glob
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date, datetime
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import history, sink
+from harness.collector import make_collector
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_file = os.path.join(self.tmp.name, "results.db")
+        self.history_dir = os.path.join(self.tmp.name, "history")
+
+    def export(self, suite, collector, **kwargs):
+        sink.export_history(suite, collector, db_file=self.db_file, history_dir=self.history_dir, **kwargs)
+
+    def query(self, sql):
+        con = history.connect(self.db_file, read_only=True)
+        try:
+            return con.execute(sql).fetchall()
+        finally:
+            con.close()
+
+    def test_view_without_history(self):
+        # Only the typed base file: the view binds and is empty
+        history.create_view(self.db_file, self.history_dir)
+        self.assertEqual(self.query(f"SELECT count(*) FROM {history.VIEW}"), [(0,)])
+        self.assertEqual(
+            self.query(f"SELECT column_name, data_type FROM information_schema.columns WHERE table_name = '{history.VIEW}'"),
+            [
+                ("Test Case Name", "VARCHAR"),
+                ("Start Time", "TIMESTAMP"),
+                ("Duration (seconds)", "DOUBLE"),
+                ("Status", "VARCHAR"),
+                ("Run ID", "VARCHAR"),
+                ("run_date", "DATE"),
+                ("suite", "VARCHAR"),
+            ],
+        )
+
+    def test_view_is_relative_to_the_database(self):
+        # The committed database must not hold this checkout's path
+        self.export("triage_score", make_collector({"test_a": "pass"}))
+        [(sql,)] = self.query(f"SELECT sql FROM duckdb_views() WHERE view_name = '{history.VIEW}'")
+        self.assertIn("'history/*/*/*.parquet'", sql)
+        self.assertNotIn(self.tmp.name, sql)
+        # Another checkout: the same files somewhere else
+        moved = os.path.join(self.tmp.name, "moved")
+        os.mkdir(moved)
+        shutil.copy(self.db_file, moved)
+        shutil.copytree(self.history_dir, os.path.join(moved, "history"))
+        con = history.connect(os.path.join(moved, "results.db"), read_only=True)
+        try:
+            self.assertEqual(con.execute(f"SELECT count(*) FROM {history.VIEW}").fetchall(), [(1,)])
+        finally:
+            con.close()
+
+    def test_partitions(self):
+        self.export("triage_score", make_collector({"test_a": "pass", "test_b": "fail"}, date(2026, 1, 1)))
+        self.export("triage_score", make_collector({"test_a": "pass"}, date(2026, 1, 1)))
+        self.export("triage_score", make_collector({"test_a": "pass"}, date(2026, 1, 2)))
+        self.export("mission_final_cf", make_collector({"test_c": "pass"}, date(2026, 1, 2)))
+
+        files = sorted(os.path.relpath(path, self.history_dir) for path in glob.glob(history.history_glob(self.history_dir)))
+        self.assertEqual(len(files), 5)
+        self.assertEqual(
+            sorted({os.path.dirname(path) for path in files}),
+            [
+                os.path.join("suite=_", "run_date=1970-01-01"),
+                os.path.join("suite=mission_final_cf", "run_date=2026-01-02"),
+                os.path.join("suite=triage_score", "run_date=2026-01-01"),
+                os.path.join("suite=triage_score", "run_date=2026-01-02"),
+            ],
+        )
+        self.assertEqual(
+            self.query(
+                f"SELECT run_date, count(*) FROM {history.VIEW} WHERE suite = 'triage_score' "
+                "GROUP BY run_date ORDER BY run_date"
+            ),
+            [(date(2026, 1, 1), 3), (date(2026, 1, 2), 1)],
+        )
+        self.assertEqual(
+            self.query(f'SELECT "Test Case Name", "Status" FROM {history.VIEW} WHERE suite = \'mission_final_cf\''),
+            [("test_c", "pass")],
+        )
+
+    def test_suite_columns(self):
+        self.export("triage_score", make_collector({"test_a": "pass"}))
+        fieldnames = ["Test Case Name", "Start Time", "Duration (seconds)", "Status", "TTFB (seconds)"]
+        self.export("booking", make_collector({"test_b": "pass"}), fieldnames=fieldnames,
+                    extra={"test_b": {"TTFB (seconds)": 0.5}})
+        self.assertEqual(
+            self.query(f'SELECT suite, "TTFB (seconds)" FROM {history.VIEW} ORDER BY suite'),
+            [("booking", 0.5), ("triage_score", None)],
+        )
+        start_time = self.query(f'SELECT "Start Time" FROM {history.VIEW} LIMIT 1')[0][0]
+        self.assertIsInstance(start_time, datetime)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import tempfile
+from datetime import date, time
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import importer
+
+
+class TestImporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_file = os.path.join(self.tmp.name, "results.db")
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def query(self, sql):
+        con = duckdb.connect(self.db_file, read_only=True)
+        try:
+            return con.execute(sql).fetchall()
+        finally:
+            con.close()
+
+    def test_one_typed_table_per_report(self):
+        self.write(
+            "testing_report_triage_score.csv",
+            "Test Case Name,Start Date,Start Time,Duration (seconds),Status,Run ID\n"
+            "test_a,2024-07-09,02:19:09,7.7e-05,pass,000000000123\n",
+        )
+        self.write("test_report_interact.csv", "Test Name,Start Time,Duration (seconds)\ntest_b,2024-07-03 12:32:22,3\n")
+        imported = importer.import_reports([os.path.join(self.tmp.name, "*.csv")], self.db_file)
+        self.assertEqual(imported, {"test_report_interact": 1, "testing_report_triage_score": 1})
+        self.assertEqual(
+            self.query("SELECT * FROM testing_report_triage_score"),
+            [("test_a", date(2024, 7, 9), time(2, 19, 9), 7.7e-05, "pass", "000000000123")],
+        )
+        self.assertEqual(self.query("SELECT typeof(\"Duration (seconds)\") FROM test_report_interact"), [("DOUBLE",)])
+
+        # Importing again replaces the tables
+        importer.import_reports([os.path.join(self.tmp.name, "*.csv")], self.db_file)
+        self.assertEqual(self.query("SELECT count(*) FROM testing_report_triage_score"), [(1,)])
+
+    def test_one_table_append(self):
+        first = self.write("report_1.csv", "Test Case Name,Status\ntest_a,pass\n")
+        second = self.write("report_2.csv", "Status,Test Case Name,Run ID\nfail,test_b,abc\n")
+        self.assertEqual(importer.import_reports([first, second], self.db_file, table="results"), {"results": 2})
+        importer.import_reports([first], self.db_file, table="results", append=True)
+        self.assertEqual(
+            self.query('SELECT "Test Case Name", "Status", "Run ID" FROM results ORDER BY ALL'),
+            [("test_a", "pass", None), ("test_a", "pass", None), ("test_b", "fail", "abc")],
+        )
+
+    def test_failed_import_changes_nothing(self):
+        good = self.write("good.csv", "Test Case Name,Duration (seconds)\ntest_a,0.5\n")
+        bad = self.write("bad.csv", "Test Case Name,Duration (seconds)\ntest_b,slow\n")
+        with self.assertRaises(duckdb.Error):
+            importer.import_reports([good, bad], self.db_file)
+        self.assertEqual(self.query("SELECT count(*) FROM information_schema.tables"), [(0,)])
+
+    def test_missing_report(self):
+        with self.assertRaises(FileNotFoundError):
+            importer.import_reports([os.path.join(self.tmp.name, "missing.csv")], self.db_file)
+
+    def test_peak_memory_without_resource(self):
+        # Windows has no resource module; the import must still work there
+        saved = sys.modules.get("resource")
+        sys.modules["resource"] = None
+        try:
+            self.assertIsNone(importer.peak_memory_mb())
+        finally:
+            if saved is None:
+                del sys.modules["resource"]
+            else:
+                sys.modules["resource"] = saved
+        self.assertGreater(importer.peak_memory_mb(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import client, loadgen
+from harness.standin import StandinConfig, StandinServer
+
+
+class TestLoadGenerator(unittest.TestCase):
+    def tearDown(self):
+        client.close_all()
+
+    def test_request_plan_rotates_categories(self):
+        plan = list(loadgen.request_plan(8))
+        self.assertEqual(
+            [category for category, _ in plan[:4]], ["weather", "greeting", "medical", "conversion"]
+        )
+        self.assertEqual(plan[3][1]["message"], "Convert 100 miles to kilometers")
+        self.assertEqual(plan[7][1]["message"], "Convert 5 PM IST to EDT")
+
+    def test_messages_from_corpus(self):
+        messages = loadgen.load_messages()
+        self.assertEqual(messages["greeting"], ["hi, how are you?", "こんにちは"])
+        self.assertEqual(len(messages["medical"]), 6)
+
+    def test_open_loop_counts_queueing_delay(self):
+        # One worker and a 50ms server at 40 req/s: requests queue up, which
+        # shows in the corrected latency but not in the per-request latency
+        with StandinServer(StandinConfig(latency="fixed:0.05")) as base_url:
+            run = loadgen.run_load(base_url + "/interact", rps=40, duration=0.5, max_in_flight=1)
+        overall = run.overall()
+        self.assertEqual(overall.requests, 20)
+        self.assertEqual(overall.errors, 0)
+        self.assertGreater(
+            overall.corrected.value_at_percentile(99),
+            2 * overall.uncorrected.value_at_percentile(99),
+        )
+
+    def test_write_duckdb(self):
+        with StandinServer() as base_url:
+            run = loadgen.run_load(base_url + "/interact", rps=50, duration=0.2)
+        fd, db_file = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        os.remove(db_file)
+        try:
+            loadgen.write_duckdb(run, db_file)
+            con = duckdb.connect(db_file)
+            rows = con.execute(
+                "SELECT category, requests FROM interact_load ORDER BY category"
+            ).fetchall()
+            percentiles = con.execute("SELECT count(*) FROM interact_load_percentiles").fetchone()[0]
+            con.close()
+        finally:
+            os.remove(db_file)
+        self.assertEqual(dict(rows)["all"], 10)
+        self.assertEqual(len(rows), 5)
+        self.assertGreater(percentiles, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
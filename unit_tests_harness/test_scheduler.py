@@ -0,0 +1,127 @@
+import unittest
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import corpus, scheduler
+from harness.async_runner import AsyncSuiteRunner
+from harness.scheduler import DurationEstimates
+
+
+def make_timed_cases(order):
+    # Built on demand so the loaders do not collect these as real tests
+    class TimedCases(unittest.TestCase):
+        def test_short(self):
+            order.append("test_short")
+
+        def test_medium(self):
+            order.append("test_medium")
+            time.sleep(0.02)
+
+        def test_long(self):
+            order.append("test_long")
+            time.sleep(0.05)
+
+    return TimedCases
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_file = os.path.join(self.tmp.name, "history.db")
+
+    def write_report(self, name, header, rows):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return path
+
+    def test_ewma_and_default(self):
+        estimates = DurationEstimates("suite", alpha=0.5, default=2.0)
+        self.assertEqual(estimates.estimate("test_new"), 2.0)
+        estimates.update("test_a", 4.0)
+        estimates.update("test_a", 2.0)
+        self.assertEqual(estimates.estimate("test_a"), 3.0)
+        estimates.update("test_b", 1.0)
+        estimates.update("test_c", 5.0)
+        # unknown tests get the suite median once there is history
+        self.assertEqual(estimates.estimate("test_new"), 3.0)
+        self.assertEqual(estimates.samples, {"test_a": 2, "test_b": 1, "test_c": 1})
+
+    def test_seed_from_both_report_layouts(self):
+        self.write_report(
+            "test_report_demo.csv",
+            ["Test Name", "Start Time", "Duration (seconds)"],
+            [["test_a", "2024-07-01 10:00:00", 1.0], ["test_b", "2024-07-01 10:00:01", 3.0]],
+        )
+        self.write_report(
+            "testing_report_demo.csv",
+            ["Test Case Name", "Start Date", "Start Time", "Duration (seconds)", "Status"],
+            [["test_a", "2024-07-02", "10:00:00", 2.0, "pass"]],
+        )
+        files = scheduler.report_files("demo", self.tmp.name)
+        self.assertEqual(len(files), 2)
+        estimates = DurationEstimates.load("demo", self.db_file, self.tmp.name)
+        self.assertAlmostEqual(estimates.estimate("test_a"), 1.0 + scheduler.ALPHA * (2.0 - 1.0))
+        self.assertEqual(estimates.estimate("test_b"), 3.0)
+
+    def test_save_and_load(self):
+        estimates = DurationEstimates("demo")
+        estimates.update("test_a", 1.5)
+        estimates.save(self.db_file)
+        estimates.update("test_a", 2.5)
+        estimates.save(self.db_file)
+        loaded = DurationEstimates.load("demo", self.db_file, self.tmp.name)
+        self.assertEqual(loaded.estimates, estimates.estimates)
+        self.assertEqual(loaded.samples, {"test_a": 2})
+        self.assertEqual(DurationEstimates.load("other", self.db_file, self.tmp.name).estimates, {})
+
+    def test_bins_balance(self):
+        estimates = DurationEstimates("demo", {"a": 7, "b": 5, "c": 4, "d": 3, "e": 3, "f": 2})
+        bins, loads = scheduler.bin_longest_first(list("abcdef"), estimates, 2, key=lambda name: name)
+        self.assertEqual(sorted(loads), [12, 12])
+        self.assertEqual(sorted(sum(bins, [])), list("abcdef"))
+        self.assertEqual(bins[0][0], "a")
+
+    def test_runner_starts_longest_first_and_learns(self):
+        order = []
+        cases = make_timed_cases(order)
+        estimates = DurationEstimates("demo", {"test_long": 5.0, "test_medium": 2.0})
+        suite = unittest.TestLoader().loadTestsFromTestCase(cases)
+        AsyncSuiteRunner(concurrency=1, stream=io.StringIO(), estimates=estimates).run(suite)
+        # test_short has no history and gets the median (3.5s) estimate
+        self.assertEqual(order, ["test_long", "test_short", "test_medium"])
+        self.assertLess(estimates.estimate("test_long"), 5.0)
+        self.assertLess(estimates.estimate("test_short"), 0.05)
+
+    def test_corpus_cases_longest_first_and_learn(self):
+        estimates = DurationEstimates("demo", {"slow": 5.0, "fast": 0.5})
+        durations = {"fast": 0.0, "new": 0.01, "slow": 0.02}
+        order = []
+
+        def send(case):
+            order.append(case["id"])
+            time.sleep(durations[case["id"]])
+            return None
+
+        cases = [{"id": name} for name in ("fast", "new", "slow")]
+        results = list(corpus.run_cases(cases, send, batch_size=1, estimates=estimates))
+        # "new" has no history and gets the median (2.75s) estimate
+        self.assertEqual(order, ["slow", "new", "fast"])
+        estimates.update_from_timings({result.case_id: result.timings() for result in results})
+        estimates.save(self.db_file)
+        loaded = DurationEstimates.load("demo", self.db_file, self.tmp.name)
+        self.assertLess(loaded.estimate("slow"), 5.0)
+        self.assertLess(loaded.estimate("new"), 1.0)
+        self.assertEqual(loaded.samples["slow"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
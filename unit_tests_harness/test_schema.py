@@ -0,0 +1,64 @@
+import unittest
+import glob
+import os
+import shutil
+import sys
+import tempfile
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import config, history, schema
+
+SOURCE_DIR = os.path.dirname(config.TEST_DATABASE)
+
+
+def read_source(name):
+    with open(os.path.join(SOURCE_DIR, name)) as file:
+        return file.read()
+
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.db_file = os.path.join(tmpdir.name, "test.db")
+
+    def test_sources_run_on_an_empty_database(self):
+        con = duckdb.connect(self.db_file)
+        try:
+            schema.create_missing(con)
+            for name in ["interact_load.sql", "interact_load_percentiles.sql", "test_report_interact.sql",
+                         "summary_triage_score.sql"]:
+                self.assertEqual(con.execute(read_source(name)).fetchall(), [], name)
+        finally:
+            con.close()
+
+    def test_existing_rows_are_kept(self):
+        con = duckdb.connect(self.db_file)
+        try:
+            schema.create_missing(con)
+            con.execute("INSERT INTO interact_load_percentiles VALUES ('run', 'all', 50, 1.5)")
+            schema.create_missing(con)
+            count = con.execute("SELECT count(*) FROM interact_load_percentiles").fetchone()[0]
+        finally:
+            con.close()
+        self.assertEqual(count, 1)
+
+    def test_every_source_runs_on_the_committed_database(self):
+        # On a copy laid out like the source folder (the database and the
+        # base partition of the history), so the committed file is left alone
+        shutil.copy(config.TEST_DATABASE, self.db_file)
+        base_file = os.path.join(os.path.dirname(self.db_file), "test_history", history.BASE_FILE)
+        os.makedirs(os.path.dirname(base_file))
+        shutil.copy(os.path.join(SOURCE_DIR, "test_history", history.BASE_FILE), base_file)
+        con = history.connect(self.db_file, read_only=True)
+        try:
+            for source in sorted(glob.glob(os.path.join(SOURCE_DIR, "*.sql"))):
+                with self.subTest(source=os.path.basename(source)):
+                    con.execute(read_source(os.path.basename(source))).fetchall()
+        finally:
+            con.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import csv
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import shard
+from harness.scheduler import DurationEstimates
+
+
+class TestSharding(unittest.TestCase):
+    def test_shards_are_deterministic_and_balanced(self):
+        test_ids = [f"unit_tests/test_x.T.test_{i:02d}" for i in range(20)]
+        estimates = DurationEstimates(shard.ESTIMATES_SUITE, {test_ids[0]: 10.0, test_ids[1]: 6.0})
+        first, loads = shard.make_shards(test_ids, 3, estimates)
+        again, _ = shard.make_shards(list(reversed(test_ids)), 3, estimates)
+        self.assertEqual(first, again)
+        self.assertEqual(sorted(sum(first, [])), test_ids)
+        self.assertEqual(first[0][0], test_ids[0])
+        self.assertLessEqual(max(loads) - min(loads), 6.0)
+
+    def test_coordinator_hands_out_each_shard_once(self):
+        coordinator = shard.Coordinator([["a"], ["b", "c"]], loads=[1.0, 2.0])
+        first = coordinator.next_shard("w1")
+        second = coordinator.next_shard("w2")
+        self.assertEqual((first["shard"], second["shard"]), (1, 0))
+        self.assertEqual(coordinator.next_shard("w3"), {"run_id": coordinator.run_id, "shard": None, "finished": False})
+        self.assertTrue(coordinator.submit("w2", 0, [{"test_id": "a"}])["accepted"])
+        self.assertFalse(coordinator.submit("w9", 0, [{"test_id": "a"}])["accepted"])
+        coordinator.submit("w1", 1, [{"test_id": "b"}, {"test_id": "c"}])
+        self.assertTrue(coordinator.done.is_set())
+        self.assertEqual([row["test_id"] for row in coordinator.rows()], ["a", "b", "c"])
+        self.assertEqual(coordinator.rows()[0]["worker"], "w2")
+
+    def test_expired_lease_is_reissued(self):
+        coordinator = shard.Coordinator([["a"]], lease=0)
+        self.assertEqual(coordinator.next_shard("w1")["shard"], 0)
+        self.assertEqual(coordinator.next_shard("w2")["shard"], 0)
+
+    def test_workers_run_shards_through_the_coordinator(self):
+        test_ids = [
+            test_id for test_id in shard.discover(["unit_tests_ASU_tools"])
+            if "test_triage_score" in test_id
+        ][:6] + ["unit_tests_ASU_tools/test_missing_module.T.test_x"]
+        estimates = DurationEstimates(shard.ESTIMATES_SUITE)
+        shards, loads = shard.make_shards(test_ids, 2, estimates)
+        coordinator = shard.Coordinator(shards, loads)
+        server = shard.serve(coordinator, "127.0.0.1", 0)
+        url = "http://%s:%d" % server.server_address[:2]
+        try:
+            workers = [
+                threading.Thread(target=shard.work, args=(url, f"w{i}", 0.05)) for i in range(2)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(30)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertTrue(coordinator.done.is_set())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            report = os.path.join(tmp, "report.csv")
+            db_file = os.path.join(tmp, "estimates.db")
+            shard.finish(coordinator, estimates, report, db_file)
+            with open(report, newline="") as file:
+                rows = list(csv.DictReader(file))
+            stored = DurationEstimates.load(shard.ESTIMATES_SUITE, db_file, tmp)
+        self.assertEqual([row["Test Name"] for row in rows], sorted(test_ids))
+        statuses = {row["Test Name"]: row["Status"] for row in rows}
+        self.assertEqual(statuses.pop("unit_tests_ASU_tools/test_missing_module.T.test_x"), "error")
+        self.assertEqual(set(statuses.values()), {"pass"})
+        self.assertEqual({row["Run ID"] for row in rows}, {coordinator.run_id})
+        self.assertEqual(set(stored.estimates), set(test_ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
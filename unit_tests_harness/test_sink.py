@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+import tempfile
+from datetime import date, datetime, time
+from unittest import mock
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import config, sink
+from harness.collector import make_collector
+
+
+class TestSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_file = os.path.join(self.tmp.name, "results.db")
+        self.history_dir = os.path.join(self.tmp.name, "history")
+
+    def query(self, sql):
+        con = duckdb.connect(self.db_file, read_only=True)
+        try:
+            return con.execute(sql).fetchall()
+        finally:
+            con.close()
+
+    def test_report_columns(self):
+        collector = make_collector({"test_a": "pass", "test_b": "fail"})
+        self.assertEqual(sink.write_results("triage_score", collector, self.db_file), 2)
+        self.assertEqual(
+            self.query("SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'triage_score'"),
+            [
+                ("Test Case Name", "VARCHAR"),
+                ("Start Date", "DATE"),
+                ("Start Time", "TIME"),
+                ("Duration (seconds)", "DOUBLE"),
+                ("Status", "VARCHAR"),
+                ("Run ID", "VARCHAR"),
+            ],
+        )
+        rows = self.query('SELECT * FROM triage_score ORDER BY "Test Case Name"')
+        self.assertEqual(
+            [(row[0], row[4], row[5]) for row in rows],
+            [("test_a", "pass", collector.run.run_id), ("test_b", "fail", collector.run.run_id)],
+        )
+        self.assertIsInstance(rows[0][1], date)
+        self.assertIsInstance(rows[0][2], time)
+        self.assertAlmostEqual(rows[0][3], collector.duration_seconds("test_a"))
+
+    def test_runs_append(self):
+        first = make_collector({"test_a": "pass"})
+        second = make_collector({"test_a": "fail", "test_b": "pass"})
+        sink.write_results("triage_score", first, self.db_file)
+        sink.write_results("triage_score", second, self.db_file)
+        self.assertEqual(
+            self.query('SELECT "Run ID", "Status" FROM triage_score WHERE "Test Case Name" = \'test_a\''),
+            [(first.run.run_id, "pass"), (second.run.run_id, "fail")],
+        )
+        runs = self.query("SELECT run_id, suite, host, tests, started_at <= ended_at FROM test_runs ORDER BY started_at")
+        self.assertEqual(
+            runs,
+            [
+                (first.run.run_id, "triage_score", first.run.host, 1, True),
+                (second.run.run_id, "triage_score", second.run.host, 2, True),
+            ],
+        )
+
+    def test_extra_columns_and_timestamp(self):
+        sink.write_results("booking", make_collector({"test_old": "pass"}), self.db_file,
+                           ["Test Case Name", "Start Time", "Duration (seconds)", "Status"])
+        fieldnames = ["Test Case Name", "Start Time", "Duration (seconds)", "Status", "TTFB (seconds)"]
+        sink.write_results("booking", make_collector({"test_a": "pass", "test_b": "pass"}), self.db_file,
+                           fieldnames, {"test_a": {"TTFB (seconds)": 0.25}})
+        rows = self.query('SELECT "Test Case Name", "Start Time", "TTFB (seconds)" FROM booking')
+        self.assertEqual([(name, ttfb) for name, _, ttfb in rows], [("test_old", None), ("test_a", 0.25), ("test_b", None)])
+        self.assertIsInstance(rows[0][1], datetime)
+
+    def test_failed_write_rolls_back(self):
+        con = duckdb.connect(self.db_file)
+        con.execute('CREATE TABLE triage_score ("Test Case Name" VARCHAR, "Status" INTEGER)')
+        con.close()
+        with self.assertRaises(duckdb.Error):
+            sink.write_results("triage_score", make_collector({"test_a": "pass"}), self.db_file)
+        self.assertEqual(
+            self.query("SELECT count(*) FROM information_schema.columns WHERE table_name = 'triage_score'"), [(2,)]
+        )
+
+    def test_csv_export_is_optional(self):
+        csv_file = os.path.join(self.tmp.name, "report.csv")
+        with mock.patch.object(config, "CSV_EXPORT", False):
+            sink.write_report(make_collector({"test_a": "pass"}), "triage_score", csv_file,
+                              db_file=self.db_file, history_dir=self.history_dir)
+        self.assertFalse(os.path.exists(csv_file))
+        with mock.patch.object(config, "CSV_EXPORT", True):
+            sink.write_report(make_collector({"test_a": "pass"}), "triage_score", csv_file,
+                              db_file=self.db_file, history_dir=self.history_dir)
+        self.assertTrue(os.path.exists(csv_file))
+        self.assertEqual(self.query("SELECT count(*) FROM triage_score"), [(2,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import csv
+import os
+import sys
+import tempfile
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import stamp
+
+NOW = datetime(2026, 3, 4, 5, 6, 7)
+
+
+class TestStamp(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def write(self, name, rows):
+        with open(self.path(name), "w", newline="") as file:
+            csv.writer(file).writerows(rows)
+
+    def read(self, name):
+        with open(self.path(name), newline="") as file:
+            return list(csv.reader(file))
+
+    def test_stamps_every_matching_report(self):
+        self.write("test_report_a.csv", [["Test Name", "Status"], ["test_1", "pass"], ["test_2", "fail"]])
+        self.write("test_report_b.csv", [["Test Name", "Status"]])
+        stamped = stamp.stamp_files([self.path("test_report_*.csv")], now=NOW)
+        self.assertEqual(stamped, {self.path("test_report_a.csv"): 2, self.path("test_report_b.csv"): 0})
+        self.assertEqual(
+            self.read("test_report_a_with_timestamp.csv"),
+            [
+                ["Test Name", "Status", "date", "time"],
+                ["test_1", "pass", "2026-03-04", "05:06:07"],
+                ["test_2", "fail", "2026-03-04", "05:06:07"],
+            ],
+        )
+        self.assertEqual(self.read("test_report_b_with_timestamp.csv"), [["Test Name", "Status", "date", "time"]])
+
+        # The stamped outputs match the pattern too, but are left alone
+        stamped = stamp.stamp_files([self.path("test_report_*.csv")], now=NOW)
+        self.assertIsNone(stamped[self.path("test_report_a_with_timestamp.csv")])
+        self.assertFalse(os.path.exists(self.path("test_report_a_with_timestamp_with_timestamp.csv")))
+
+    def test_in_place(self):
+        self.write("report.csv", [["Test Name"], ["test_1"]])
+        stamp.stamp_files([self.path("report.csv")], in_place=True, now=NOW)
+        self.assertEqual(self.read("report.csv"), [["Test Name", "date", "time"], ["test_1", "2026-03-04", "05:06:07"]])
+        self.assertEqual(os.listdir(self.tmp.name), ["report.csv"])
+
+    def test_failed_write_keeps_the_old_report(self):
+        self.write("report.csv", [["Test Name"], ["test_1"]])
+        with mock.patch.object(stamp.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                stamp.stamp_file(self.path("report.csv"), self.path("report.csv"), NOW)
+        self.assertEqual(self.read("report.csv"), [["Test Name"], ["test_1"]])
+        self.assertEqual(os.listdir(self.tmp.name), ["report.csv"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import client
+from harness.standin import StandinConfig, StandinServer, parse_latency
+
+INTERACT_PAYLOAD = {
+    "user_id": "string",
+    "channel": "string",
+    "request_id": "string",
+    "topics": ["string"],
+    "message": "Convert 100 miles to kilometers",
+    "metadata": {"additionalProp1": "string"},
+}
+
+
+class TestStandinEndpoints(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandinServer()
+        cls.base_url = cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        client.close_all()
+
+    def test_interact(self):
+        response = client.post(self.base_url + "/interact", json=INTERACT_PAYLOAD)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("datetime_response", data)
+        self.assertIn("response_duration", data)
+        self.assertIn("kilometers", data["agent_answer"]["text_sections"][0]["text"])
+
+    def test_interact_validation_error(self):
+        response = client.post(self.base_url + "/interact", json={"user_id": "string"})
+        self.assertEqual(response.status_code, 422)
+        self.assertIn("loc", response.json()["detail"][0])
+
+    def test_classification(self):
+        response = client.post(self.base_url + "/interact/classification?interaction_text=hello there")
+        self.assertEqual(
+            response.json(),
+            {"interaction_text": "hello there", "classification": "greeting", "implementation": "agent002"},
+        )
+
+    def test_get_docs(self):
+        response = client.get(self.base_url + "/get_docs", params={"user_id": "u1"})
+        self.assertEqual(response.headers["content-type"], "application/json")
+        data = response.json()
+        self.assertEqual(data["user_id"], "u1")
+        self.assertGreater(len(data["doc_pages"][0]["pages"]), 0)
+
+    def test_rate_response(self):
+        payload = {"user_id": "u", "channel": "c", "response_id": "r", "rating": 5, "comment": "ok"}
+        data = client.post(self.base_url + "/rate_response", json=payload).json()
+        for key in ("datetime_rating", "success_code", "message"):
+            self.assertIn(key, data)
+
+    def test_holiday_booking_flow(self):
+        url = self.base_url + "/tools/holiday/book"
+        first = client.post(url, json={"request_id": "b1", "params": {"name": "marshall"}}).json()
+        self.assertFalse(first["complete"])
+        self.assertEqual(
+            [i["variable_name"] for i in first["interactions"]], ["country", "age"]
+        )
+        second = client.post(url, json={"request_id": "b1", "params": {"country": "UK", "age": "30"}}).json()
+        self.assertTrue(second["complete"])
+        self.assertIsNotNone(second["booking_id"])
+        self.assertIsNone(second["interactions"])
+
+    def test_unknown_path(self):
+        self.assertEqual(client.post(self.base_url + "/invalid", json={}).status_code, 404)
+
+
+class TestStandinConfig(unittest.TestCase):
+    def tearDown(self):
+        client.close_all()
+
+    def test_latency_error_rate_and_payload(self):
+        config = StandinConfig(latency="fixed:0.05", error_rate=1.0, payload_bytes=1000, seed=1)
+        with StandinServer(config) as base_url:
+            start = time.perf_counter()
+            response = client.post(base_url + "/interact", json=INTERACT_PAYLOAD)
+            self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+            self.assertEqual(response.status_code, 503)
+
+        config = StandinConfig(payload_bytes=1000)
+        with StandinServer(config) as base_url:
+            response = client.post(base_url + "/interact", json=INTERACT_PAYLOAD)
+            self.assertGreater(len(response.content), 1000)
+
+    def test_parse_latency(self):
+        rng = random.Random(0)
+        self.assertEqual(parse_latency("fixed:0.2")(rng), 0.2)
+        sample = parse_latency("uniform:0.1,0.2")(rng)
+        self.assertTrue(0.1 <= sample <= 0.2)
+        with self.assertRaises(ValueError):
+            parse_latency("pareto:1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import os
+import sys
+import tempfile
+from datetime import date
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import importer, sink, summary, watch
+from harness.collector import make_collector
+
+
+class TestSummary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_file = os.path.join(self.tmp.name, "results.db")
+
+    def query(self, sql):
+        con = duckdb.connect(self.db_file, read_only=True)
+        try:
+            return con.execute(sql).fetchall()
+        finally:
+            con.close()
+
+    def write(self, name, text, mode="w"):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, mode) as file:
+            file.write(text)
+        return path
+
+    def summary_rows(self):
+        return self.query(
+            f"SELECT suite, run_date, status, results, round(duration_sum, 6), duration_min, duration_max "
+            f"FROM {summary.SUMMARY_TABLE} ORDER BY ALL"
+        )
+
+    def test_runs_are_added_up(self):
+        sink.write_results("triage_score", make_collector({"a": ("pass", 0.5), "b": ("fail", 2.0)}, date(2026, 1, 1)), self.db_file)
+        sink.write_results("triage_score", make_collector({"a": ("pass", 0.25), "b": ("pass", 1.0)}, date(2026, 1, 1)), self.db_file)
+        sink.write_results("triage_score", make_collector({"a": ("pass", 4.0)}, date(2026, 1, 2)), self.db_file)
+        sink.write_results("triage_category", make_collector({"c": ("pass", 1.0)}, date(2026, 1, 1)), self.db_file)
+        incremental = self.summary_rows()
+        self.assertEqual(
+            incremental,
+            [
+                ("triage_category", date(2026, 1, 1), "pass", 1, 1.0, 1.0, 1.0),
+                ("triage_score", date(2026, 1, 1), "fail", 1, 2.0, 2.0, 2.0),
+                ("triage_score", date(2026, 1, 1), "pass", 3, 1.75, 0.25, 1.0),
+                ("triage_score", date(2026, 1, 2), "pass", 1, 4.0, 4.0, 4.0),
+            ],
+        )
+
+        # Recomputing from the result tables gives the same rows
+        con = duckdb.connect(self.db_file)
+        try:
+            self.assertEqual(summary.rebuild(con), {"triage_category": 1, "triage_score": 3})
+            self.assertEqual(summary.rebuild(con, ["triage_score"]), {"triage_score": 3})
+        finally:
+            con.close()
+        self.assertEqual(self.summary_rows(), incremental)
+
+    def test_rebuild_old_tables(self):
+        con = duckdb.connect(self.db_file)
+        try:
+            con.execute(
+                'CREATE TABLE test_report_holiday_booking ("Test Case Name" VARCHAR, "Start Time" TIMESTAMP, '
+                '"Duration (seconds)" DOUBLE, "Status" VARCHAR)'
+            )
+            con.execute(
+                "INSERT INTO test_report_holiday_booking VALUES "
+                "('a', '2024-07-06 00:35:52', 0.5, 'pass'), ('b', '2024-07-06 00:35:53', 1.5, 'fail')"
+            )
+            con.execute('CREATE TABLE coverage_data (name VARCHAR, "Status" VARCHAR)')
+            self.assertEqual(summary.rebuild(con), {"test_report_holiday_booking": 2})
+            with self.assertRaises(ValueError):
+                summary.rebuild(con, ["coverage_data"])
+        finally:
+            con.close()
+        self.assertEqual(
+            self.summary_rows(),
+            [
+                ("test_report_holiday_booking", date(2024, 7, 6), "fail", 1, 1.5, 1.5, 1.5),
+                ("test_report_holiday_booking", date(2024, 7, 6), "pass", 1, 0.5, 0.5, 0.5),
+            ],
+        )
+
+    def test_imported_reports_are_summarised(self):
+        report = self.write(
+            "testing_report_triage_score.csv",
+            "Test Case Name,Start Date,Start Time,Duration (seconds),Status,Run ID\n"
+            "a,2026-01-01,12:00:00,0.5,pass,1\nb,2026-01-01,12:00:01,2.0,fail,1\n",
+        )
+        interact = self.write("test_report_interact.csv", "Test Name,Start Time,Duration (seconds)\nc,2026-01-01 12:00:00,3\n")
+        importer.import_reports([report, interact], self.db_file)
+        importer.import_reports([report], self.db_file)  # replaced, not added twice
+        expected = [
+            ("testing_report_triage_score", date(2026, 1, 1), "fail", 1, 2.0, 2.0, 2.0),
+            ("testing_report_triage_score", date(2026, 1, 1), "pass", 1, 0.5, 0.5, 0.5),
+        ]
+        self.assertEqual(self.summary_rows(), expected)
+
+        importer.import_reports([report], self.db_file, table="testing_report_triage_score", append=True)
+        self.assertEqual(self.summary_rows(), [row[:3] + (row[3] * 2, row[4] * 2) + row[5:] for row in expected])
+
+    def test_watched_reports_are_summarised(self):
+        os.mkdir(os.path.join(self.tmp.name, "reports"))
+        name = os.path.join("reports", "testing_report_triage_score.csv")
+        self.write(name, "Test Case Name,Start Date,Duration (seconds),Status\na,2026-01-01,0.5,pass\n")
+        ingester = watch.Ingester(self.db_file)
+        ingester.ingest(watch.scan([os.path.join(self.tmp.name, "reports")]))
+        self.write(name, "b,2026-01-01,1.5,pass\n", mode="a")
+        ingester.ingest(watch.scan([os.path.join(self.tmp.name, "reports")]))
+        self.assertEqual(
+            self.summary_rows(), [("live_testing_report_triage_score", date(2026, 1, 1), "pass", 2, 2.0, 0.5, 1.5)]
+        )
+
+        # A rewritten report is summarised again from its new rows
+        self.write(name, "Test Case Name,Start Date,Duration (seconds),Status\nc,2026-01-02,4.0,fail\n")
+        ingester.ingest(watch.scan([os.path.join(self.tmp.name, "reports")]))
+        self.assertEqual(
+            self.summary_rows(), [("live_testing_report_triage_score", date(2026, 1, 2), "fail", 1, 4.0, 4.0, 4.0)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
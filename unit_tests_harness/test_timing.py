@@ -0,0 +1,82 @@
+import unittest
+import csv
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import client, reports, timing
+from harness.standin import StandinConfig, StandinServer
+
+
+class TestPhaseTiming(unittest.TestCase):
+    def setUp(self):
+        client.close_all()
+
+    def tearDown(self):
+        timing.stop_capture()
+        client.close_all()
+
+    def test_phases_of_new_and_reused_connection(self):
+        config = StandinConfig(latency="fixed:0.1", payload_bytes=200000)
+        with StandinServer(config) as base_url:
+            url = base_url.replace("127.0.0.1", "localhost") + "/get_docs"
+            timing.start_capture()
+            response = client.get(url, params={"user_id": "u1"})
+            first = timing.stop_capture()
+
+            timing.start_capture()
+            client.get(url, params={"user_id": "u1"})
+            second = timing.stop_capture()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(first), sorted(timing.PHASE_KEYS))
+        self.assertGreater(first["dns_seconds"], 0)
+        self.assertGreater(first["connect_seconds"], 0)
+        self.assertEqual(first["tls_seconds"], 0)
+        self.assertGreaterEqual(first["ttfb_seconds"], 0.1)
+        self.assertGreater(first["download_seconds"], 0)
+        # keep-alive: no new connection the second time
+        self.assertEqual(second["dns_seconds"], 0)
+        self.assertEqual(second["connect_seconds"], 0)
+        self.assertGreaterEqual(second["ttfb_seconds"], 0.1)
+
+    def test_requests_outside_capture(self):
+        with StandinServer() as base_url:
+            response = client.get(base_url + "/get_docs", params={"user_id": "u1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(timing.stop_capture(), dict.fromkeys(timing.PHASE_KEYS, 0.0))
+
+    def test_requests_from_worker_threads(self):
+        with StandinServer(StandinConfig(latency="fixed:0.05")) as base_url:
+            timing.start_capture()
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                send = timing.bind(lambda: client.get(base_url + "/get_docs", params={"user_id": "u1"}))
+                responses = [future.result() for future in [executor.submit(send) for _ in range(4)]]
+            phases = timing.stop_capture()
+        self.assertEqual([response.status_code for response in responses], [200] * 4)
+        self.assertGreaterEqual(phases["ttfb_seconds"], 4 * 0.05)
+        self.assertGreater(phases["connect_seconds"], 0)
+
+    def test_load_csv_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_file = os.path.join(tmp, "test_report_interact.csv")
+            with open(csv_file, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["Test Name", "Start Time", "Duration (seconds)"] + timing.PHASE_COLUMNS)
+                writer.writerow(["test_weather_request", "2024-07-01 10:00:00", 1.5, 0.01, 0.02, 0.0, 1.2, 0.05])
+            db_file = os.path.join(tmp, "report.db")
+            self.assertEqual(reports.load_csv_report(csv_file, "test_report_interact", db_file), 1)
+            con = duckdb.connect(db_file, read_only=True)
+            row = con.execute(
+                "SELECT test_name, duration_seconds, ttfb_seconds, download_seconds FROM test_report_interact"
+            ).fetchone()
+            con.close()
+        self.assertEqual(row, ("test_weather_request", 1.5, 1.2, 0.05))
+
+
+if __name__ == "__main__":
+    unittest.main()
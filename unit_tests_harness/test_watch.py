@@ -0,0 +1,184 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import watch
+
+HEADER = "Test Case Name,Duration (seconds),Status\n"
+
+
+class ScriptedWatcher:
+    # Stands in for the inotify/polling watcher: each changes() call runs
+    # the next step, and the loop is stopped once the steps run out
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.timeouts = []
+
+    def changes(self, timeout):
+        self.timeouts.append(timeout)
+        if not self.steps:
+            raise KeyboardInterrupt
+        time.sleep(timeout)
+        return self.steps.pop(0)()
+
+    def close(self):
+        pass
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.reports = os.path.join(self.tmp.name, "reports")
+        os.mkdir(self.reports)
+        self.db_file = os.path.join(self.tmp.name, "results.db")
+        self.ingester = watch.Ingester(self.db_file)
+        self.report = os.path.join(self.reports, "test_report_demo.csv")
+
+    def write(self, text, mode="a", path=None):
+        with open(path or self.report, mode) as file:
+            file.write(text)
+
+    def ingest(self):
+        return self.ingester.ingest(watch.scan([self.reports]))
+
+    def query(self, sql):
+        con = duckdb.connect(self.db_file, read_only=True)
+        try:
+            return con.execute(sql).fetchall()
+        finally:
+            con.close()
+
+    def names(self):
+        return [row[0] for row in self.query('SELECT "Test Case Name" FROM live_test_report_demo')]
+
+    def test_only_appended_complete_records(self):
+        self.write(HEADER + 't1,0.5,pass\nt2,0.25,"multi\nline"\nt3,0.1,pa', mode="w")
+        self.assertEqual(self.ingest(), {self.report: 2})
+        self.write("ss\nt4,1,pass\n")
+        self.assertEqual(self.ingest(), {self.report: 2})
+        self.assertEqual(self.ingest(), {})
+        self.assertEqual(self.names(), ["t1", "t2", "t3", "t4"])
+        self.assertEqual(self.query("SELECT Status FROM live_test_report_demo WHERE \"Test Case Name\" = 't2'"), [("multi\nline",)])
+        self.assertEqual(
+            self.query("SELECT typeof(\"Duration (seconds)\") FROM live_test_report_demo LIMIT 1"), [("DOUBLE",)]
+        )
+        self.assertEqual(
+            self.query(f"SELECT table_name, ingested_to FROM {watch.OFFSETS_TABLE}"),
+            [("live_test_report_demo", os.path.getsize(self.report))],
+        )
+
+    def test_rewritten_report_is_reloaded(self):
+        self.write(HEADER + "t1,0.5,pass\nt2,0.5,pass\n", mode="w")
+        self.ingest()
+        # Rewritten in place with more rows than before
+        self.write(HEADER + "n1,1,pass\nn2,1,pass\nn3,1,pass\n", mode="w")
+        self.assertEqual(self.ingest(), {self.report: 3})
+        self.assertEqual(self.names(), ["n1", "n2", "n3"])
+
+        # Replaced by a new file (new inode)
+        replacement = os.path.join(self.reports, "replacement.tmp")
+        self.write(HEADER + "r1,1,pass\n", mode="w", path=replacement)
+        os.replace(replacement, self.report)
+        self.assertEqual(self.ingest(), {self.report: 1})
+        self.assertEqual(self.names(), ["r1"])
+
+    def test_foreign_table_left_alone(self):
+        con = duckdb.connect(self.db_file)
+        con.execute('CREATE TABLE live_test_report_demo ("Test Case Name" VARCHAR)')
+        con.close()
+        self.write(HEADER + "t1,0.5,pass\n", mode="w")
+        self.assertEqual(self.ingest(), {})
+        self.assertEqual(self.query("SELECT count(*) FROM live_test_report_demo"), [(0,)])
+
+        prefixed = watch.Ingester(self.db_file, prefix="other_")
+        self.assertEqual(prefixed.ingest([self.report]), {self.report: 1})
+
+    def test_default_prefix_keeps_clear_of_report_tables(self):
+        # harness/reports.py owns test_report_<suite> with its own columns
+        con = duckdb.connect(self.db_file)
+        con.execute("CREATE TABLE test_report_demo (test_name VARCHAR, ttfb_seconds DOUBLE)")
+        con.close()
+        self.write(HEADER + "t1,0.5,pass\n", mode="w")
+        self.assertEqual(self.ingest(), {self.report: 1})
+        self.assertEqual(self.names(), ["t1"])
+        self.assertEqual(self.query("SELECT count(*) FROM test_report_demo"), [(0,)])
+
+    def test_unreadable_report_is_skipped(self):
+        other = os.path.join(self.reports, "test_report_other.csv")
+        self.write(HEADER + "o1,0.5,pass\n", mode="w", path=other)
+        self.write(HEADER + "t1,0.5,pass\n", mode="w")
+        self.ingest()
+        # The next rows are ragged and fail the reload as well
+        self.write("t2,0.5,pass,extra,columns\n")
+        self.write("o2,0.5,pass\n", path=other)
+        self.assertEqual(self.ingest(), {other: 1})
+        self.assertEqual(self.names(), ["t1"])
+
+    def test_watchers_see_changes(self):
+        self.write(HEADER, mode="w")
+        watchers = [watch.PollingWatcher([self.reports])]
+        try:
+            watchers.append(watch.InotifyWatcher([self.reports]))
+        except (OSError, AttributeError):
+            pass  # not Linux
+        try:
+            self.write("t1,0.5,pass\n")
+            self.write("ignored\n", path=os.path.join(self.reports, "notes.csv"))
+            for watcher in watchers:
+                self.assertEqual(watcher.changes(0.05), {self.report}, type(watcher).__name__)
+        finally:
+            for watcher in watchers:
+                watcher.close()
+
+    def hold_lock(self):
+        # DuckDB locks the file per process, so the lock is held by a child
+        holder = subprocess.Popen(
+            [sys.executable, "-c", f"import duckdb, sys; con = duckdb.connect({self.db_file!r}); print(flush=True); sys.stdin.read()"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        holder.stdout.readline()
+        self.addCleanup(holder.wait)
+        self.addCleanup(holder.stdin.close)
+        return holder
+
+    def test_locked_database_is_retried(self):
+        self.write(HEADER + "t1,0.5,pass\n", mode="w")
+        other = os.path.join(self.reports, "test_report_other.csv")
+        holder = self.hold_lock()
+        with self.assertRaises(duckdb.IOException):
+            self.ingest()
+
+        def write_other():
+            self.write(HEADER + "o1,0.5,pass\n", mode="w", path=other)
+            return {other}
+
+        def release():
+            holder.stdin.close()
+            holder.wait()
+            return set()
+
+        # Initial pass locked, a report changes, the retry is locked too,
+        # then the lock goes away
+        watcher = ScriptedWatcher([write_other, set, release])
+        make_watcher = watch.make_watcher
+        watch.make_watcher = lambda dirs, poll=False: watcher
+        self.addCleanup(setattr, watch, "make_watcher", make_watcher)
+        with self.assertRaises(KeyboardInterrupt):
+            watch.watch([self.reports], self.ingester, interval=0.05, settle=0.01)
+
+        self.assertEqual(self.names(), ["t1"])
+        self.assertEqual(self.query('SELECT "Test Case Name" FROM live_test_report_other'), [("o1",)])
+        self.assertAlmostEqual(watcher.timeouts[0], 0.05, delta=0.02)
+        self.assertAlmostEqual(watcher.timeouts[2], 0.1, delta=0.04)
+        self.assertEqual(watcher.timeouts[3], 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()